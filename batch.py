@@ -0,0 +1,403 @@
+"""Validación por lotes de archivos de expresiones.
+
+Uso:
+    python batch.py [opciones] RUTA [RUTA ...]
+
+Cada RUTA puede ser un archivo, un directorio (se recorre recursivamente
+buscando archivos que coincidan con --pattern) o un patrón glob
+(por ejemplo 'src/**/*.java').
+
+La tabla LL(1) se construye una sola vez en el proceso principal y se
+entrega a cada proceso del pool al arrancar; los archivos se reparten en
+bloques de --chunksize. El resultado es un reporte JSON Lines o CSV con un
+veredicto por archivo.
+
+Con --max-errors N (N > 1) el parser se recupera de los errores y reporta
+hasta N por archivo (o por expresión): el reporte agrega la columna 'errors'
+con la lista de {message, line, column, expected}; en CSV va codificada como
+JSON. error, line y column siguen siendo los del primer error.
+
+Con --cache RUTA los veredictos se guardan en una base SQLite (ver
+verdict_cache.py) identificados por el hash del contenido de cada archivo:
+en la siguiente ejecución los archivos sin cambios no se vuelven a
+tokenizar ni analizar, y si no hubo cambios no se arranca el pool.
+
+Con --memo N cada proceso guarda en memoria (LRU de N entradas, ver
+shape_memo.py) el resultado de cada secuencia de tipos de token ya vista:
+en un corpus con muchas expresiones de la misma forma (--records) las
+repetidas no pasan por el parser.
+
+Con --compressed la tabla se comprime una vez en el proceso principal (ver
+compressed_table.py) y cada proceso recibe y usa esa versión: los
+veredictos son los mismos y cada proceso ocupa menos memoria con
+gramáticas grandes.
+"""
+
+import argparse
+import csv
+import fnmatch
+import glob
+import io
+import json
+import os
+import sys
+import threading
+
+from main import START_SYMBOL, TRACE_NONE, Lexer, Parser
+
+REPORT_FIELDS = ['file', 'accepted', 'error', 'line', 'column', 'steps']
+RECORD_REPORT_FIELDS = ['file', 'record', 'record_line', 'accepted', 'error', 'line', 'column', 'steps']
+# Columna extra con --max-errors N > 1
+ERRORS_FIELD = 'errors'
+
+# Parser propio de cada proceso del pool (se crea en _init_worker). Es local
+# al hilo: server.py valida las solicitudes grandes en un hilo aparte, que
+# se inicializa con su propio parser.
+_worker = threading.local()
+
+
+def expand_paths(paths, pattern='*.java'):
+    """Genera las rutas de archivo a validar a partir de archivos, directorios y globs."""
+    for path in paths:
+        if glob.has_magic(path):
+            for match in sorted(glob.glob(path, recursive=True)):
+                if os.path.isfile(match):
+                    yield match
+        elif os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    if fnmatch.fnmatch(name, pattern):
+                        yield os.path.join(dirpath, name)
+        else:
+            # Un archivo inexistente también se reporta (como rechazado)
+            yield path
+
+
+def _lexer_class(name):
+    """Clase de Lexer para --lexer ('regex' o 'dfa')."""
+    if name == 'dfa':
+        from dfa_lexer import DFALexer
+        return DFALexer
+    return Lexer
+
+
+def _init_worker(parsing_table, start_symbol, follow_sets=None, max_errors=1, lexer='regex', memo=0):
+    """Inicializa el parser del proceso con la tabla ya construida.
+
+    Con memo > 0 el parser se envuelve en un shape_memo.MemoizedParser de
+    'memo' entradas.
+    """
+    parser = Parser(parsing_table, start_symbol, trace=TRACE_NONE,
+                    follow_sets=follow_sets, max_errors=max_errors, lexer_class=_lexer_class(lexer))
+    if memo > 0:
+        from shape_memo import MemoizedParser
+        parser = MemoizedParser(parser, memo)
+    _worker.parser = parser
+
+
+def _error_list(result):
+    """Errores de un resultado en modo recuperación como lista serializable."""
+    return [{'message': e.message, 'line': e.line, 'column': e.column, 'expected': list(e.expected)}
+            for e in result.errors or ()]
+
+
+def validate_file(path, stream=None):
+    """Valida un archivo con el parser del proceso y devuelve su registro de reporte.
+
+    Con stream (texto ya abierto) se analiza su contenido en lugar de abrir 'path'.
+    """
+    parser = _worker.parser
+    try:
+        if stream is None:
+            result = parser.parse(path)
+        else:
+            result = parser.parse_tokens(parser.lexer_class(stream).get_tokens())
+        error = result.error
+    except (OSError, UnicodeDecodeError) as e:
+        result = None
+        error = f"Error al leer el archivo: {e}"
+    if result is None:
+        record = {'file': path, 'accepted': False, 'error': error,
+                  'line': None, 'column': None, 'steps': 0}
+        if parser.max_errors > 1:
+            record[ERRORS_FIELD] = []
+        return record
+    record = {
+        'file': path,
+        'accepted': result.accepted,
+        'error': error,
+        'line': result.line,
+        'column': result.column,
+        'steps': result.steps,
+    }
+    if parser.max_errors > 1:
+        record[ERRORS_FIELD] = _error_list(result)
+    return record
+
+
+def validate_texts(texts):
+    """Valida una lista de expresiones con el parser del proceso (lo usa server.py)."""
+    parser = _worker.parser
+    verdicts = []
+    for text in texts:
+        result = parser.parse_tokens(parser.lexer_class(text).get_tokens())
+        verdict = {
+            'accepted': result.accepted,
+            'error': result.error,
+            'line': result.line,
+            'column': result.column,
+            'steps': result.steps,
+        }
+        if parser.max_errors > 1:
+            verdict[ERRORS_FIELD] = _error_list(result)
+        verdicts.append(verdict)
+    return verdicts
+
+
+def iter_record_verdicts(path, separator='\n', stream=None):
+    """Genera un registro de reporte por cada expresión del archivo (modo --records).
+
+    Con stream (texto ya abierto) se analiza su contenido en lugar de abrir 'path'.
+    """
+    try:
+        with open(path, 'r') if stream is None else stream as f:
+            for number, (record, result) in enumerate(_worker.parser.parse_records(f, separator), 1):
+                verdict = {
+                    'file': path,
+                    'record': number,
+                    'record_line': record.line,
+                    'accepted': result.accepted,
+                    'error': result.error,
+                    'line': result.line,
+                    'column': result.column,
+                    'steps': result.steps,
+                }
+                if result.errors is not None:
+                    verdict[ERRORS_FIELD] = _error_list(result)
+                yield verdict
+    except (OSError, UnicodeDecodeError) as e:
+        verdict = {'file': path, 'record': None, 'record_line': None, 'accepted': False,
+                   'error': f"Error al leer el archivo: {e}", 'line': None, 'column': None, 'steps': 0}
+        if _worker.parser.max_errors > 1:
+            verdict[ERRORS_FIELD] = []
+        yield verdict
+
+
+def validate_records(path, separator='\n'):
+    """Versión para el pool de iter_record_verdicts: devuelve la lista del archivo."""
+    return list(iter_record_verdicts(path, separator))
+
+
+def validate_content(path, separator=None):
+    """Valida un archivo leyéndolo una sola vez (para la caché de veredictos).
+
+    Devuelve (hash del contenido, veredicto sin la ruta): el registro del
+    archivo o, con separator, la lista de registros de sus expresiones. El
+    hash es None si el archivo no se pudo leer (ese veredicto no se guarda).
+    """
+    from verdict_cache import content_digest
+
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        digest = stream = None
+    else:
+        digest = content_digest(data)
+        # Misma decodificación que open(path, 'r'): codificación del sistema y
+        # saltos de línea universales
+        stream = io.TextIOWrapper(io.BytesIO(data))
+
+    if separator is None:
+        verdict = _without_path(validate_file(path, stream))
+    else:
+        verdict = [_without_path(record) for record in iter_record_verdicts(path, separator, stream)]
+    return digest, verdict
+
+
+def _without_path(record):
+    return {key: value for key, value in record.items() if key != 'file'}
+
+
+def _validate_cached(paths, cache, separator, workers, chunksize, initargs):
+    """validate_files con caché: sólo se analizan los archivos cuyo contenido
+    no tiene un veredicto guardado (en el pool si son varios)."""
+    from verdict_cache import file_digest
+
+    max_errors = initargs[3]
+    variant = json.dumps({'separator': separator, 'max_errors': max_errors})
+    paths = list(paths)
+    cached = []
+    for path in paths:
+        digest = file_digest(path)
+        cached.append(cache.get(digest, variant) if digest is not None else None)
+    misses = [path for path, verdict in zip(paths, cached) if verdict is None]
+
+    executor = None
+    if workers <= 1 or len(misses) <= 1:
+        _init_worker(*initargs)
+        computed = map(validate_content, misses, [separator] * len(misses))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs)
+        computed = executor.map(validate_content, misses, [separator] * len(misses), chunksize=chunksize)
+
+    try:
+        for path, verdict in zip(paths, cached):
+            if verdict is None:
+                # El hash que se guarda es el del contenido que realmente se analizó
+                digest, verdict = next(computed)
+                if digest is not None:
+                    cache.put(digest, variant, verdict)
+            if separator is None:
+                yield {'file': path, **verdict}
+            else:
+                for record in verdict:
+                    yield {'file': path, **record}
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        cache.flush()
+
+
+def validate_files(paths, parsing_table, start_symbol=START_SYMBOL, workers=None, chunksize=64,
+                   separator=None, follow_sets=None, max_errors=1, lexer='regex', cache=None, memo=0):
+    """Valida los archivos y genera un registro por archivo, en el orden de entrada.
+
+    Con separator distinto de None cada archivo se divide en expresiones
+    (ver main.iter_records) y se genera un registro por expresión.
+    Con max_errors > 1 (requiere follow_sets) cada registro incluye la lista
+    de errores encontrados con recuperación. lexer elige el Lexer ('regex') o
+    el DFALexer ('dfa'); los veredictos son los mismos.
+    Con workers == 1 todo se ejecuta en el proceso actual, sin pool y con
+    memoria constante por expresión.
+    Con cache (verdict_cache.VerdictCache) los archivos cuyo contenido ya
+    tiene un veredicto guardado no se analizan.
+    Con memo > 0 cada proceso memoriza los resultados por secuencia de
+    tipos de token (LRU de 'memo' entradas).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if cache is not None:
+        yield from _validate_cached(paths, cache, separator, workers, chunksize,
+                                    (parsing_table, start_symbol, follow_sets, max_errors, lexer, memo))
+        return
+
+    if workers <= 1:
+        _init_worker(parsing_table, start_symbol, follow_sets, max_errors, lexer, memo)
+        for path in paths:
+            if separator is None:
+                yield validate_file(path)
+            else:
+                yield from iter_record_verdicts(path, separator)
+        return
+
+    # Import diferido: una llamada secuencial no paga el costo del pool
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(parsing_table, start_symbol, follow_sets, max_errors, lexer, memo)) as executor:
+        if separator is None:
+            yield from executor.map(validate_file, paths, chunksize=chunksize)
+        else:
+            # Cada proceso devuelve los veredictos de un archivo completo
+            for records in executor.map(validate_records, paths, [separator] * len(paths),
+                                        chunksize=chunksize):
+                yield from records
+
+
+def write_report(records, out, fmt='jsonl', fields=REPORT_FIELDS):
+    """Escribe los registros en formato JSON Lines o CSV. Devuelve (total, rechazados)."""
+    total = rejected = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=fields)
+        writer.writeheader()
+
+        def write(record):
+            if ERRORS_FIELD in record:
+                record = dict(record, **{ERRORS_FIELD: json.dumps(record[ERRORS_FIELD], ensure_ascii=False)})
+            writer.writerow(record)
+    else:
+        def write(record):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    for record in records:
+        total += 1
+        if not record['accepted']:
+            rejected += 1
+        write(record)
+    return total, rejected
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        description="Valida muchos archivos de expresiones con el analizador LL(1)."
+    )
+    arg_parser.add_argument('paths', nargs='+', metavar='RUTA',
+                            help="archivos, directorios o patrones glob")
+    arg_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help="procesos del pool (por defecto, uno por CPU)")
+    arg_parser.add_argument('--chunksize', type=int, default=64,
+                            help="archivos enviados a cada proceso por bloque (por defecto 64)")
+    arg_parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl',
+                            help="formato del reporte (por defecto jsonl)")
+    arg_parser.add_argument('-o', '--output', default=None,
+                            help="archivo de salida del reporte (por defecto, stdout)")
+    arg_parser.add_argument('--pattern', default='*.java',
+                            help="patrón de nombre al recorrer directorios (por defecto *.java)")
+    arg_parser.add_argument('--records', action='store_true',
+                            help="tratar cada archivo como un corpus: un veredicto por expresión")
+    arg_parser.add_argument('--separator', default='\n',
+                            help="separador de expresiones con --records (por defecto, salto de línea)")
+    arg_parser.add_argument('--max-errors', type=int, default=1,
+                            help="con N > 1, recuperarse de los errores y reportar hasta N por veredicto")
+    arg_parser.add_argument('--lexer', choices=['regex', 'dfa'], default='regex',
+                            help="tokenizador: expresión regular (por defecto) o DFA generado")
+    arg_parser.add_argument('--cache', metavar='RUTA',
+                            help="base SQLite de veredictos: los archivos sin cambios no se vuelven a analizar")
+    arg_parser.add_argument('--cache-size', type=float, default=64,
+                            help="tamaño máximo de la caché de veredictos en MiB (por defecto 64)")
+    arg_parser.add_argument('--compressed', action='store_true',
+                            help="usar la tabla LL(1) comprimida en cada proceso (ver compressed_table.py)")
+    arg_parser.add_argument('--memo', type=int, default=0, metavar='N',
+                            help="memorizar en cada proceso los resultados de N formas de expresión (0 = no)")
+    args = arg_parser.parse_args(argv)
+
+    from table_cache import load_parser_components
+    _, _, follow_sets, parsing_table = load_parser_components()
+    if args.compressed:
+        from compressed_table import CompressedTable
+        parsing_table = CompressedTable(parsing_table, START_SYMBOL)
+    paths = list(expand_paths(args.paths, args.pattern))
+    separator = args.separator if args.records else None
+    fields = RECORD_REPORT_FIELDS if args.records else REPORT_FIELDS
+    if args.max_errors > 1:
+        fields = fields + [ERRORS_FIELD]
+    cache = None
+    if args.cache:
+        from verdict_cache import VerdictCache
+        cache = VerdictCache(args.cache, int(args.cache_size * 1024 * 1024))
+    records = validate_files(paths, parsing_table, START_SYMBOL, args.workers, args.chunksize, separator,
+                             follow_sets, args.max_errors, args.lexer, cache, args.memo)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as out:
+            total, rejected = write_report(records, out, args.format, fields)
+    else:
+        total, rejected = write_report(records, sys.stdout, args.format, fields)
+
+    if args.records:
+        print(f"{total} expresiones analizadas, {rejected} rechazadas.", file=sys.stderr)
+    else:
+        print(f"{total} archivos analizados, {rejected} rechazados.", file=sys.stderr)
+    if cache is not None:
+        cache.close()
+        print(f"Caché de veredictos: {cache.hits} aciertos, {cache.misses} analizados"
+              f" ({cache.evicted} desalojados).", file=sys.stderr)
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
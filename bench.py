@@ -0,0 +1,231 @@
+"""Suite de benchmarks del analizador sobre cargas sintéticas (workload.py).
+
+Uso:
+    python bench.py [--sizes 10 100 1000 10000] [--tokens 100000] [--repeat 3]
+                    [--invalid 0.2] [--seed 0] [--json resultados.json]
+                    [--compare base.json] [--tolerance 0.15]
+
+Mide, para cada largo de oración en --sizes (con ~--tokens tokens en total
+por largo):
+    - Lexer.get_tokens y DFALexer.get_tokens: tokens por segundo (y se
+      comprueba que ambos generen los mismos tokens);
+    - Parser (sin traza): pasos y tokens por segundo, sobre tokens ya leídos,
+      con el motor LL(1) y con el de precedencia (y se comprueba que ambos
+      den los mismos resultados);
+    - prefilter.BatchPrefilter.check (si NumPy está instalado): tokens por
+      segundo sobre los ids de terminal ya empaquetados (y se comprueba que
+      los veredictos coincidan con los del Parser);
+    - memoria: pico de tracemalloc al tokenizar y analizar la oración más
+      larga en streaming (Lexer -> Parser);
+y una sola vez el costo de compute_first_sets, compute_follow_sets y
+create_parsing_table (sin la caché en disco).
+
+Cada medición de tiempo es la mejor de --repeat repeticiones. Con --json se
+guardan los resultados; con --compare se comparan contra una línea base
+guardada antes y el programa termina con código 1 si alguna métrica empeoró
+más que --tolerance (fracción, 0.15 = 15%).
+"""
+
+import argparse
+import importlib.util
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from main import (ENGINE_PRECEDENCE, GRAMMAR, NON_TERMINALS, START_SYMBOL, TERMINALS, TRACE_NONE, Lexer,
+                  Parser, compute_first_sets, compute_follow_sets, create_parsing_table)
+from dfa_lexer import DFALexer
+from workload import make_workload
+
+
+def best_time(func, repeat):
+    """Mejor tiempo (s) de 'repeat' ejecuciones de func() y el último valor devuelto."""
+    best = float('inf')
+    value = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        value = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, value
+
+
+def bench_table(repeat):
+    """Tiempos de construcción de FIRST, FOLLOW y la tabla LL(1)."""
+    first_time, (first_sets, get_first_seq_func) = best_time(
+        lambda: compute_first_sets(GRAMMAR, NON_TERMINALS, TERMINALS), repeat * 20)
+    follow_time, follow_sets = best_time(
+        lambda: compute_follow_sets(GRAMMAR, NON_TERMINALS, START_SYMBOL, first_sets, get_first_seq_func),
+        repeat * 20)
+    table_time, table = best_time(
+        lambda: create_parsing_table(GRAMMAR, first_sets, follow_sets, get_first_seq_func,
+                                     NON_TERMINALS, TERMINALS), repeat * 20)
+    metrics = {
+        'table/first_sets_ms': (first_time * 1000, 'ms', 'lower'),
+        'table/follow_sets_ms': (follow_time * 1000, 'ms', 'lower'),
+        'table/parsing_table_ms': (table_time * 1000, 'ms', 'lower'),
+    }
+    return metrics, table
+
+
+def bench_size(table, size, total_tokens, invalid, repeat, seed):
+    """Métricas de Lexer y Parser para oraciones de ~'size' tokens."""
+    count = max(1, total_tokens // size)
+    cases = make_workload(count, length=size, invalid=invalid, tokens_per_line=16,
+                          seed=seed, parsing_table=table)
+    texts = [text for text, _ in cases]
+
+    lex_time, token_lists = best_time(lambda: [list(Lexer(text).get_tokens()) for text in texts], repeat)
+    n_tokens = sum(len(tokens) for tokens in token_lists)
+    dfa_time, dfa_lists = best_time(lambda: [list(DFALexer(text).get_tokens()) for text in texts], repeat)
+    if dfa_lists != token_lists:
+        raise SystemExit(f"DFALexer y Lexer difieren para largo {size}")
+
+    parser = Parser(table, START_SYMBOL, trace=TRACE_NONE)
+    parse_time, results = best_time(lambda: [parser.parse_tokens(tokens) for tokens in token_lists], repeat)
+    n_steps = sum(result.steps for result in results)
+    rejected = sum(not result for result in results)
+    expected_rejected = sum(not valid for _, valid in cases)
+    if rejected != expected_rejected:
+        raise SystemExit(f"Veredictos inesperados para largo {size}: "
+                         f"{rejected} rechazadas, se esperaban {expected_rejected}")
+    precedence_time, precedence_results = best_time(
+        lambda: [parser.parse_tokens(tokens, engine=ENGINE_PRECEDENCE) for tokens in token_lists], repeat)
+    if precedence_results != results:
+        raise SystemExit(f"Los motores LL(1) y de precedencia difieren para largo {size}")
+    prefilter_time = _bench_prefilter(parser, token_lists, results, repeat)
+
+    # Pico de memoria del análisis en streaming de la oración más larga
+    longest = max(texts, key=len)
+    tracemalloc.start()
+    parser.parse_tokens(Lexer(longest).get_tokens())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    metrics = {
+        f'lexer/{size}/tokens_per_sec': (n_tokens / lex_time, 'tokens/s', 'higher'),
+        f'lexer_dfa/{size}/tokens_per_sec': (n_tokens / dfa_time, 'tokens/s', 'higher'),
+        f'parser/{size}/steps_per_sec': (n_steps / parse_time, 'pasos/s', 'higher'),
+        f'parser/{size}/tokens_per_sec': (n_tokens / parse_time, 'tokens/s', 'higher'),
+        f'parser_precedence/{size}/tokens_per_sec': (n_tokens / precedence_time, 'tokens/s', 'higher'),
+        f'memory/{size}/peak_kib': (peak / 1024, 'KiB', 'lower'),
+    }
+    if prefilter_time is not None:
+        metrics[f'prefilter/{size}/tokens_per_sec'] = (n_tokens / prefilter_time, 'tokens/s', 'higher')
+    info = {'sentences': count, 'tokens': n_tokens, 'steps': n_steps, 'rejected': rejected}
+    return metrics, info
+
+
+def _bench_prefilter(parser, token_lists, results, repeat):
+    """Tiempo de BatchPrefilter.check sobre todas las oraciones (None sin NumPy)."""
+    if importlib.util.find_spec('numpy') is None:
+        return None
+    from prefilter import BatchPrefilter
+
+    prefilter = BatchPrefilter(parser)
+    kinds, lengths = prefilter.pack(token_lists)
+    check_time, (_, accepted, _, _, steps) = best_time(lambda: prefilter.check(kinds, lengths), repeat)
+    if list(accepted) != [result.accepted for result in results] or \
+            list(steps) != [result.steps for result in results]:
+        raise SystemExit("BatchPrefilter y Parser difieren")
+    return check_time
+
+
+def run(args):
+    """Ejecuta todas las mediciones y devuelve el documento de resultados."""
+    metrics, table = bench_table(args.repeat)
+    workload = {}
+    for size in args.sizes:
+        size_metrics, info = bench_size(table, size, args.tokens, args.invalid, args.repeat, args.seed)
+        metrics.update(size_metrics)
+        workload[str(size)] = info
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sizes': args.sizes,
+            'tokens': args.tokens,
+            'repeat': args.repeat,
+            'invalid': args.invalid,
+            'seed': args.seed,
+            'workload': workload,
+        },
+        'metrics': {name: {'value': value, 'unit': unit, 'better': better}
+                    for name, (value, unit, better) in metrics.items()},
+    }
+
+
+def print_results(results):
+    print(f"{'métrica':<40} {'valor':>16}  unidad")
+    print("-" * 68)
+    for name, metric in results['metrics'].items():
+        print(f"{name:<40} {metric['value']:>16,.2f}  {metric['unit']}")
+
+
+def compare(results, baseline, tolerance):
+    """Compara contra la línea base; devuelve la lista de métricas que empeoraron."""
+    regressions = []
+    for key in ('tokens', 'invalid', 'seed', 'python'):
+        if baseline['meta'].get(key) != results['meta'].get(key):
+            print(f"Aviso: la línea base usa {key}={baseline['meta'].get(key)!r} "
+                  f"(ahora {results['meta'].get(key)!r}); las cifras pueden no ser comparables.")
+    print(f"\n{'métrica':<34} {'base':>14} {'actual':>14} {'cambio':>9}")
+    print("-" * 75)
+    for name, base in baseline['metrics'].items():
+        current = results['metrics'].get(name)
+        if current is None:
+            print(f"{name:<34} {base['value']:>14,.2f} {'(falta)':>14}")
+            continue
+        change = (current['value'] - base['value']) / base['value'] if base['value'] else 0.0
+        worse = -change if base['better'] == 'higher' else change
+        mark = ''
+        if worse > tolerance:
+            mark = '  REGRESIÓN'
+            regressions.append(name)
+        print(f"{name:<34} {base['value']:>14,.2f} {current['value']:>14,.2f} {change:>+8.1%}{mark}")
+    return regressions
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmarks del Lexer, el Parser y la construcción de la tabla.")
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                            help="largos de oración (tokens aproximados)")
+    arg_parser.add_argument('--tokens', type=int, default=100000, help="tokens totales por largo")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="repeticiones (se toma la mejor)")
+    arg_parser.add_argument('--invalid', type=float, default=0.2, help="fracción de oraciones inválidas")
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--json', metavar='ARCHIVO', help="guardar los resultados en JSON ('-' para stdout)")
+    arg_parser.add_argument('--compare', metavar='BASE', help="comparar contra una línea base JSON")
+    arg_parser.add_argument('--tolerance', type=float, default=0.15,
+                            help="empeoramiento máximo permitido al comparar (fracción)")
+    args = arg_parser.parse_args(argv)
+
+    results = run(args)
+
+    if args.json == '-':
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print_results(results)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} métrica(s) empeoraron más de {args.tolerance:.0%}: "
+                  f"{', '.join(regressions)}")
+            return 1
+        print("\nSin regresiones.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
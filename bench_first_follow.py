@@ -0,0 +1,91 @@
+"""Benchmark: FIRST/FOLLOW ingenuo (main.py) contra bitsets + worklist.
+
+Uso:
+    python bench_first_follow.py [--kind ladder|random] [--sizes 25 50 100 ...]
+
+Genera gramáticas sintéticas de tamaño creciente, calcula FIRST y FOLLOW con
+ambos motores, verifica que los resultados sean idénticos e imprime los
+tiempos y la aceleración.
+
+- ladder: escalera de niveles de precedencia como E/EP/T/TP/F, con un operador
+  por nivel (E0 -> E1 E0P, E0P -> op0 E1 E0P | lambda, ...). Es LL(1).
+- random: no-terminales con producciones aleatorias (anulables o no).
+"""
+
+import argparse
+import random
+import time
+
+from main import compute_first_sets, compute_follow_sets
+from first_follow_bitset import compute_first_sets_bitset, compute_follow_sets_bitset
+
+
+def ladder_grammar(levels):
+    """Gramática de expresiones con 'levels' niveles de precedencia."""
+    grammar = {}
+    for i in range(levels):
+        nxt = f"E{i + 1}" if i + 1 < levels else "F"
+        grammar[f"E{i}"] = [[nxt, f"E{i}P"]]
+        grammar[f"E{i}P"] = [[f"op{i}", nxt, f"E{i}P"], ['lambda']]
+    grammar["F"] = [['(', 'E0', ')'], ['id'], ['num']]
+    return grammar
+
+
+def random_grammar(size, seed=0):
+    """Gramática aleatoria con 'size' no-terminales y ~size/4 terminales."""
+    rng = random.Random(seed)
+    non_terminals = [f"N{i}" for i in range(size)]
+    terminals = [f"t{i}" for i in range(max(2, size // 4))]
+    grammar = {}
+    for nt in non_terminals:
+        productions = []
+        for _ in range(rng.randint(1, 4)):
+            length = rng.randint(0, 5)
+            if length == 0:
+                productions.append(['lambda'])
+            else:
+                productions.append([rng.choice(non_terminals) if rng.random() < 0.5 else rng.choice(terminals)
+                                    for _ in range(length)])
+        grammar[nt] = productions
+    return grammar
+
+
+def grammar_parts(grammar):
+    """(no_terminales, terminales, símbolo_inicial) como los deriva main.py."""
+    non_terminals = list(grammar)
+    terminals = sorted({s for prods in grammar.values() for prod in prods for s in prod
+                        if s not in grammar and s != 'lambda'}) + ['$']
+    return non_terminals, terminals, non_terminals[0]
+
+
+def time_engine(first_func, follow_func, grammar):
+    """Tiempo (s) de calcular FIRST y FOLLOW con un motor, y sus resultados."""
+    non_terminals, terminals, start = grammar_parts(grammar)
+    t0 = time.perf_counter()
+    first_sets, get_first_seq_func = first_func(grammar, non_terminals, terminals)
+    follow_sets = follow_func(grammar, non_terminals, start, first_sets, get_first_seq_func)
+    return time.perf_counter() - t0, first_sets, follow_sets
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark de FIRST/FOLLOW")
+    arg_parser.add_argument('--kind', choices=['ladder', 'random'], default='ladder')
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[25, 50, 100, 200, 400])
+    args = arg_parser.parse_args(argv)
+
+    build = ladder_grammar if args.kind == 'ladder' else random_grammar
+    print(f"{'tamaño':>8} {'producciones':>13} {'ingenuo (s)':>12} {'bitset (s)':>11} {'aceleración':>12}")
+    for size in args.sizes:
+        grammar = build(size)
+        n_productions = sum(len(prods) for prods in grammar.values())
+        naive_time, naive_first, naive_follow = time_engine(compute_first_sets, compute_follow_sets, grammar)
+        fast_time, fast_first, fast_follow = time_engine(compute_first_sets_bitset, compute_follow_sets_bitset,
+                                                         grammar)
+        if naive_first != fast_first or naive_follow != fast_follow:
+            raise SystemExit(f"Resultados distintos para tamaño {size}")
+        print(f"{size:>8} {n_productions:>13} {naive_time:>12.4f} {fast_time:>11.4f} "
+              f"{naive_time / fast_time:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
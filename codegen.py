@@ -0,0 +1,220 @@
+"""Generador de un módulo Python con un parser predictivo especializado.
+
+Uso:
+    python codegen.py [-o parser_generado.py]
+
+Lee GRAMMAR, START_SYMBOL y la tabla de create_parsing_table (vía la caché
+de table_cache) y escribe un módulo independiente que no necesita main.py:
+
+- un tokenizador con los mismos patrones que Lexer (TOKEN_SPECS);
+- un parser con las decisiones de la tabla escritas como comparaciones
+  directas sobre el tipo de token, una pila explícita (sin recursión, sin
+  límite de profundidad) y los mensajes de error de Parser, con la misma
+  línea y columna.
+
+Cuando una producción empieza con un terminal y se eligió justamente por
+ese token, el generador consume el token en el mismo paso en lugar de
+empujarlo y compararlo en la siguiente vuelta, y el primer símbolo restante
+de cada producción pasa directamente a ser el tope sin empujarlo a la pila.
+El lenguaje aceptado y el punto donde se detecta cada error no cambian.
+"""
+
+import argparse
+import sys
+
+from main import START_SYMBOL, TOKEN_REGEX
+
+
+def _ident(symbol, prefix, names):
+    """Nombre de constante Python único para un símbolo de la gramática."""
+    base = ''.join(c if c.isalnum() else '_' for c in symbol).upper() or 'SYM'
+    readable = {'(': 'LPAREN', ')': 'RPAREN', '+': 'PLUS', '-': 'MINUS', '*': 'STAR',
+                '/': 'SLASH', '%': 'PERCENT', '$': 'END'}
+    base = readable.get(symbol, base)
+    name = f"{prefix}_{base}"
+    while name in names:
+        name += '_'
+    names.add(name)
+    return name
+
+
+def generate_parser_module(parsing_table, start_symbol=START_SYMBOL):
+    """Devuelve el código fuente del módulo con el parser especializado."""
+    non_terminals = list(parsing_table)
+    terminals = list(next(iter(parsing_table.values())))
+
+    used = set()
+    const = {}
+    for t in terminals:
+        const[('t', t)] = _ident(t, 'T', used)
+    for nt in non_terminals:
+        const[('nt', nt)] = _ident(nt, 'NT', used)
+
+    def sym(symbol):
+        return const[('nt', symbol)] if symbol in parsing_table else const[('t', symbol)]
+
+    lines = []
+    emit = lines.append
+
+    emit('"""Parser LL(1) especializado, generado por codegen.py. No editar a mano."""')
+    emit('')
+    emit('import re')
+    emit('import sys')
+    emit('from collections import namedtuple')
+    emit('')
+    emit("Token = namedtuple('Token', ['type', 'value', 'line', 'column'])")
+    emit("ParseResult = namedtuple('ParseResult', ['accepted', 'error', 'token', 'line', 'column'])")
+    emit('')
+    emit(f'_TOKEN_REGEX = re.compile({TOKEN_REGEX!r})')
+    emit('')
+    emit('')
+    emit('def tokenize(text):')
+    emit('    """Genera los tokens del texto (mismos tipos, valores y posiciones que Lexer)."""')
+    emit('    line_num = 1')
+    emit('    line_start = 0')
+    emit('    for mo in _TOKEN_REGEX.finditer(text):')
+    emit('        kind = mo.lastgroup')
+    emit("        if kind == 'NEWLINE':")
+    emit('            line_start = mo.end()')
+    emit('            line_num += 1')
+    emit("        elif kind == 'OP':")
+    emit('            value = mo.group()')
+    emit('            yield Token(value, value, line_num, mo.start() - line_start)')
+    emit("        elif kind != 'SKIP' and kind != 'MISMATCH':")
+    emit('            yield Token(kind, mo.group(), line_num, mo.start() - line_start)')
+    emit("    yield Token('$', '$', line_num, 0)")
+    emit('')
+    emit('')
+    emit('# Símbolos de la pila')
+    for i, t in enumerate(terminals):
+        emit(f'{const[("t", t)]} = {i}  # {t!r}')
+    for i, nt in enumerate(non_terminals, len(terminals)):
+        emit(f'{const[("nt", nt)]} = {i}  # {nt}')
+    emit('')
+    emit('')
+    emit('def _fail(message, token):')
+    emit('    return ParseResult(False, message, token, token.line, token.column)')
+    emit('')
+    emit('')
+    emit('def parse_tokens(tokens):')
+    emit('    """Analiza una secuencia de tokens y devuelve un ParseResult."""')
+    emit('    stream = iter(tokens)')
+    emit("    eof = Token('$', '$', -1, -1)")
+    emit('    token = next(stream, eof)')
+    emit('    tt = token.type')
+    emit(f'    stack = [{sym("$")}, {sym(start_symbol)}]')
+    emit('    pop = stack.pop')
+    emit('    push = stack.append')
+    emit('')
+    emit('    top = pop()')
+    emit('    while True:')
+
+    keyword = 'if'
+    for nt in non_terminals:
+        row = parsing_table[nt]
+        # Agrupar terminales por producción (en el orden de las columnas)
+        groups = []
+        for t in terminals:
+            production = row[t]
+            if production is None:
+                continue
+            for group in groups:
+                if group[0] is production or group[0] == production:
+                    group[1].append(t)
+                    break
+            else:
+                groups.append((production, [t]))
+
+        emit(f'        {keyword} top == {sym(nt)}:')
+        keyword = 'elif'
+        inner = 'if'
+        for production, lookaheads in groups:
+            condition = ' or '.join(f'tt == {t!r}' for t in lookaheads)
+            emit(f'            {inner} {condition}:')
+            inner = 'elif'
+            body = [] if production == ['lambda'] else list(production)
+            emit(f"                # {nt} -> {' '.join(production)}")
+            if body and body[0] not in parsing_table and lookaheads == [body[0]]:
+                # El terminal inicial es justamente el token actual: se consume aquí
+                emit('                token = next(stream, eof)')
+                emit('                tt = token.type')
+                body = body[1:]
+            # El primer símbolo no se empuja: pasa directamente a ser el tope
+            for symbol in reversed(body[1:]):
+                emit(f'                push({sym(symbol)})')
+            if body:
+                emit(f'                top = {sym(body[0])}')
+                emit('                continue')
+            else:
+                emit('                pass')
+        expected = ', '.join(t for t in terminals if row[t] is not None).replace('{', '{{').replace('}', '}}')
+        if groups:
+            emit('            else:')
+            emit(f"                return _fail(f\"Token inesperado '{{tt}}'. Se esperaba uno de: {expected}\", token)")
+        else:
+            emit(f"            return _fail(f\"Token inesperado '{{tt}}'. Se esperaba uno de: \", token)")
+
+    for t in terminals:
+        if t == '$':
+            continue
+        emit(f'        elif top == {sym(t)}:')
+        emit(f'            if tt != {t!r}:')
+        emit(f"                return _fail(f\"Se esperaba el token '{t}' pero se encontró '{{tt}}'\", token)")
+        emit('            token = next(stream, eof)')
+        emit('            tt = token.type')
+
+    emit('        else:')
+    emit("            if tt == '$':")
+    emit('                return ParseResult(True, None, None, None, None)')
+    emit("            return _fail(f\"Se esperaba el token '$' pero se encontró '{tt}'\", token)")
+    emit('        top = pop()')
+    emit('')
+    emit('')
+    emit('def parse_text(text):')
+    emit('    """Tokeniza y analiza un texto."""')
+    emit('    return parse_tokens(tokenize(text))')
+    emit('')
+    emit('')
+    emit('def main():')
+    emit('    if len(sys.argv) != 2:')
+    emit('        print(f"Uso: python {sys.argv[0]} <archivo>")')
+    emit('        sys.exit(2)')
+    emit("    with open(sys.argv[1], 'r') as f:")
+    emit('        result = parse_text(f.read())')
+    emit('    if result.accepted:')
+    emit('        print("--- Análisis Exitoso ---")')
+    emit('        print("La cadena es aceptada por la gramática.")')
+    emit('        sys.exit(0)')
+    emit('    token = result.token')
+    emit('    print(f"\\n*** Error de Sintaxis! ***")')
+    emit('    print(f"  {result.error}")')
+    emit("    print(f\"  En línea {token.line}, columna {token.column} (token: '{token.value}')\")")
+    emit('    sys.exit(1)')
+    emit('')
+    emit('')
+    emit('if __name__ == "__main__":')
+    emit('    main()')
+    emit('')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Genera un parser especializado a partir de GRAMMAR.")
+    arg_parser.add_argument('-o', '--output', default='parser_generado.py',
+                            help="archivo a escribir (por defecto parser_generado.py; '-' para stdout)")
+    args = arg_parser.parse_args(argv)
+
+    from table_cache import load_parser_components
+    _, _, _, parsing_table = load_parser_components()
+    source = generate_parser_module(parsing_table, START_SYMBOL)
+
+    if args.output == '-':
+        sys.stdout.write(source)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(source)
+        print(f"Parser generado en {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
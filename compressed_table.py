@@ -0,0 +1,229 @@
+"""Tabla LL(1) comprimida por desplazamiento de filas (row displacement).
+
+create_parsing_table arma un dict de dicts con una entrada por cada par
+(no-terminal, terminal) y CompiledTable la aplana a un arreglo denso de
+filas x ancho enteros. Con gramáticas generadas de miles de no-terminales y
+cientos de terminales casi todas esas celdas están vacías, y la tabla se
+copia en cada proceso.
+
+CompressedTable guarda, por fila:
+    default[fila]   el valor más frecuente de la fila (casi siempre -1, vacía)
+y sólo las celdas distintas de ese valor (las excepciones), todas las filas
+superpuestas en dos arreglos compartidos:
+    next[base[fila] + terminal]    producción de la excepción
+    check[base[fila] + terminal]   fila dueña de esa posición
+
+La consulta es O(1) y exacta (las celdas vacías que difieren del default
+también se guardan como excepción, así que los errores se detectan en el
+mismo punto que con la tabla densa):
+
+    i = base[fila] + terminal
+    produccion = next[i] if check[i] == fila else default[fila]
+
+Las filas se ubican de mayor a menor cantidad de excepciones en el primer
+desplazamiento donde no chocan con las ya ubicadas (first fit acotado: unos
+pocos desplazamientos desde el primer lugar libre y, si no alcanzan, desde
+el final de lo ocupado; el armado queda casi lineal).
+
+Las filas se comprimen a medida que se leen del dict de create_parsing_table
+(CompiledTable._rows): el arreglo denso no se arma nunca, así que el pico de
+memoria del armado es el de las excepciones más una fila.
+
+CompressedTable tiene la misma interfaz que CompiledTable y se pasa
+directamente al Parser en lugar del dict: el bucle sin traza hace la
+consulta de arriba en línea, y los demás modos (traza, árbol,
+instrumentación, recuperación) leen 'cells', que aquí es una vista de
+solo lectura que resuelve cada índice con la misma consulta.
+
+Uso:
+    ct = CompressedTable(parsing_table, START_SYMBOL)
+    parser = Parser(ct, START_SYMBOL, trace=TRACE_NONE)
+    print(table_sizes(parsing_table, ct))
+
+    python compressed_table.py [--levels 200]    # tamaños para GRAMMAR y una gramática generada
+"""
+
+import argparse
+import sys
+from array import array
+from collections import Counter
+
+from main import START_SYMBOL, CompiledTable
+
+# Desplazamientos que se prueban por fila antes de ubicarla al final
+_MAX_PROBES = 64
+
+
+def _typecode(low, high):
+    """Typecode de 'array' más chico que admite enteros en [low, high]."""
+    for code in ('b', 'h', 'i'):
+        bits = array(code).itemsize * 8
+        if -(1 << (bits - 1)) <= low and high < (1 << (bits - 1)):
+            return code
+    return 'q'
+
+
+class CompressedCells:
+    """Vista de solo lectura con la interfaz de CompiledTable.cells (índice fila * ancho + terminal)."""
+
+    __slots__ = ('width', 'rows', 'base', 'default', 'next', 'check')
+
+    def __init__(self, width, rows, base, default, next_, check):
+        self.width = width
+        self.rows = rows
+        self.base = base
+        self.default = default
+        self.next = next_
+        self.check = check
+
+    def __len__(self):
+        return self.rows * self.width
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.rows * self.width
+        row, kind = divmod(index, self.width)
+        if not 0 <= row < self.rows:
+            raise IndexError("celda fuera de la tabla")
+        i = self.base[row] + kind
+        return self.next[i] if self.check[i] == row else self.default[row]
+
+    def __iter__(self):
+        for index in range(self.rows * self.width):
+            yield self[index]
+
+
+class CompressedTable(CompiledTable):
+    """CompiledTable con las celdas comprimidas por desplazamiento de filas."""
+
+    compressed = True
+
+    def _build_cells(self, entries_by_row):
+        # Las filas se arman de a una a partir del dict: la tabla densa
+        # completa no llega a existir. Las excepciones de cada fila se
+        # guardan en dos arreglos (columnas y producciones).
+        width = self.width
+        rows = len(self.non_terminals)
+
+        defaults = []
+        exception_columns = []
+        exception_pids = []
+        for entries in entries_by_row:
+            cells = [-1] * width
+            for kind, pid in entries:
+                cells[kind] = pid
+            default = Counter(cells).most_common(1)[0][0]
+            defaults.append(default)
+            exception_columns.append(array('i', [kind for kind, pid in enumerate(cells) if pid != default]))
+            exception_pids.append(array('i', [pid for pid in cells if pid != default]))
+
+        # First fit, de la fila con más excepciones a la de menos, sobre un
+        # mapa de posiciones ocupadas. Se prueban _MAX_PROBES desplazamientos
+        # desde el primer lugar libre; si ninguno sirve, se busca desde el
+        # final de lo ocupado (donde siempre hay lugar a menos de un ancho).
+        base = [0] * rows
+        occupied = bytearray(width)
+        first_free = 0
+        for row in sorted(range(rows), key=lambda r: -len(exception_columns[r])):
+            columns = exception_columns[row]
+            if not columns:
+                continue
+            while first_free < len(occupied) and occupied[first_free]:
+                first_free += 1
+            offset = max(0, first_free - columns[0])
+            probes = 0
+            while True:
+                if len(occupied) < offset + width:
+                    occupied.extend(bytes(offset + width - len(occupied)))
+                if not any(occupied[offset + kind] for kind in columns):
+                    break
+                offset += 1
+                probes += 1
+                if probes == _MAX_PROBES:
+                    offset = max(offset, len(occupied.rstrip(b'\0')) - width)
+            base[row] = offset
+            for kind in columns:
+                occupied[offset + kind] = 1
+        # Relleno: base[fila] + terminal nunca se sale de los arreglos
+        size = (max(base) if base else 0) + width
+        owner = array('i', [-1]) * size     # check (-1 = libre)
+        values = array('i', [-1]) * size
+        for row in range(rows):
+            for kind, pid in zip(exception_columns[row], exception_pids[row]):
+                values[base[row] + kind] = pid
+                owner[base[row] + kind] = row
+
+        pid_code = _typecode(-1, max(len(self.productions), 1))
+        self.base = array(_typecode(0, max(base, default=0)), base)
+        self.default = array(pid_code, defaults)
+        self.next = array(pid_code, values)
+        self.check = array(_typecode(-1, rows), owner)
+        self.exceptions = sum(len(e) for e in exception_columns)
+        self.cells = CompressedCells(width, rows, self.base, self.default, self.next, self.check)
+
+    def lookup(self, nt_id, terminal_id):
+        row = nt_id - self.first_nt
+        i = self.base[row] + terminal_id
+        return self.next[i] if self.check[i] == row else self.default[row]
+
+    def nbytes(self):
+        """Memoria de los arreglos de la tabla comprimida en bytes."""
+        return sum(a.itemsize * len(a) for a in (self.base, self.default, self.next, self.check))
+
+
+def _dict_table_bytes(table):
+    """Tamaño aproximado del dict de dicts de create_parsing_table (sin las producciones)."""
+    return sys.getsizeof(table) + sum(sys.getsizeof(row) for row in table.values())
+
+
+def table_sizes(table, compressed=None, start_symbol=START_SYMBOL):
+    """Tamaños en bytes de la tabla como dict de dicts, arreglo denso y comprimida."""
+    if compressed is None:
+        compressed = CompressedTable(table, start_symbol)
+    rows = len(compressed.non_terminals)
+    dense_bytes = array('i').itemsize * rows * compressed.width
+    return {
+        'non_terminals': rows,
+        'terminals': len(compressed.terminals),
+        'cells': rows * compressed.width,
+        'exceptions': compressed.exceptions,
+        'dict_bytes': _dict_table_bytes(table),
+        'dense_bytes': dense_bytes,
+        'compressed_bytes': compressed.nbytes(),
+        'ratio': dense_bytes / compressed.nbytes(),
+    }
+
+
+def _print_sizes(title, sizes):
+    print(f"{title}: {sizes['non_terminals']} no-terminales x {sizes['terminals']} terminales "
+          f"({sizes['cells']} celdas, {sizes['exceptions']} excepciones)")
+    print(f"  dict de dicts:   {sizes['dict_bytes']:>12,} bytes")
+    print(f"  arreglo denso:   {sizes['dense_bytes']:>12,} bytes")
+    print(f"  comprimida:      {sizes['compressed_bytes']:>12,} bytes  ({sizes['ratio']:.1f}x menor que el denso)")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Tamaño de la tabla LL(1) densa y comprimida.")
+    arg_parser.add_argument('--levels', type=int, default=200,
+                            help="niveles de precedencia de la gramática generada (por defecto 200)")
+    args = arg_parser.parse_args(argv)
+
+    from table_cache import load_parser_components
+    _, _, _, parsing_table = load_parser_components()
+    _print_sizes("GRAMMAR", table_sizes(parsing_table))
+
+    from bench_first_follow import grammar_parts, ladder_grammar
+    from first_follow_bitset import compute_first_sets_bitset, compute_follow_sets_bitset
+    from main import create_parsing_table
+
+    grammar = ladder_grammar(args.levels)
+    non_terminals, terminals, start = grammar_parts(grammar)
+    first_sets, get_first_seq_func = compute_first_sets_bitset(grammar, non_terminals, terminals)
+    follow_sets = compute_follow_sets_bitset(grammar, non_terminals, start, first_sets, get_first_seq_func)
+    table = create_parsing_table(grammar, first_sets, follow_sets, get_first_seq_func, non_terminals, terminals)
+    _print_sizes(f"Escalera de {args.levels} niveles", table_sizes(table, CompressedTable(table, start)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,484 @@
+"""Lexer alternativo: un DFA por tabla generado a partir de TOKEN_SPECS.
+
+Las expresiones regulares de TOKEN_SPECS se traducen a un NFA (construcción
+de Thompson) y éste a un DFA sobre bytes (construcción de subconjuntos). Al
+tokenizar no se usa el módulo re: el DFA se recorre con la regla del token
+más largo (y, a igual largo, gana la especificación que aparece primero,
+como en la alternancia de TOKEN_REGEX).
+
+La mayor parte del costo de Lexer está en el trabajo por coincidencia
+(finditer, lastgroup, group y las ramas en Python), incluso para los
+espacios y saltos de línea que se descartan. Aquí:
+
+- cada estado del DFA con un bucle sobre sí mismo (los dígitos de un número,
+  las letras de un identificador, una racha de espacios) se recorre de una
+  vez: se traduce el bloque completo con bytes.translate a una máscara
+  donde sólo valen 1 los bytes que salen del bucle, y el fin de la racha es
+  un find en C;
+- spans() genera (tipo, inicio, fin, línea, columna) sin crear subcadenas;
+  get_tokens() arma los mismos Token que Lexer.
+
+Los tokens (tipos, valores, líneas y columnas) son idénticos a los de
+Lexer. Las columnas de Lexer cuentan caracteres, así que un bloque con
+caracteres no ASCII se tokeniza con la expresión regular de Lexer (el
+resultado es el mismo; sólo cambia la velocidad).
+
+Uso:
+    from dfa_lexer import DFALexer
+    parser = Parser(parsing_table, START_SYMBOL, lexer_class=DFALexer)
+"""
+
+from main import DEFAULT_CHUNK_SIZE, TOKEN_SPECS, Lexer, Token
+
+# Tipos de especificación que no producen tokens (igual que en Lexer.get_tokens)
+_SKIPPED = ('SKIP', 'MISMATCH')
+# Especificación cuyos tokens tienen como tipo su propio valor
+_OPERATOR_SPEC = 'OP'
+
+# Acción al aceptar un token, por estado del DFA
+_EMIT_NONE = 0      # Estado no final
+_EMIT_SKIP = 1      # SKIP / MISMATCH: se descarta
+_EMIT_NEWLINE = 2   # Salto de línea
+_EMIT_OP = 3        # Operador: el tipo es el valor
+_EMIT_NAMED = 4     # num / id: el tipo es el nombre de la especificación
+
+_ALL_BYTES = frozenset(range(256))
+_CHARS = [chr(byte) for byte in range(128)]
+_CLASS_ESCAPES = {
+    'd': frozenset(b'0123456789'),
+    'w': frozenset(b'0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_'),
+    's': frozenset(b' \t\n\r\f\v'),
+}
+_CHAR_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v', '0': '\0'}
+
+
+# --- Expresión regular -> NFA (Thompson) ---
+
+class _NFA:
+    """NFA con transiciones por conjunto de bytes y transiciones vacías."""
+
+    def __init__(self):
+        self.epsilon = []       # estado -> lista de estados
+        self.moves = []         # estado -> lista de (conjunto de bytes, estado)
+
+    def new_state(self):
+        self.epsilon.append([])
+        self.moves.append([])
+        return len(self.epsilon) - 1
+
+
+class _RegexParser:
+    """Parser del subconjunto de expresiones regulares usado en TOKEN_SPECS.
+
+    Soporta: alternancia '|', concatenación, grupos '(...)' y '(?:...)',
+    cuantificadores '*', '+' y '?', clases '[...]' (con rangos y '^'), '.',
+    y escapes (\\d, \\w, \\s, \\n, \\t y caracteres escapados). Cada método
+    devuelve un fragmento (inicio, fin) del NFA.
+    """
+
+    def __init__(self, pattern, nfa):
+        self.pattern = pattern
+        self.pos = 0
+        self.nfa = nfa
+
+    def parse(self):
+        fragment = self._alternation()
+        if self.pos != len(self.pattern):
+            raise ValueError(f"Expresión regular no soportada: {self.pattern!r} (posición {self.pos})")
+        return fragment
+
+    def _peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def _take(self):
+        char = self.pattern[self.pos]
+        self.pos += 1
+        return char
+
+    def _alternation(self):
+        fragments = [self._concatenation()]
+        while self._peek() == '|':
+            self._take()
+            fragments.append(self._concatenation())
+        if len(fragments) == 1:
+            return fragments[0]
+        start, end = self.nfa.new_state(), self.nfa.new_state()
+        for f_start, f_end in fragments:
+            self.nfa.epsilon[start].append(f_start)
+            self.nfa.epsilon[f_end].append(end)
+        return start, end
+
+    def _concatenation(self):
+        start = end = self.nfa.new_state()
+        while self._peek() not in (None, '|', ')'):
+            f_start, f_end = self._repetition()
+            self.nfa.epsilon[end].append(f_start)
+            end = f_end
+        return start, end
+
+    def _repetition(self):
+        f_start, f_end = self._atom()
+        while self._peek() in ('*', '+', '?'):
+            op = self._take()
+            start, end = self.nfa.new_state(), self.nfa.new_state()
+            self.nfa.epsilon[start].append(f_start)
+            self.nfa.epsilon[f_end].append(end)
+            if op in ('*', '?'):
+                self.nfa.epsilon[start].append(end)
+            if op in ('*', '+'):
+                self.nfa.epsilon[f_end].append(f_start)
+            f_start, f_end = start, end
+        return f_start, f_end
+
+    def _atom(self):
+        char = self._take()
+        if char == '(':
+            if self.pattern.startswith('?:', self.pos):
+                self.pos += 2
+            fragment = self._alternation()
+            if self._peek() != ')':
+                raise ValueError(f"Falta ')' en {self.pattern!r}")
+            self._take()
+            return fragment
+        if char == '[':
+            byte_set = self._class()
+        elif char == '.':
+            byte_set = _ALL_BYTES - {ord('\n')}
+        elif char == '\\':
+            byte_set = self._escape()
+        elif char in '*+?)|':
+            raise ValueError(f"Expresión regular no soportada: {self.pattern!r} (posición {self.pos - 1})")
+        else:
+            byte_set = frozenset(char.encode('utf-8')[:1]) if ord(char) < 128 else self._non_ascii(char)
+        start, end = self.nfa.new_state(), self.nfa.new_state()
+        self.nfa.moves[start].append((byte_set, end))
+        return start, end
+
+    def _escape(self):
+        char = self._take()
+        if char in _CLASS_ESCAPES:
+            return _CLASS_ESCAPES[char]
+        return frozenset(ord(_CHAR_ESCAPES.get(char, char)).to_bytes(1, 'big'))
+
+    def _class(self):
+        negate = self._peek() == '^'
+        if negate:
+            self._take()
+        members = set()
+        first = True
+        while True:
+            char = self._take()
+            if char == ']' and not first:
+                break
+            first = False
+            if char == '\\':
+                escaped = self._escape()
+                if len(escaped) > 1:
+                    members |= escaped
+                    continue
+                low = next(iter(escaped))
+            else:
+                low = self._ordinal(char)
+            if self._peek() == '-' and self.pattern[self.pos + 1] != ']':
+                self._take()
+                high_char = self._take()
+                high = next(iter(self._escape())) if high_char == '\\' else self._ordinal(high_char)
+                members.update(range(low, high + 1))
+            else:
+                members.add(low)
+        return _ALL_BYTES - members if negate else frozenset(members)
+
+    def _ordinal(self, char):
+        if ord(char) >= 128:
+            self._non_ascii(char)
+        return ord(char)
+
+    def _non_ascii(self, char):
+        raise ValueError(f"El DFA sólo admite patrones ASCII: {char!r} en {self.pattern!r}")
+
+
+# --- NFA -> DFA (construcción de subconjuntos) ---
+
+class TokenDFA:
+    """DFA sobre bytes que reconoce los tokens de 'specs' (lista de (nombre, patrón)).
+
+    next_state[s]: lista de 256 estados destino (-1 = sin transición).
+    accept[s]:     índice de la especificación aceptada en s (-1 = no final).
+    exit_mask[s]:  si s tiene un bucle sobre sí mismo, tabla para bytes.translate
+                   que deja en 1 los bytes que salen del bucle (None si no tiene).
+    actions[s], kinds[s]: qué hace Lexer.get_tokens con un token aceptado en s
+                   y su tipo (nombre de la especificación).
+    El estado inicial es el 0.
+    """
+
+    def __init__(self, specs=TOKEN_SPECS):
+        self.names = [name for name, _ in specs]
+        nfa = _NFA()
+        start = nfa.new_state()
+        finals = {}
+        for index, (name, pattern) in enumerate(specs):
+            f_start, f_end = _RegexParser(pattern, nfa).parse()
+            nfa.epsilon[start].append(f_start)
+            finals[f_end] = index
+
+        def closure(states):
+            result = set(states)
+            pending = list(states)
+            while pending:
+                for target in nfa.epsilon[pending.pop()]:
+                    if target not in result:
+                        result.add(target)
+                        pending.append(target)
+            return frozenset(result)
+
+        initial = closure([start])
+        ids = {initial: 0}
+        subsets = [initial]
+        self.next_state = []
+        self.accept = []
+        i = 0
+        while i < len(subsets):
+            subset = subsets[i]
+            i += 1
+            # Destinos por byte: se agrupan los bytes con igual conjunto de destinos
+            targets = [set() for _ in range(256)]
+            for state in subset:
+                for byte_set, target in nfa.moves[state]:
+                    for byte in byte_set:
+                        targets[byte].add(target)
+            row = [-1] * 256
+            cache = {}
+            for byte, target_set in enumerate(targets):
+                if not target_set:
+                    continue
+                key = frozenset(target_set)
+                if key not in cache:
+                    next_subset = closure(key)
+                    if next_subset not in ids:
+                        ids[next_subset] = len(subsets)
+                        subsets.append(next_subset)
+                    cache[key] = ids[next_subset]
+                row[byte] = cache[key]
+            self.next_state.append(row)
+            accepted = [finals[s] for s in subset if s in finals]
+            self.accept.append(min(accepted) if accepted else -1)
+
+        self.exit_mask = []
+        for state, row in enumerate(self.next_state):
+            if state in row:
+                self.exit_mask.append(bytes(0 if target == state else 1 for target in row))
+            else:
+                self.exit_mask.append(None)
+        self.loop_states = [state for state, mask in enumerate(self.exit_mask) if mask is not None]
+
+        # Acción de Lexer.get_tokens al aceptar en cada estado, y tipo de token
+        self.kinds = [self.names[index] if index >= 0 else None for index in self.accept]
+        self.actions = []
+        for name in self.kinds:
+            if name is None:
+                self.actions.append(_EMIT_NONE)
+            elif name in _SKIPPED:
+                self.actions.append(_EMIT_SKIP)
+            elif name == 'NEWLINE':
+                self.actions.append(_EMIT_NEWLINE)
+            elif name == _OPERATOR_SPEC:
+                self.actions.append(_EMIT_OP)
+            else:
+                self.actions.append(_EMIT_NAMED)
+
+    def __len__(self):
+        return len(self.next_state)
+
+
+_default_dfa = None
+
+
+def default_dfa():
+    """DFA de TOKEN_SPECS (se construye una sola vez por proceso)."""
+    global _default_dfa
+    if _default_dfa is None:
+        _default_dfa = TokenDFA(TOKEN_SPECS)
+    return _default_dfa
+
+
+class DFALexer(Lexer):
+    """Lexer que recorre el DFA generado de TOKEN_SPECS (misma interfaz que Lexer)."""
+
+    def __init__(self, file_content, line=1, column=0, chunk_size=DEFAULT_CHUNK_SIZE,
+                 encoding='utf-8', dfa=None):
+        super().__init__(file_content, line, column, chunk_size, encoding)
+        self.length = None      # Caracteres de la entrada (se conoce al terminar)
+        self.dfa = dfa if dfa is not None else default_dfa()
+
+    def spans(self):
+        """Genera (tipo, inicio, fin, línea, columna) por token, sin crear subcadenas.
+
+        inicio y fin son posiciones (en caracteres) desde el comienzo de la
+        entrada; el tipo de un operador es su propio carácter. El '$' final se
+        genera con inicio == fin == largo de la entrada.
+        """
+        for spans in self.span_blocks():
+            yield from spans
+        yield '$', self.length, self.length, self.line_num, 0
+
+    def span_blocks(self):
+        """Como spans(), pero genera una lista de spans por bloque leído (sin el '$').
+
+        Sirve para llenar columnas de a bloques (ver token_buffer.TokenBuffer).
+        Al terminar, self.length y self.line_num tienen el largo de la entrada
+        y la línea del '$'.
+        """
+        return self._scan_blocks(False)
+
+    def fill(self, buffer):
+        """Tokeniza la entrada directamente en las columnas de un
+        token_buffer.TokenBuffer (sin crear tuplas por token), incluido el '$'."""
+        for _ in self._scan_blocks(False, buffer):
+            pass
+        buffer.append('$', self.length, self.length, self.line_num, 0)
+        return buffer
+
+    def get_tokens(self):
+        """Generador que produce los mismos tokens que Lexer.get_tokens."""
+        for tokens in self._scan_blocks(True):
+            yield from tokens
+        yield Token('$', '$', self.line_num, 0)
+
+    def _scan_blocks(self, tokens, buffer=None):
+        """Recorre la entrada por bloques y genera, por bloque, la lista de
+        Token (tokens=True) o de spans con posiciones globales. Con un
+        TokenBuffer, los tokens se agregan a sus columnas y las listas quedan vacías.
+
+        Como en Lexer.get_tokens, un token que toca el final de un bloque que
+        no es el último se vuelve a analizar junto con el bloque siguiente.
+        """
+        base = 0
+        block = ''
+        for chunk, final in self._chunks():
+            block = block + chunk if block else chunk
+            text = block if tokens else None
+            if block.isascii():
+                items, consumed = self._scan_ascii(block.encode('ascii'), text, base, final, buffer)
+            else:
+                items, consumed = self._scan_regex(block, text, base, final)
+                if buffer is not None:
+                    buffer.extend(items)
+                    items = []
+            yield items
+            block = block[consumed:]
+            base += consumed
+        # Largo total de la entrada (posición del '$' en spans())
+        self.length = base + len(block)
+
+    def _scan_ascii(self, data, text, base, final, buffer=None):
+        """Tokeniza un bloque ASCII con el DFA. Devuelve (tokens o spans, consumido).
+
+        Con text (el bloque como str) se generan Token; si no, spans
+        (tipo, inicio, fin, línea, columna) con posiciones globales. Con
+        buffer (un TokenBuffer) los tokens van directo a sus columnas.
+        """
+        if buffer is not None:
+            kind_codes = {kind: buffer.kind_code(kind) for kind in self.dfa.kinds
+                          if kind is not None and kind not in _SKIPPED}
+            add_kind, add_start, add_end = buffer.kinds.append, buffer.starts.append, buffer.ends.append
+            add_line, add_column = buffer.lines.append, buffer.columns.append
+        new_tuple = tuple.__new__      # Crea el Token sin pasar por Token.__new__
+        dfa = self.dfa
+        next_state = dfa.next_state
+        start_row = next_state[0]
+        emit = dfa.actions
+        kind_names = dfa.kinds
+        # Máscaras de salida de los bucles, sobre el bloque completo (en C)
+        masks = [None] * len(next_state)
+        exit_mask = dfa.exit_mask
+        for state in dfa.loop_states:
+            masks[state] = data.translate(exit_mask[state])
+
+        line_num = self.line_num
+        line_start = self.line_start
+        spans = []
+        append = spans.append
+        chars = _CHARS
+        n = len(data)
+        i = 0
+        while i < n:
+            state = start_row[data[i]]
+            if state < 0:
+                # Byte que ninguna especificación reconoce: se descarta como MISMATCH
+                i += 1
+                continue
+            j = i + 1
+            last_state = state if emit[state] else -1
+            last_end = j
+            while True:
+                mask = masks[state]
+                if mask is not None:
+                    # Racha del bucle: hasta el primer byte que sale del estado
+                    j = mask.find(1, j)
+                    if j < 0:
+                        j = n
+                    if emit[state]:
+                        last_state, last_end = state, j
+                if j >= n:
+                    break
+                state = next_state[state][data[j]]
+                if state < 0:
+                    break
+                j += 1
+                if emit[state]:
+                    last_state, last_end = state, j
+
+            if j >= n and not final:
+                # El token podría continuar en el bloque siguiente
+                break
+            if last_state < 0:
+                i += 1
+                continue
+
+            action = emit[last_state]
+            if action == _EMIT_NEWLINE:
+                line_num += 1
+                line_start = base + last_end
+            elif action >= _EMIT_OP:
+                kind = chars[data[i]] if action == _EMIT_OP else kind_names[last_state]
+                if buffer is not None:
+                    code = kind_codes.get(kind)
+                    if code is None:
+                        code = kind_codes[kind] = buffer.kind_code(kind)
+                    add_kind(code)
+                    add_start(base + i)
+                    add_end(base + last_end)
+                    add_line(line_num)
+                    add_column(base + i - line_start)
+                elif text is None:
+                    append((kind, base + i, base + last_end, line_num, base + i - line_start))
+                else:
+                    append(new_tuple(Token, (kind, text[i:last_end], line_num, base + i - line_start)))
+            i = last_end
+
+        self.line_num = line_num
+        self.line_start = line_start
+        return spans, i
+
+    def _scan_regex(self, buffer, text, base, final):
+        """Tokeniza un bloque con caracteres no ASCII con la expresión regular de Lexer."""
+        items = []
+        consumed = len(buffer)
+        for mo in self.tok_regex.finditer(buffer):
+            if not final and mo.end() == consumed:
+                consumed = mo.start()
+                break
+            kind = mo.lastgroup
+            if kind == 'NEWLINE':
+                self.line_start = base + mo.end()
+                self.line_num += 1
+            elif kind not in _SKIPPED:
+                value = mo.group()
+                if kind == _OPERATOR_SPEC:
+                    kind = value
+                column = base + mo.start() - self.line_start
+                if text is None:
+                    items.append((kind, base + mo.start(), base + mo.end(), self.line_num, column))
+                else:
+                    items.append(Token(kind, value, self.line_num, column))
+        return items, consumed
@@ -0,0 +1,216 @@
+"""Evaluación vectorizada (NumPy) de expresiones aceptadas por el Parser.
+
+Una expresión aceptada se compila una sola vez a un plan (ExpressionPlan):
+una lista de instrucciones en forma SSA sobre registros. Al compilar:
+
+- las constantes se pliegan (constant folding): '2 * 3 + x' queda como '6 + x';
+- las subexpresiones repetidas se calculan una sola vez: el árbol ya viene
+  con hash-consing (parse_tree.TreeArena) y las instrucciones también se
+  deduplican por (operación, operandos).
+
+Luego el plan se ejecuta sobre columnas: un dict que asocia cada
+identificador a un arreglo NumPy (todos del mismo largo) y devuelve la
+columna resultado, con una operación de arreglo por instrucción.
+
+Semántica (la de 'double' en Java):
+- toda la aritmética es en float64; '/' es división real;
+- '%' es el resto con el signo del dividendo (np.fmod, como en Java);
+- x / 0 da +inf, -inf o nan (0 / 0) según IEEE 754, y x % 0 da nan.
+  Con zero_division='nan', toda división o módulo por cero da nan.
+
+NumPy es una dependencia opcional: sólo se importa al evaluar.
+"""
+
+import math
+
+from main import START_SYMBOL, TRACE_NONE, Lexer, Parser
+from parse_tree import TreeArena
+
+_OPERATORS = ('+', '-', '*', '/', '%')
+
+
+def _fold(op, a, b, zero_division):
+    """Aplica 'op' a dos constantes con la misma semántica que el plan vectorizado."""
+    if op == '+':
+        return a + b
+    if op == '-':
+        return a - b
+    if op == '*':
+        return a * b
+    if b == 0 or math.isnan(b):
+        if zero_division == 'nan' or op == '%' or math.isnan(b) or a == 0 or math.isnan(a):
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    if op == '/':
+        return a / b
+    if math.isinf(a):
+        return math.nan
+    return math.fmod(a, b)
+
+
+class ExpressionPlan:
+    """Plan de evaluación compilado de una expresión.
+
+    instructions: lista de tuplas
+        ('const', valor) | ('var', nombre) | (op, registro_a, registro_b)
+    El registro i es el resultado de la instrucción i; el último es el resultado.
+    """
+
+    def __init__(self, instructions, zero_division='ieee'):
+        self.instructions = instructions
+        self.zero_division = zero_division
+        self.variables = sorted({arg for kind, arg, *_ in instructions if kind == 'var'})
+
+        # Última instrucción que usa cada registro (para liberar memoria al ejecutar)
+        last_use = {}
+        for i, (kind, *args) in enumerate(instructions):
+            if kind in _OPERATORS:
+                last_use[args[0]] = i
+                last_use[args[1]] = i
+        self._release = [[] for _ in instructions]
+        for register, i in last_use.items():
+            self._release[i].append(register)
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def __call__(self, columns, size=None):
+        return self.evaluate(columns, size)
+
+    def evaluate(self, columns, size=None):
+        """Evalúa el plan sobre un dict {identificador: columna} y devuelve la columna resultado.
+
+        'size' sólo hace falta si la expresión no tiene variables y no se pasan
+        columnas (resultado constante).
+        """
+        import numpy as np
+
+        missing = [name for name in self.variables if name not in columns]
+        if missing:
+            raise KeyError(f"Faltan columnas para: {', '.join(missing)}")
+        if size is None:
+            sizes = {len(columns[name]) for name in (self.variables or columns)}
+            if len(sizes) > 1:
+                raise ValueError("Las columnas deben tener el mismo largo")
+            size = sizes.pop() if sizes else 1
+
+        ufuncs = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide, '%': np.fmod}
+        registers = [None] * len(self.instructions)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i, (kind, *args) in enumerate(self.instructions):
+                if kind == 'const':
+                    registers[i] = np.float64(args[0])
+                elif kind == 'var':
+                    registers[i] = np.asarray(columns[args[0]], dtype=np.float64)
+                else:
+                    a, b = registers[args[0]], registers[args[1]]
+                    value = ufuncs[kind](a, b)
+                    if self.zero_division == 'nan' and kind in ('/', '%'):
+                        value = np.where(b == 0, np.nan, value)
+                    registers[i] = value
+                for register in self._release[i]:
+                    registers[register] = None
+
+        result = registers[-1]
+        if np.ndim(result) == 0:
+            result = np.full(size, result, dtype=np.float64)
+        return result
+
+
+class PlanBuilder:
+    """Traduce el árbol (TreeArena) de una expresión a un ExpressionPlan."""
+
+    def __init__(self, zero_division='ieee'):
+        self.zero_division = zero_division
+        self.instructions = []
+        self._cse = {}
+
+    def _emit(self, instruction):
+        """Agrega una instrucción (o reutiliza una idéntica) y devuelve su registro."""
+        register = self._cse.get(instruction)
+        if register is None:
+            register = self._cse[instruction] = len(self.instructions)
+            self.instructions.append(instruction)
+        return register
+
+    def _binary(self, op, a, b):
+        ia, ib = self.instructions[a], self.instructions[b]
+        if ia[0] == 'const' and ib[0] == 'const':
+            return self._emit(('const', _fold(op, ia[1], ib[1], self.zero_division)))
+        return self._emit((op, a, b))
+
+    def build(self, arena, root):
+        """Compila el subárbol 'root' del arena y devuelve el plan."""
+        # Nodos alcanzables desde la raíz. En el arena los hijos siempre se crean
+        # antes que el padre, así que recorrerlos por id creciente es un orden
+        # válido para calcular cada nodo después de sus hijos (sin recursión).
+        reachable = set()
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            if node not in reachable:
+                reachable.add(node)
+                pending.extend(arena.children(node))
+
+        registers = {}
+        for node in sorted(reachable):
+            symbol = arena.symbol(node)
+            children = arena.children(node)
+            if symbol in ('E', 'T'):
+                # E -> T EP  /  T -> F TP ; la cola (EP/TP) es una cadena asociativa a izquierda
+                left = registers[children[0]]
+                rest = children[1]
+                while arena.child_count[rest]:
+                    op_node, operand, rest = arena.children(rest)
+                    left = self._binary(arena.symbol(op_node), left, registers[operand])
+                registers[node] = left
+            elif symbol == 'F':
+                if len(children) == 3:
+                    registers[node] = registers[children[1]]       # F -> ( E )
+                else:
+                    registers[node] = registers[children[0]]       # F -> id | num
+            elif symbol == 'id':
+                registers[node] = self._emit(('var', arena.lexeme(node)))
+            elif symbol == 'num':
+                registers[node] = self._emit(('const', float(arena.lexeme(node))))
+
+        return ExpressionPlan(self._live_instructions(registers[root]), self.zero_division)
+
+    def _live_instructions(self, result):
+        """Descarta las instrucciones que no llegan al resultado (p. ej. constantes ya plegadas).
+
+        Los operandos siempre tienen un registro menor que quien los usa, así
+        que el resultado queda como la última instrucción.
+        """
+        live = {result}
+        for i in range(result, -1, -1):
+            if i in live and self.instructions[i][0] in _OPERATORS:
+                live.update(self.instructions[i][1:])
+
+        renumber = {}
+        instructions = []
+        for i in sorted(live):
+            kind, *args = self.instructions[i]
+            if kind in _OPERATORS:
+                args = [renumber[a] for a in args]
+            renumber[i] = len(instructions)
+            instructions.append((kind, *args))
+        return instructions
+
+
+def compile_expression(text, parsing_table=None, zero_division='ieee'):
+    """Analiza 'text' y compila la expresión a un ExpressionPlan.
+
+    Lanza ValueError con el mensaje del Parser si la expresión no es aceptada.
+    """
+    if parsing_table is None:
+        from table_cache import load_parser_components
+        _, _, _, parsing_table = load_parser_components()
+
+    parser = Parser(parsing_table, START_SYMBOL, trace=TRACE_NONE)
+    arena = TreeArena()
+    result = parser.parse_tokens(Lexer(text).get_tokens(), arena)
+    if not result:
+        raise ValueError(f"{result.error} (línea {result.line}, columna {result.column})")
+    return PlanBuilder(zero_division).build(arena, result.tree)
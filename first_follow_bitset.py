@@ -0,0 +1,172 @@
+"""Cálculo de FIRST/FOLLOW con bitsets y lista de trabajo (worklist).
+
+Alternativa a compute_first_sets / compute_follow_sets de main.py para
+gramáticas grandes (miles de producciones). Los conjuntos de terminales se
+guardan como enteros usados como bitsets (un bit por terminal) y los cambios
+se propagan por un grafo de dependencias: cuando el FIRST (o el FOLLOW) de un
+no-terminal crece, sólo se vuelven a evaluar las producciones (o los
+no-terminales) que dependen de él, en lugar de recorrer toda la gramática
+hasta que nada cambie.
+
+Las funciones tienen la misma firma y devuelven exactamente los mismos
+conjuntos que las de main.py, así que se pueden intercambiar directamente.
+"""
+
+from collections import deque
+
+from main import make_first_of_sequence
+
+
+def _bits_to_set(bits, terminals):
+    """Convierte un bitset en el conjunto de nombres de terminales."""
+    result = set()
+    i = 0
+    while bits:
+        if bits & 1:
+            result.add(terminals[i])
+        bits >>= 1
+        i += 1
+    return result
+
+
+def _encode_productions(grammar, non_terminals, terminals):
+    """Traduce cada producción a una lista de (es_no_terminal, índice).
+
+    Como en get_first_of_sequence, ['lambda'] es la secuencia vacía y los
+    símbolos que no son ni terminales ni no-terminales se ignoran.
+    """
+    nt_index = {nt: i for i, nt in enumerate(non_terminals)}
+    t_index = {t: i for i, t in enumerate(terminals)}
+    encoded = []
+    for nt, productions in grammar.items():
+        for production in productions:
+            if production == ['lambda']:
+                body = []
+            else:
+                body = []
+                for symbol in production:
+                    if symbol in t_index:
+                        body.append((False, t_index[symbol]))
+                    elif symbol in nt_index:
+                        body.append((True, nt_index[symbol]))
+            encoded.append((nt_index[nt], body))
+    return encoded
+
+
+def _first_of_body(body, first, nullable):
+    """FIRST (como bitset) de la secuencia y si es anulable."""
+    bits = 0
+    for is_nt, index in body:
+        if not is_nt:
+            return bits | (1 << index), False
+        bits |= first[index]
+        if not nullable[index]:
+            return bits, False
+    return bits, True
+
+
+def compute_first_sets_bitset(grammar, non_terminals, terminals):
+    """Calcula los conjuntos FIRST con bitsets y una lista de trabajo de producciones."""
+    productions = _encode_productions(grammar, non_terminals, terminals)
+    n = len(non_terminals)
+    first = [0] * n
+    nullable = [False] * n
+
+    # users[X] = producciones cuyo FIRST puede cambiar si cambia FIRST(X) o si X se vuelve anulable
+    users = [[] for _ in range(n)]
+    for p, (_, body) in enumerate(productions):
+        for is_nt, index in body:
+            if is_nt:
+                users[index].append(p)
+
+    worklist = deque(range(len(productions)))
+    queued = [True] * len(productions)
+
+    while worklist:
+        p = worklist.popleft()
+        queued[p] = False
+        lhs, body = productions[p]
+
+        bits, is_nullable = _first_of_body(body, first, nullable)
+        new_bits = bits & ~first[lhs]
+        becomes_nullable = is_nullable and not nullable[lhs]
+        if new_bits or becomes_nullable:
+            first[lhs] |= new_bits
+            if becomes_nullable:
+                nullable[lhs] = True
+            for q in users[lhs]:
+                if not queued[q]:
+                    queued[q] = True
+                    worklist.append(q)
+
+    first_sets = {}
+    for i, nt in enumerate(non_terminals):
+        first_sets[nt] = _bits_to_set(first[i], terminals)
+        if nullable[i]:
+            first_sets[nt].add('lambda')
+    return first_sets, make_first_of_sequence(first_sets, non_terminals, terminals)
+
+
+def compute_follow_sets_bitset(grammar, non_terminals, start_symbol, first_sets, get_first_seq_func):
+    """Calcula los conjuntos FOLLOW propagando bitsets por el grafo FOLLOW(A) ⊆ FOLLOW(B).
+
+    get_first_seq_func se acepta por compatibilidad con compute_follow_sets;
+    el FIRST de cada sufijo se calcula aquí directamente sobre bitsets.
+    """
+    nt_set = set(non_terminals)
+    # Terminales: todo símbolo de la gramática que no es no-terminal (como TERMINALS en main.py)
+    terminals = sorted({symbol for productions in grammar.values() for production in productions
+                        for symbol in production
+                        if symbol not in nt_set and symbol != 'lambda'}) + ['$']
+    t_index = {t: i for i, t in enumerate(terminals)}
+
+    n = len(non_terminals)
+    nt_index = {nt: i for i, nt in enumerate(non_terminals)}
+    first = [0] * n
+    nullable = [False] * n
+    for nt, f_set in first_sets.items():
+        i = nt_index[nt]
+        nullable[i] = 'lambda' in f_set
+        for t in f_set:
+            if t != 'lambda':
+                first[i] |= 1 << t_index[t]
+
+    productions = _encode_productions(grammar, non_terminals, terminals)
+
+    # Regla 2 (constante): FIRST(beta) - {lambda} va a FOLLOW(B).
+    # Regla 3 (arista): si beta es anulable, FOLLOW(A) ⊆ FOLLOW(B).
+    # Cada producción se recorre de derecha a izquierda acumulando FIRST(beta).
+    follow = [0] * n
+    follow[nt_index[start_symbol]] = 1 << t_index['$']
+    edges = [set() for _ in range(n)]
+    for lhs, body in productions:
+        beta_bits = 0
+        beta_nullable = True
+        for is_nt, index in reversed(body):
+            if not is_nt:
+                beta_bits = 1 << index
+                beta_nullable = False
+                continue
+            follow[index] |= beta_bits
+            if beta_nullable and index != lhs:
+                edges[lhs].add(index)
+            if nullable[index]:
+                beta_bits |= first[index]
+            else:
+                beta_bits = first[index]
+                beta_nullable = False
+
+    worklist = deque(range(n))
+    queued = [True] * n
+    while worklist:
+        a = worklist.popleft()
+        queued[a] = False
+        bits = follow[a]
+        for b in edges[a]:
+            if bits & ~follow[b]:
+                follow[b] |= bits
+                if not queued[b]:
+                    queued[b] = True
+                    worklist.append(b)
+
+    return {nt: _bits_to_set(follow[nt_index[nt]], terminals) for nt in non_terminals}
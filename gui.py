@@ -2,11 +2,83 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import os
 import sys
+import time
+import queue
+import tempfile
+import threading
 from main import (
     GRAMMAR, NON_TERMINALS, TERMINALS, START_SYMBOL,
-    compute_first_sets, compute_follow_sets, create_parsing_table,
-    Parser, Lexer
+    Parser, CompiledTable
 )
+from table_cache import load_parser_components
+from incremental import IncrementalAnalyzer
+from token_buffer import TokenBuffer
+from step_trace import ACTION_ACCEPT, ACTION_ERROR, ACTION_EXPAND, ACTION_MATCH, StepTrace
+
+# Espera (ms) tras la última edición antes de reanalizar en modo en vivo
+LIVE_DELAY_MS = 300
+
+# Análisis en segundo plano: cada cuánto (ms) la interfaz revisa la cola de
+# salida, cuántos mensajes viajan por lote y cuántas líneas se muestran como
+# máximo en cada panel (la salida completa se puede exportar).
+POLL_INTERVAL_MS = 50
+BATCH_SIZE = 500
+MAX_PANEL_LINES = 5000
+
+
+class OutputSink:
+    """Salida de un panel durante un análisis en segundo plano.
+
+    Se usa desde el hilo de trabajo: guarda la salida completa en un archivo
+    temporal (para exportarla) y envía a la interfaz, por lotes y a través de
+    la cola, sólo las primeras MAX_PANEL_LINES líneas (los mensajes de error
+    se envían siempre). GUIParser deja de formatear la traza de texto cuando
+    el panel se llena (saturated): los pasos siguientes quedan sólo en la
+    grabación (🔍 Reproducir pasos), no en la exportación.
+    """
+    
+    def __init__(self, channel, panel, limit=MAX_PANEL_LINES):
+        self.channel = channel
+        self.panel = panel
+        self.limit = limit
+        self.shown = 0
+        self.pending = []
+        self.file = tempfile.SpooledTemporaryFile(max_size=8 << 20, mode='w+', encoding='utf-8')
+    
+    def log_result(self, message, tag=""):
+        """Misma interfaz que ParserGUI.log_result (la usa GUIParser)."""
+        self.file.write(message)
+        if tag == "error":
+            self.pending.append((message, tag))
+        elif self.shown < self.limit:
+            self.shown += message.count('\n')
+            self.pending.append((message, tag))
+            if self.shown >= self.limit:
+                self.pending.append((f"\n... Panel limitado a {self.limit} líneas. Use 💾 Exportar para ver "
+                                     f"la salida completa, o 🔍 Reproducir pasos para la traza ...\n", "warning"))
+            if len(self.pending) >= BATCH_SIZE:
+                self.flush()
+    
+    @property
+    def saturated(self):
+        """True cuando el panel ya no muestra más líneas (salvo errores y resúmenes)."""
+        return self.shown >= self.limit
+    
+    def log_summary(self, message, tag=""):
+        """Mensaje que se muestra siempre, aunque el panel ya esté lleno."""
+        self.file.write(message)
+        self.pending.append((message, tag))
+    
+    def flush(self):
+        """Envía a la interfaz los mensajes pendientes."""
+        if self.pending:
+            self.channel.put((self.panel, self.pending))
+            self.pending = []
+    
+    def read_all(self):
+        """Contenido completo (para exportar)."""
+        self.file.seek(0)
+        return self.file.read()
 
 
 class ParserGUI:
@@ -24,6 +96,18 @@ class ParserGUI:
         self.first_sets = None
         self.follow_sets = None
         self.analysis_performed = False
+        self.incremental = None
+        self.live_job = None
+        self.worker = None
+        self.channel = None
+        self.cancel_event = None
+        self.worker_parser = None
+        self.sinks = None
+        self.analysis_tokens = None     # Tokens del último análisis (para la reproducción)
+        self.recording = None           # StepTrace del último análisis
+        self.edits = 0                  # Ediciones del editor (invalidan la grabación)
+        self.analysis_edits = 0         # Valor de 'edits' al empezar el último análisis
+        self.viewer = None
         
         # Inicializar conjuntos y tabla
         self.initialize_parser_components()
@@ -32,18 +116,9 @@ class ParserGUI:
         self.create_widgets()
         
     def initialize_parser_components(self):
-        """Inicializa los conjuntos FIRST, FOLLOW y la tabla sintáctica."""
-        self.first_sets, self.get_first_seq_func = compute_first_sets(
-            GRAMMAR, NON_TERMINALS, TERMINALS
-        )
-        self.follow_sets = compute_follow_sets(
-            GRAMMAR, NON_TERMINALS, START_SYMBOL, 
-            self.first_sets, self.get_first_seq_func
-        )
-        self.parsing_table = create_parsing_table(
-            GRAMMAR, self.first_sets, self.follow_sets, 
-            self.get_first_seq_func, NON_TERMINALS, TERMINALS
-        )
+        """Inicializa los conjuntos FIRST, FOLLOW y la tabla sintáctica (desde la caché en disco)."""
+        (self.first_sets, self.get_first_seq_func,
+         self.follow_sets, self.parsing_table) = load_parser_components()
         
     def create_widgets(self):
         """Crea todos los widgets de la interfaz."""
@@ -66,8 +141,9 @@ class ParserGUI:
         ttk.Button(control_frame, text="📁 Abrir Archivo", 
                   command=self.open_file, width=20).grid(row=0, column=0, padx=5, pady=5)
         
-        ttk.Button(control_frame, text="▶ Analizar", 
-                  command=self.analyze_file, width=20).grid(row=0, column=1, padx=5, pady=5)
+        self.btn_analyze = ttk.Button(control_frame, text="▶ Analizar", 
+                  command=self.analyze_file, width=20)
+        self.btn_analyze.grid(row=0, column=1, padx=5, pady=5)
         
         self.btn_grammar = ttk.Button(control_frame, text="📋 Mostrar Gramática", 
                   command=self.show_grammar, width=20, state='disabled')
@@ -81,10 +157,35 @@ class ParserGUI:
                   command=self.show_table, width=20, state='disabled')
         self.btn_table.grid(row=0, column=4, padx=5, pady=5)
         
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="⚡ Análisis en vivo", variable=self.live_var,
+                        command=self.toggle_live).grid(row=0, column=5, padx=5, pady=5)
+        
+        # Sin traza de texto sólo se graban los pasos (mucho más barato)
+        self.trace_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(control_frame, text="📝 Traza de texto",
+                        variable=self.trace_var).grid(row=0, column=6, padx=5, pady=5)
+        
         # Label para archivo actual
         self.file_label = ttk.Label(control_frame, text="Ningún archivo seleccionado", 
                                     foreground="gray")
-        self.file_label.grid(row=1, column=0, columnspan=5, pady=5)
+        self.file_label.grid(row=1, column=0, columnspan=6, pady=5)
+        
+        # Progreso del análisis en segundo plano
+        self.progress = ttk.Progressbar(control_frame, mode='determinate')
+        self.progress.grid(row=2, column=0, columnspan=4, sticky=(tk.W, tk.E), padx=5)
+        
+        self.btn_cancel = ttk.Button(control_frame, text="⏹ Cancelar", 
+                  command=self.cancel_analysis, width=20, state='disabled')
+        self.btn_cancel.grid(row=2, column=4, padx=5, pady=5)
+        
+        self.btn_export = ttk.Button(control_frame, text="💾 Exportar", 
+                  command=self.export_output, width=20, state='disabled')
+        self.btn_export.grid(row=2, column=5, padx=5, pady=5)
+        
+        self.btn_replay = ttk.Button(control_frame, text="🔍 Reproducir pasos", 
+                  command=self.open_replay, width=20, state='disabled')
+        self.btn_replay.grid(row=2, column=6, padx=5, pady=5)
         
         # --- Panel izquierdo: Editor de código ---
         left_frame = ttk.LabelFrame(main_frame, text="Código de Entrada", padding="10")
@@ -97,6 +198,13 @@ class ParserGUI:
             font=("Consolas", 11), bg='#ffffff', fg='#000000'
         )
         self.code_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.code_text.tag_config("error_token", background="#f48771", underline=True)
+        self.code_text.tag_config("trace_token", background="#9cdcfe")
+        self.code_text.bind("<<Modified>>", self.on_text_modified)
+        
+        # Estado del análisis en vivo
+        self.live_status = ttk.Label(left_frame, text="", foreground="gray")
+        self.live_status.grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
         
         # --- Panel derecho: Resultados ---
         right_frame = ttk.LabelFrame(main_frame, text="Resultados del Análisis", padding="10")
@@ -151,64 +259,255 @@ class ParserGUI:
                 messagebox.showerror("Error", f"No se pudo abrir el archivo:\n{str(e)}")
     
     def analyze_file(self):
-        """Analiza el contenido del editor."""
-        content = self.code_text.get(1.0, tk.END).strip()
+        """Analiza el contenido del editor en un hilo de trabajo."""
+        # Sin recortar: las posiciones de los tokens son las del editor
+        content = self.code_text.get("1.0", "end-1c")
         
-        if not content:
+        if not content.strip():
             messagebox.showwarning("Advertencia", "No hay contenido para analizar.")
             return
+        if self.worker is not None:
+            return
         
         # Limpiar resultados previos
         self.result_text.delete(1.0, tk.END)
         self.tokens_text.delete(1.0, tk.END)
-        
-        # Crear lexer y obtener tokens
-        lexer = Lexer(content)
-        tokens = list(lexer.get_tokens())
-        
-        # Mostrar tokens
-        self.tokens_text.insert(tk.END, "Tokens identificados:\n")
-        self.tokens_text.insert(tk.END, "-" * 80 + "\n")
-        for i, token in enumerate(tokens, 1):
-            if token.type != '$':
-                self.tokens_text.insert(
-                    tk.END, 
-                    f"{i:3}. Tipo: {token.type:10} Valor: {token.value:15} "
-                    f"[Línea {token.line}, Columna {token.column}]\n"
-                )
-        
-        # Realizar análisis sintáctico
-        self.log_result("="*80 + "\n", "info")
-        self.log_result("ANÁLISIS SINTÁCTICO\n", "info")
-        self.log_result("="*80 + "\n\n", "info")
-        
-        # Crear un nuevo lexer para el parser
-        lexer = Lexer(content)
-        
-        # Crear parser personalizado que escribe en la GUI
-        parser = GUIParser(self.parsing_table, START_SYMBOL, self)
-        parser.token_stream = lexer.get_tokens()
-        parser._next_token()
-        
-        # Ejecutar análisis
-        success = parser.parse_internal()
-        
-        # Habilitar botones después del primer análisis
-        if not self.analysis_performed:
+        self.close_sinks()
+        self.close_replay()
+        self.recording = None
+        self.analysis_edits = self.edits
+        
+        self.channel = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.sinks = {'result': OutputSink(self.channel, 'result'),
+                      'tokens': OutputSink(self.channel, 'tokens')}
+        self.worker_parser = GUIParser(self.parsing_table, START_SYMBOL, self.sinks['result'],
+                                       self.cancel_event, text_trace=self.trace_var.get())
+        self.worker = threading.Thread(target=self.run_analysis, args=(content,), daemon=True)
+        
+        self.set_running(True)
+        self.worker.start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_analysis)
+    
+    def run_analysis(self, content):
+        """Cuerpo del hilo de trabajo: tokeniza una vez y analiza (no toca widgets)."""
+        result_sink = self.sinks['result']
+        tokens_sink = self.sinks['tokens']
+        parser = self.worker_parser
+        success = False
+        try:
+            # Tokenizar una sola vez: el mismo buffer (columnas compactas, sin un
+            # objeto por token) alimenta al panel y al parser
+            tokens = TokenBuffer.from_text(content)
+            self.analysis_tokens = tokens
+            self.channel.put(('total', len(tokens)))
+            
+            # Mostrar tokens
+            tokens_sink.log_result("Tokens identificados:\n")
+            tokens_sink.log_result("-" * 80 + "\n")
+            for i, token in enumerate(tokens, 1):
+                if token.type != '$':
+                    tokens_sink.log_result(
+                        f"{i:3}. Tipo: {token.type:10} Valor: {token.value:15} "
+                        f"[Línea {token.line}, Columna {token.column}]\n"
+                    )
+            tokens_sink.flush()
+            
+            # Realizar análisis sintáctico
+            result_sink.log_result("="*80 + "\n", "info")
+            result_sink.log_result("ANÁLISIS SINTÁCTICO\n", "info")
+            result_sink.log_result("="*80 + "\n\n", "info")
+            
+            parser.token_stream = iter(tokens)
+            parser._next_token()
+            success = parser.parse_internal()
+            
+            if success is None:
+                result_sink.log_summary("\n" + "="*80 + "\n", "warning")
+                result_sink.log_summary("⏹ ANÁLISIS CANCELADO\n", "warning")
+                result_sink.log_summary("="*80 + "\n", "warning")
+            elif success:
+                result_sink.log_summary("\n" + "="*80 + "\n", "success")
+                result_sink.log_summary("✓ ANÁLISIS EXITOSO\n", "success")
+                result_sink.log_summary("="*80 + "\n", "success")
+                result_sink.log_summary("La cadena es aceptada por la gramática.\n", "success")
+            else:
+                result_sink.log_summary("\n" + "="*80 + "\n", "error")
+                result_sink.log_summary("✗ ANÁLISIS FALLIDO\n", "error")
+                result_sink.log_summary("="*80 + "\n", "error")
+            if success is not None:
+                result_sink.log_summary(f"Pasos grabados: {len(parser.recorder)} "
+                                        f"(🔍 Reproducir pasos para recorrerlos)\n", "info")
+        except Exception as e:
+            result_sink.log_summary(f"\nError inesperado durante el análisis: {e}\n", "error")
+        finally:
+            result_sink.flush()
+            tokens_sink.flush()
+            self.channel.put(('done', success))
+    
+    def poll_analysis(self):
+        """Vuelca en los paneles los lotes recibidos del hilo de trabajo."""
+        panels = {'result': self.result_text, 'tokens': self.tokens_text}
+        touched = set()
+        done = accepted = False
+        while True:
+            try:
+                kind, payload = self.channel.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'total':
+                self.progress.config(maximum=max(payload, 1), value=0)
+            elif kind == 'done':
+                done, accepted = True, payload
+            else:
+                # Un solo insert por lote: texto, tag, texto, tag, ...
+                args = []
+                for message, tag in payload:
+                    args.extend((message, tag))
+                panels[kind].insert(tk.END, *args)
+                touched.add(kind)
+        
+        for kind in touched:
+            panels[kind].see(tk.END)
+        if accepted:
+            self.progress.config(value=self.progress.cget('maximum'))
+        else:
+            self.progress.config(value=self.worker_parser.tokens_consumed)
+        
+        if done:
+            # Habilitar botones después del primer análisis
+            self.worker = None
+            # Un análisis cancelado (accepted None) deja una grabación incompleta
+            if (accepted is not None and self.worker_parser.recorder.kinds
+                    and self.analysis_edits == self.edits):
+                self.recording = self.worker_parser.recorder
             self.analysis_performed = True
-            self.btn_grammar.config(state='normal')
-            self.btn_first_follow.config(state='normal')
-            self.btn_table.config(state='normal')
-        
-        if success:
-            self.log_result("\n" + "="*80 + "\n", "success")
-            self.log_result("✓ ANÁLISIS EXITOSO\n", "success")
-            self.log_result("="*80 + "\n", "success")
-            self.log_result("La cadena es aceptada por la gramática.\n", "success")
+            self.set_running(False)
+        else:
+            self.root.after(POLL_INTERVAL_MS, self.poll_analysis)
+    
+    def set_running(self, running):
+        """Habilita o deshabilita los controles mientras hay un análisis en curso."""
+        idle = 'disabled' if running else 'normal'
+        self.btn_analyze.config(state=idle)
+        self.btn_export.config(state=idle)
+        self.btn_cancel.config(state='normal' if running else 'disabled')
+        info = 'normal' if self.analysis_performed and not running else 'disabled'
+        for button in (self.btn_grammar, self.btn_first_follow, self.btn_table):
+            button.config(state=info)
+        self.btn_replay.config(state='normal' if self.recording is not None and not running else 'disabled')
+    
+    def cancel_analysis(self):
+        """Pide al hilo de trabajo que detenga el análisis."""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+    
+    def export_output(self):
+        """Guarda en un archivo la salida completa del último análisis."""
+        if self.sinks is None:
+            return
+        filename = filedialog.asksaveasfilename(
+            title="Exportar resultados",
+            defaultextension=".txt",
+            filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
+        )
+        if filename:
+            try:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(self.sinks['tokens'].read_all())
+                    f.write("\n")
+                    f.write(self.sinks['result'].read_all())
+                self.file_label.config(text=f"Resultados exportados a: {os.path.basename(filename)}",
+                                       foreground="black")
+            except Exception as e:
+                messagebox.showerror("Error", f"No se pudo exportar:\n{str(e)}")
+    
+    def open_replay(self):
+        """Abre la ventana de reproducción de los pasos del último análisis."""
+        if self.recording is None:
+            return
+        self.close_replay()
+        self.viewer = TraceViewer(self, self.recording, self.analysis_tokens)
+    
+    def close_replay(self):
+        """Cierra la ventana de reproducción (si está abierta)."""
+        if self.viewer is not None:
+            self.viewer.close()
+            self.viewer = None
+    
+    def show_trace_token(self, token):
+        """Marca en el editor el token del paso que se está viendo."""
+        self.code_text.tag_remove("trace_token", "1.0", tk.END)
+        if token is None or token.type == '$':
+            return
+        start_index = f"{token.line}.{token.column}"
+        self.code_text.tag_add("trace_token", start_index, f"{start_index}+{len(token.value)}c")
+        self.code_text.see(start_index)
+    
+    def close_sinks(self):
+        """Libera los archivos temporales del análisis anterior."""
+        if self.sinks is not None:
+            for sink in self.sinks.values():
+                sink.file.close()
+            self.sinks = None
+    
+    def toggle_live(self):
+        """Activa o desactiva el análisis en vivo del editor."""
+        if self.live_var.get():
+            if self.incremental is None:
+                self.incremental = IncrementalAnalyzer(self.parsing_table, START_SYMBOL)
+            self.schedule_live_analysis(0)
+        else:
+            if self.live_job is not None:
+                self.root.after_cancel(self.live_job)
+                self.live_job = None
+            self.code_text.tag_remove("error_token", "1.0", tk.END)
+            self.live_status.config(text="")
+    
+    def on_text_modified(self, event=None):
+        """Descarta la grabación de pasos y reprograma el análisis en vivo después de cada edición."""
+        if not self.code_text.edit_modified():
+            return
+        self.code_text.edit_modified(False)
+        # La grabación ya no corresponde al texto: sus posiciones quedarían corridas
+        self.edits += 1
+        if self.recording is not None:
+            self.close_replay()
+            self.recording = None
+            self.btn_replay.config(state='disabled')
+        if self.live_var.get():
+            self.schedule_live_analysis(LIVE_DELAY_MS)
+    
+    def schedule_live_analysis(self, delay):
+        """Programa el análisis en vivo (cancelando el pendiente, si lo hay)."""
+        if self.live_job is not None:
+            self.root.after_cancel(self.live_job)
+        self.live_job = self.root.after(delay, self.live_analyze)
+    
+    def live_analyze(self):
+        """Reanaliza el editor de forma incremental y marca el token del error."""
+        self.live_job = None
+        start = time.perf_counter()
+        result = self.incremental.update(self.code_text.get("1.0", "end-1c"))
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        self.code_text.tag_remove("error_token", "1.0", tk.END)
+        if result.accepted:
+            self.live_status.config(text=f"✓ Aceptada  ({elapsed:.1f} ms)", foreground="#2e7d32")
+            return
+        
+        token = result.token
+        if token.type == '$':
+            # Fin de la entrada: se marca el último carácter del texto
+            self.code_text.tag_add("error_token", "end-2c", "end-1c")
         else:
-            self.log_result("\n" + "="*80 + "\n", "error")
-            self.log_result("✗ ANÁLISIS FALLIDO\n", "error")
-            self.log_result("="*80 + "\n", "error")
+            start_index = f"{token.line}.{token.column}"
+            self.code_text.tag_add("error_token", start_index, f"{start_index}+{len(token.value)}c")
+            self.code_text.see(start_index)
+        self.live_status.config(
+            text=f"✗ Línea {token.line}, columna {token.column}: {result.error}  ({elapsed:.1f} ms)",
+            foreground="#c62828"
+        )
     
     def show_grammar(self):
         """Muestra la gramática en los resultados."""
@@ -277,15 +576,137 @@ class ParserGUI:
         self.result_text.see(tk.END)
 
 
+class TraceViewer:
+    """Ventana que recorre los pasos grabados de un análisis (step_trace.StepTrace).
+
+    La pila de cada paso se reconstruye al mostrarlo (recorder.stack_at), así
+    que saltar a cualquier paso no depende de la traza de texto.
+    """
+    
+    def __init__(self, gui, recorder, tokens):
+        self.gui = gui
+        self.recorder = recorder
+        self.tokens = tokens
+        self.first = recorder.first
+        self.last = len(recorder) - 1
+        self.current = None
+        
+        self.window = tk.Toplevel(gui.root)
+        self.window.title("Reproducción de pasos")
+        self.window.geometry("900x500")
+        self.window.protocol("WM_DELETE_WINDOW", self.gui.close_replay)
+        
+        frame = ttk.Frame(self.window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Controles: inicio, anterior, siguiente, fin, ir al paso N, ir al error
+        controls = ttk.Frame(frame)
+        controls.pack(fill=tk.X)
+        ttk.Button(controls, text="⏮", width=4,
+                   command=lambda: self.seek(self.first)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="◀", width=4,
+                   command=lambda: self.seek(self.current - 1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="▶", width=4,
+                   command=lambda: self.seek(self.current + 1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="⏭", width=4,
+                   command=lambda: self.seek(self.last)).pack(side=tk.LEFT, padx=2)
+        ttk.Label(controls, text="Paso:").pack(side=tk.LEFT, padx=(15, 2))
+        self.step_var = tk.StringVar()
+        entry = ttk.Entry(controls, textvariable=self.step_var, width=12)
+        entry.pack(side=tk.LEFT)
+        entry.bind("<Return>", self.seek_entry)
+        ttk.Button(controls, text="Ir", command=self.seek_entry).pack(side=tk.LEFT, padx=2)
+        error_step = recorder.error_step()
+        ttk.Button(controls, text="⚠ Ir al error", command=self.seek_error,
+                   state='normal' if error_step is not None else 'disabled').pack(side=tk.LEFT, padx=15)
+        
+        self.scale = ttk.Scale(frame, from_=self.first, to=self.last, orient=tk.HORIZONTAL,
+                               command=self.on_scale)
+        self.scale.pack(fill=tk.X, pady=5)
+        self.status = ttk.Label(frame, text="")
+        self.status.pack(fill=tk.X)
+        
+        self.detail = scrolledtext.ScrolledText(
+            frame, wrap=tk.WORD, font=("Consolas", 10), bg='#1e1e1e', fg='#d4d4d4'
+        )
+        self.detail.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+        self.detail.tag_config("info", foreground="#569cd6")
+        self.detail.tag_config("error", foreground="#f48771")
+        self.detail.tag_config("success", foreground="#4ec9b0")
+        
+        self.seek(error_step if error_step is not None else self.first)
+    
+    def seek(self, n):
+        """Muestra el paso n (se ajusta a los pasos grabados)."""
+        n = max(self.first, min(self.last, n))
+        self.current = n
+        recorder = self.recorder
+        step = recorder.step(n)
+        self.step_var.set(str(n))
+        if int(float(self.scale.get())) != n:
+            self.scale.set(n)
+        
+        discarded = f"  (los primeros {self.first} se descartaron)" if self.first else ""
+        self.status.config(text=f"Paso {n} de {self.last}  |  profundidad de la pila: "
+                                f"{recorder.depth_at(n)}{discarded}")
+        tag = {ACTION_ERROR: "error", ACTION_ACCEPT: "success"}.get(step.kind, "info")
+        self.detail.delete(1.0, tk.END)
+        self.detail.insert(tk.END, recorder.describe(n, self.tokens) + "\n\n", tag)
+        self.detail.insert(tk.END, "Pila antes del paso (tope a la derecha):\n", "info")
+        self.detail.insert(tk.END, f"{recorder.symbols_at(n)}\n\n")
+        if step.kind != ACTION_ERROR:
+            self.detail.insert(tk.END, "Pila después del paso:\n", "info")
+            self.detail.insert(tk.END, f"{recorder.symbols_at(n + 1)}\n")
+        
+        tokens = self.tokens
+        self.gui.show_trace_token(tokens[step.token] if tokens is not None and step.token < len(tokens)
+                                  else None)
+    
+    def seek_entry(self, event=None):
+        """Va al paso escrito en el campo 'Paso'."""
+        try:
+            n = int(self.step_var.get())
+        except ValueError:
+            messagebox.showwarning("Advertencia", "Ingrese un número de paso.", parent=self.window)
+            return
+        self.seek(n)
+    
+    def seek_error(self):
+        """Va al paso en que falló el análisis."""
+        error_step = self.recorder.error_step()
+        if error_step is not None:
+            self.seek(error_step)
+    
+    def on_scale(self, value):
+        n = int(float(value))
+        if n != self.current:
+            self.seek(n)
+    
+    def close(self):
+        """Cierra la ventana y quita la marca del editor."""
+        self.gui.show_trace_token(None)
+        self.window.destroy()
+
+
 class GUIParser:
-    """Parser adaptado para GUI."""
+    """Parser adaptado para GUI.
+
+    Cada paso se graba en 'recorder' (step_trace.StepTrace) para la ventana
+    de reproducción; con text_trace=False no se escribe la traza de texto
+    (sólo los errores), que es lo que más cuesta en entradas grandes.
+    """
     
-    def __init__(self, table, start_symbol, gui):
+    def __init__(self, table, start_symbol, gui, cancel_event=None, text_trace=True):
         self.table = table
         self.start_symbol = start_symbol
+        self.compiled = CompiledTable(table, start_symbol)
         self.gui = gui
+        self.cancel_event = cancel_event
+        self.text_trace = text_trace
+        self.recorder = StepTrace()
         self.token_stream = None
         self.current_token = None
+        self.tokens_consumed = 0    # Progreso (lo lee la interfaz desde otro hilo)
     
     def _next_token(self):
         """Consume el token actual y obtiene el siguiente."""
@@ -296,51 +717,71 @@ class GUIParser:
             self.current_token = Token('$', '$', -1, -1)
     
     def parse_internal(self):
-        """Análisis interno para GUI."""
-        stack = ['$', self.start_symbol]
+        """Análisis interno para GUI (devuelve None si se canceló)."""
+        ct = self.compiled
+        cells = ct.cells
+        rhs_reversed = ct.rhs_reversed
+        symbols = ct.symbols
+        width = ct.width
+        first_nt = ct.first_nt
+        end = ct.end
+
+        stack = [end, ct.start]
+        kind = ct.kind_of(self.current_token.type)
+        cancel_event = self.cancel_event
+        text_trace = self.text_trace
+        record = self.recorder.record
+        self.recorder.begin(ct)
         
         while stack:
+            if cancel_event is not None and cancel_event.is_set():
+                return None
             top_of_stack = stack[-1]
             token_type = self.current_token.type
             token_value = self.current_token.value
             
-            # Mostrar estado
-            stack_str = str(stack)
-            self.gui.log_result(
-                f"Pila: {stack_str:<45} Token: ({token_type}, '{token_value}')\n", 
-                ""
-            )
-            
-            if top_of_stack == '$' and token_type == '$':
-                return True
+            # Mostrar estado (hasta que el panel se llene: después no se formatea)
+            if text_trace and self.gui.saturated:
+                text_trace = False
+            if text_trace:
+                stack_str = str([symbols[s] for s in stack])
+                self.gui.log_result(
+                    f"Pila: {stack_str:<45} Token: ({token_type}, '{token_value}')\n", 
+                    ""
+                )
             
-            if top_of_stack in TERMINALS or top_of_stack == '$':
-                if top_of_stack == token_type:
+            if top_of_stack < first_nt:
+                if top_of_stack == kind:
+                    if kind == end:
+                        record(ACTION_ACCEPT, -1, self.tokens_consumed, -1)
+                        return True
+                    record(ACTION_MATCH, -1, self.tokens_consumed, -1)
                     stack.pop()
                     self._next_token()
+                    self.tokens_consumed += 1
+                    kind = ct.kind_of(self.current_token.type)
                 else:
-                    self._error(f"Se esperaba '{top_of_stack}' pero se encontró '{token_type}'")
+                    record(ACTION_ERROR, -1, self.tokens_consumed, 0)
+                    self._error(f"Se esperaba '{symbols[top_of_stack]}' pero se encontró '{token_type}'")
                     return False
             
-            elif top_of_stack in NON_TERMINALS:
-                production = self.table[top_of_stack].get(token_type)
+            else:
+                production = cells[(top_of_stack - first_nt) * width + kind]
                 
-                if production is None:
-                    expected = ", ".join([t for t, v in self.table[top_of_stack].items() if v is not None])
+                if production < 0:
+                    record(ACTION_ERROR, -1, self.tokens_consumed, 0)
+                    expected = ", ".join(ct.expected(top_of_stack))
                     self._error(f"Token inesperado '{token_type}'. Se esperaba: {expected}")
                     return False
                 
+                record(ACTION_EXPAND, production, self.tokens_consumed, len(rhs_reversed[production]) - 1)
                 stack.pop()
+                stack.extend(rhs_reversed[production])
                 
-                if production != ['lambda']:
-                    for symbol in reversed(production):
-                        stack.append(symbol)
-                
-                prod_str = ' '.join(production) if production != ['lambda'] else 'λ'
-                self.gui.log_result(f"   → Aplicando: {top_of_stack} → {prod_str}\n", "info")
-            else:
-                self._error(f"Símbolo desconocido en la pila: {top_of_stack}")
-                return False
+                if text_trace:
+                    body = ct.productions[production][1]
+                    prod_str = ' '.join(body) if body != ['lambda'] else 'λ'
+                    self.gui.log_result(f"   → Aplicando: {symbols[top_of_stack]} → {prod_str}\n", "info")
         
         return False
     
@@ -0,0 +1,208 @@
+"""Análisis incremental para el editor (modo en vivo de la GUI).
+
+IncrementalAnalyzer recibe el texto completo del editor después de cada
+edición y vuelve a analizar sólo lo necesario:
+
+- Tokens por línea: ningún token cruza un salto de línea, así que los tokens
+  se guardan agrupados por línea (sin el número de línea, que se agrega al
+  reportar). Al editar se busca el prefijo y el sufijo comunes con el texto
+  anterior y sólo se vuelven a tokenizar las líneas entre ambos.
+- Puntos de control del parser: justo después de consumir el último token de
+  una línea, el estado del parser (la pila) depende sólo de los tokens ya
+  consumidos. Se guarda una copia de la pila en cada frontera de línea, y
+  tras una edición el análisis se retoma desde la última frontera anterior a
+  la primera línea modificada.
+- Convergencia: si al pasar por una frontera del sufijo no modificado la pila
+  es igual a la que tenía el análisis anterior en esa misma frontera, el
+  resto del análisis sería idéntico: se reutiliza el resultado anterior
+  (desplazando su línea) sin recorrer el resto del texto.
+
+Los resultados (aceptación, mensaje, token, línea y columna) son los mismos
+que da Parser sobre el texto completo; 'steps' cuenta sólo los pasos
+ejecutados en la última actualización.
+"""
+
+from main import START_SYMBOL, TRACE_NONE, Lexer, ParseResult, Parser, Token
+
+# Tamaño de bloque al comparar el texto nuevo con el anterior
+_COMPARE_BLOCK = 4096
+
+
+def _common_prefix(a, b):
+    """Largo del prefijo común de dos cadenas (comparando por bloques)."""
+    limit = min(len(a), len(b))
+    i = 0
+    while i < limit and a[i:i + _COMPARE_BLOCK] == b[i:i + _COMPARE_BLOCK]:
+        i += _COMPARE_BLOCK
+    i = min(i, limit)
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def _common_suffix(a, b, limit):
+    """Largo del sufijo común de dos cadenas, sin superar 'limit' caracteres."""
+    la, lb = len(a), len(b)
+    j = 0
+    while j < limit:
+        size = min(_COMPARE_BLOCK, limit - j)
+        if a[la - j - size:la - j] != b[lb - j - size:lb - j]:
+            break
+        j += size
+    while j < limit and a[la - j - 1] == b[lb - j - 1]:
+        j += 1
+    return j
+
+
+class IncrementalAnalyzer:
+    """Analizador que reutiliza tokens y estado del parser entre ediciones."""
+
+    def __init__(self, table, start_symbol=START_SYMBOL):
+        self.parser = Parser(table, start_symbol, trace=TRACE_NONE)
+        ct = self.parser.compiled
+        self.text = ''
+        # line_tokens[i]: tupla de (tipo, valor, columna) de la línea i (desde 0)
+        self.line_tokens = [()]
+        # checkpoints[i]: pila (tupla) antes del primer token de la línea i, o None
+        self.checkpoints = [(ct.end, ct.start)]
+        self.result = None
+        # Datos de la última actualización (para mostrar o medir)
+        self.last_update = {}
+
+    def update(self, text):
+        """Analiza el nuevo contenido del editor y devuelve un ParseResult."""
+        old = self.text
+        if text == old and self.result is not None:
+            self.last_update = {'first_line': None, 'relexed_lines': 0, 'restart_line': None,
+                                'converged_line': None, 'steps': 0}
+            return self.result
+
+        # Región modificada: [i, len - j) en caracteres; líneas [p, *_last]
+        i = _common_prefix(old, text)
+        j = _common_suffix(old, text, min(len(old), len(text)) - i)
+        p = text.count('\n', 0, i)
+        old_last = p + old.count('\n', i, len(old) - j)
+        new_last = p + text.count('\n', i, len(text) - j)
+        delta = new_last - old_last
+
+        # Volver a tokenizar sólo las líneas p..new_last del texto nuevo
+        start = text.rfind('\n', 0, i) + 1
+        stop = text.find('\n', len(text) - j)
+        if stop < 0:
+            stop = len(text)
+        buckets = [[] for _ in range(new_last - p + 1)]
+        for token in Lexer(text[start:stop], line=p + 1).get_tokens():
+            if token.type != '$':
+                buckets[token.line - 1 - p].append((token.type, token.value, token.column))
+        self.line_tokens[p:old_last + 1] = [tuple(b) for b in buckets]
+        self.text = text
+
+        # Puntos de control: los de las líneas <= p siguen valiendo; los del
+        # sufijo no modificado se conservan (desplazados) como candidatos de
+        # convergencia; los intermedios se descartan.
+        tail = max(new_last + 1, p + 1)
+        cp = self.checkpoints
+        self.checkpoints = cp[:p + 1] + [None] * (tail - p - 1) + cp[tail - delta:]
+
+        previous = self.result
+        restart = p
+        while self.checkpoints[restart] is None:
+            restart -= 1
+
+        if previous is not None and not previous and previous.line - 1 < p:
+            # El error anterior está antes de la edición: el resultado no cambia
+            self.last_update = {'first_line': p, 'relexed_lines': len(buckets), 'restart_line': None,
+                                'converged_line': None, 'steps': 0}
+            return previous
+
+        self.result = self._parse_from(restart, tail, previous, delta)
+        self.last_update['first_line'] = p
+        self.last_update['relexed_lines'] = len(buckets)
+        return self.result
+
+    def _tokens_from(self, line):
+        """Genera (índice_de_línea, (tipo, valor, columna)) desde la línea dada, y el '$' final."""
+        line_tokens = self.line_tokens
+        for index in range(line, len(line_tokens)):
+            for token in line_tokens[index]:
+                yield index, token
+        yield len(line_tokens) - 1, ('$', '$', 0)
+
+    def _parse_from(self, restart, converge_from, previous, delta):
+        """Retoma el análisis en la frontera 'restart' y devuelve el ParseResult."""
+        ct = self.parser.compiled
+        cells = ct.cells
+        rhs_reversed = ct.rhs_reversed
+        width = ct.width
+        first_nt = ct.first_nt
+        end = ct.end
+        terminal_ids = ct.terminal_ids
+        unknown = ct.unknown
+        checkpoints = self.checkpoints
+
+        stack = list(checkpoints[restart])
+        pop = stack.pop
+        extend = stack.extend
+        tokens = self._tokens_from(restart)
+        line, token = next(tokens)
+        kind = terminal_ids.get(token[0], unknown)
+        steps = 0
+        self.last_update = {'restart_line': restart, 'converged_line': None}
+        if line != restart and self._boundary(restart, line, stack, converge_from, previous):
+            self.last_update['steps'] = steps
+            return self._shifted(previous, delta, steps)
+
+        while True:
+            top_of_stack = stack[-1]
+            steps += 1
+            if top_of_stack < first_nt:
+                if top_of_stack != kind:
+                    break
+                if kind == end:
+                    self.last_update['steps'] = steps
+                    return ParseResult(True, None, None, None, None, steps)
+                pop()
+                previous_line = line
+                line, token = next(tokens)
+                kind = terminal_ids.get(token[0], unknown)
+                if line != previous_line and self._boundary(previous_line, line, stack, converge_from, previous):
+                    self.last_update['steps'] = steps
+                    return self._shifted(previous, delta, steps)
+            else:
+                production = cells[(top_of_stack - first_nt) * width + kind]
+                if production < 0:
+                    break
+                pop()
+                extend(rhs_reversed[production])
+
+        # Error: las fronteras posteriores no se alcanzaron en este análisis
+        checkpoints[line + 1:] = [None] * (len(checkpoints) - line - 1)
+        self.last_update['steps'] = steps
+        token = Token(token[0], token[1], line + 1, token[2])
+        message = self.parser._error_message(top_of_stack, token)
+        return ParseResult(False, message, token, token.line, token.column, steps)
+
+    def _boundary(self, from_line, line, stack, converge_from, previous):
+        """Guarda la pila en las fronteras entre 'from_line' y 'line' (las líneas
+        intermedias no tienen tokens, así que comparten el mismo estado).
+
+        Devuelve True si coincide con la del análisis anterior en el sufijo no
+        modificado (el resto del análisis sería idéntico).
+        """
+        snapshot = tuple(stack)
+        if line >= converge_from and previous is not None and self.checkpoints[line] == snapshot:
+            self.last_update['converged_line'] = line
+            return True
+        if line == from_line + 1:
+            self.checkpoints[line] = snapshot
+        else:
+            self.checkpoints[from_line + 1:line + 1] = [snapshot] * (line - from_line)
+        return False
+
+    @staticmethod
+    def _shifted(result, delta, steps):
+        """Resultado anterior con la línea del error desplazada en 'delta' líneas."""
+        if result.accepted:
+            return result._replace(steps=steps)
+        token = result.token._replace(line=result.token.line + delta)
+        return result._replace(token=token, line=token.line, steps=steps)
@@ -0,0 +1,219 @@
+"""Instrumentación opcional del Lexer y el Parser.
+
+Se activa pasando un ParseStats al analizar:
+
+    stats = ParseStats()
+    parser.parse('archivo.java', stats=stats)
+    print(stats.summary())
+    stats.write_json('stats.json')
+    stats.write_chrome_trace('traza.json')   # abrir en chrome://tracing o Perfetto
+
+Con stats, el Parser usa un bucle instrumentado aparte y mide por separado
+las fases de lectura del archivo, tokenización y análisis (el archivo se lee
+completo y los tokens se materializan en una lista antes de analizar). Sin
+stats se usa el bucle normal, que no tiene ningún costo adicional.
+
+Se registra:
+    - tiempo de cada fase (read, lex, parse);
+    - tokens (en total y por tipo) y caracteres leídos;
+    - pasos, coincidencias de terminales (pop + avance), expansiones (consulta
+      a la tabla + pop + push), símbolos empujados y profundidad máxima de la
+      pila;
+    - aciertos por celda de la tabla (no-terminal, terminal) y por producción:
+      el mapa de calor de las reglas más usadas;
+    - muestras de la profundidad de la pila cada 'sample_every' pasos (se
+      exportan como contador en la traza de Chrome).
+
+Un mismo ParseStats puede acumular varias ejecuciones.
+
+Uso desde la línea de comandos:
+    python instrumentation.py ARCHIVO [ARCHIVO ...] [--json stats.json] [--chrome traza.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+COUNTERS = ('files', 'chars', 'tokens', 'steps', 'matches', 'expansions', 'pushed', 'max_stack_depth')
+
+
+class ParseStats:
+    """Estadísticas de una o varias ejecuciones del analizador."""
+
+    def __init__(self, sample_every=1024):
+        self.sample_every = sample_every
+        self.origin = time.perf_counter()
+        self.phases = {}            # fase -> segundos acumulados
+        self.spans = []             # (fase, inicio, fin) en segundos de perf_counter
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.token_types = {}       # tipo de token -> cantidad
+        self.cell_hits = {}         # (no-terminal, terminal) -> cantidad
+        self.production_hits = {}   # 'A -> x y' -> cantidad
+        self.terminals = []         # Columnas de la tabla (orden del mapa de calor)
+        self.stack_samples = []     # (instante, profundidad de la pila)
+
+    @contextmanager
+    def phase(self, name):
+        """Mide el tiempo de un bloque como la fase 'name'."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.phases[name] = self.phases.get(name, 0.0) + (end - start)
+            self.spans.append((name, start, end))
+
+    # --- Registro (lo usa el Parser) ---
+
+    def add_tokens(self, tokens):
+        """Cuenta los tokens (sin el '$' final) y sus tipos."""
+        types = self.token_types
+        count = 0
+        for token in tokens:
+            if token.type != '$':
+                types[token.type] = types.get(token.type, 0) + 1
+                count += 1
+        self.counters['tokens'] += count
+
+    def add_run(self, compiled, hits, steps, matches, pushed, max_depth):
+        """Acumula los contadores de una ejecución del bucle instrumentado.
+
+        hits[i] es la cantidad de consultas a la celda i de compiled.cells.
+        """
+        counters = self.counters
+        counters['steps'] += steps
+        counters['matches'] += matches
+        counters['pushed'] += pushed
+        counters['max_stack_depth'] = max(counters['max_stack_depth'], max_depth)
+
+        # La columna extra de la tabla es la de tipos de token desconocidos
+        columns = compiled.terminals + ['?']
+        self.terminals = columns
+        width = compiled.width
+        for index, count in enumerate(hits):
+            if not count:
+                continue
+            row, column = divmod(index, width)
+            key = (compiled.non_terminals[row], columns[column])
+            self.cell_hits[key] = self.cell_hits.get(key, 0) + count
+            pid = compiled.cells[index]
+            if pid >= 0:
+                # Las consultas a celdas vacías son los errores, no expansiones
+                counters['expansions'] += count
+                name = compiled.production_str(pid)
+                self.production_hits[name] = self.production_hits.get(name, 0) + count
+
+    # --- Exportación ---
+
+    def to_dict(self):
+        """Estadísticas como un dict serializable a JSON."""
+        heatmap = {}
+        for (nt, terminal), count in self.cell_hits.items():
+            heatmap.setdefault(nt, {})[terminal] = count
+        return {
+            'phases_ms': {name: seconds * 1000 for name, seconds in self.phases.items()},
+            'counters': dict(self.counters),
+            'token_types': dict(sorted(self.token_types.items())),
+            'cell_hits': heatmap,
+            'production_hits': dict(sorted(self.production_hits.items(), key=lambda kv: -kv[1])),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    def chrome_trace(self):
+        """Eventos en el formato 'Trace Event' de Chrome (chrome://tracing, Perfetto)."""
+        pid, tid = os.getpid(), 1
+
+        def us(t):
+            return (t - self.origin) * 1e6
+
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                   'args': {'name': 'Analizador LL(1)'}}]
+        for name, start, end in self.spans:
+            events.append({'name': name, 'cat': 'fase', 'ph': 'X', 'pid': pid, 'tid': tid,
+                           'ts': us(start), 'dur': (end - start) * 1e6})
+        for t, depth in self.stack_samples:
+            events.append({'name': 'pila', 'ph': 'C', 'pid': pid, 'tid': tid,
+                           'ts': us(t), 'args': {'profundidad': depth}})
+        if self.spans:
+            end = max(end for _, _, end in self.spans)
+            events.append({'name': 'contadores', 'ph': 'C', 'pid': pid, 'tid': tid,
+                           'ts': us(end), 'args': dict(self.counters)})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+
+    def heatmap(self, terminals=None):
+        """Tabla de texto con los aciertos por celda (filas: no-terminales)."""
+        if terminals is None:
+            used = {t for _, t in self.cell_hits}
+            terminals = [t for t in self.terminals if t in used]
+        non_terminals = list(dict.fromkeys(nt for nt, _ in self.cell_hits))
+        lines = [f"{'':<4} |" + "".join(f"{t:>10}" for t in terminals)]
+        lines.append("-" * len(lines[0]))
+        for nt in non_terminals:
+            row = f"{nt:<4} |"
+            for t in terminals:
+                count = self.cell_hits.get((nt, t), 0)
+                row += f"{count if count else '':>10}"
+            lines.append(row)
+        return "\n".join(lines)
+
+    def summary(self, top=10):
+        """Resumen legible: fases, contadores y producciones más usadas."""
+        lines = ["--- Fases ---"]
+        for name, seconds in self.phases.items():
+            lines.append(f"  {name:<8} {seconds * 1000:>12.3f} ms")
+        lines.append("--- Contadores ---")
+        for name, value in self.counters.items():
+            lines.append(f"  {name:<16} {value:>12,}")
+        parse_time = self.phases.get('parse')
+        if parse_time:
+            lines.append(f"  {'pasos/s':<16} {self.counters['steps'] / parse_time:>12,.0f}")
+        if self.production_hits:
+            lines.append(f"--- Producciones más usadas (top {top}) ---")
+            ranked = sorted(self.production_hits.items(), key=lambda kv: -kv[1])[:top]
+            for name, count in ranked:
+                lines.append(f"  {count:>12,}  {name}")
+            lines.append("--- Mapa de calor de la tabla (aciertos por celda) ---")
+            lines.append(self.heatmap())
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Analiza archivos con instrumentación y muestra las estadísticas.")
+    arg_parser.add_argument('files', nargs='+', metavar='ARCHIVO')
+    arg_parser.add_argument('--json', metavar='SALIDA', help="guardar las estadísticas en JSON")
+    arg_parser.add_argument('--chrome', metavar='SALIDA', help="guardar la traza en formato Chrome trace-event")
+    args = arg_parser.parse_args(argv)
+
+    from main import START_SYMBOL, TRACE_ERRORS, Parser
+    from table_cache import load_parser_components
+    _, _, _, parsing_table = load_parser_components()
+    parser = Parser(parsing_table, START_SYMBOL, trace=TRACE_ERRORS)
+
+    stats = ParseStats()
+    rejected = 0
+    for path in args.files:
+        rejected += not parser.parse(path, stats=stats)
+
+    print(stats.summary())
+    if args.json:
+        stats.write_json(args.json)
+    if args.chrome:
+        stats.write_chrome_trace(args.chrome)
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
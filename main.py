@@ -1,5 +1,9 @@
+import codecs
+import os
 import re
 import sys
+import time
+from array import array
 from collections import namedtuple
 
 # --- Definición de la Gramática (Proyecto_01_INFO1148.pdf) ---
@@ -39,11 +43,12 @@ TERMINALS = sorted(list(TERMINALS)) + ['$'] # '$' representa el fin de la entrad
 # --- Tarea: "Identificar el conjunto first" ---
 # VERSIÓN CORREGIDA
 
-def compute_first_sets(grammar, non_terminals, terminals):
-    """Calcula los conjuntos FIRST para todos los no-terminales."""
-    first_sets = {nt: set() for nt in non_terminals}
-    
-    # Un helper para calcular el FIRST de una secuencia de símbolos (e.g., T E')
+def make_first_of_sequence(first_sets, non_terminals, terminals):
+    """Crea el helper que calcula el FIRST de una secuencia de símbolos (e.g., T E').
+
+    El helper consulta 'first_sets' en cada llamada, así que sirve tanto mientras
+    los conjuntos se calculan como con conjuntos ya calculados (o cargados de caché).
+    """
     def get_first_of_sequence(sequence):
         # 1. CORRECCIÓN: Manejar ['lambda'] y secuencias vacías explícitamente
         if not sequence:
@@ -76,6 +81,16 @@ def compute_first_sets(grammar, non_terminals, terminals):
             
         return first_seq
 
+    return get_first_of_sequence
+
+
+def compute_first_sets(grammar, non_terminals, terminals):
+    """Calcula los conjuntos FIRST para todos los no-terminales."""
+    first_sets = {nt: set() for nt in non_terminals}
+    
+    # Un helper para calcular el FIRST de una secuencia de símbolos (e.g., T E')
+    get_first_of_sequence = make_first_of_sequence(first_sets, non_terminals, terminals)
+
     changed = True
     while changed:
         changed = False
@@ -153,10 +168,105 @@ def create_parsing_table(grammar, first_sets, follow_sets, get_first_seq_func, n
                     if table[nt_A][terminal_b] is not None:
                         raise ValueError(f"Conflicto LL(1) en T[{nt_A}, {terminal_b}] (conflicto lambda/FOLLOW)")
                     table[nt_A][terminal_b] = production
-    
+
     return table
 
 
+def build_parser_components():
+    """Calcula FIRST, FOLLOW y la tabla LL(1) de GRAMMAR en un solo paso.
+
+    Devuelve (first_sets, get_first_seq_func, follow_sets, parsing_table).
+    """
+    first_sets, get_first_seq_func = compute_first_sets(GRAMMAR, NON_TERMINALS, TERMINALS)
+    follow_sets = compute_follow_sets(GRAMMAR, NON_TERMINALS, START_SYMBOL, first_sets, get_first_seq_func)
+    parsing_table = create_parsing_table(GRAMMAR, first_sets, follow_sets, get_first_seq_func, NON_TERMINALS, TERMINALS)
+    return first_sets, get_first_seq_func, follow_sets, parsing_table
+
+
+# --- Tabla compilada (forma entera de la tabla LL(1)) ---
+# Cada símbolo de la gramática se interna como un entero pequeño:
+#   0 .. n-1        -> terminales (en el orden de las columnas de la tabla, '$' al final)
+#   n               -> columna "desconocido" (tipos de token que no están en la tabla)
+#   n+1 ..          -> no-terminales (en el orden de las filas de la tabla)
+# La tabla se guarda como un único arreglo plano indexado por
+# (fila_del_no_terminal * ancho + terminal) y cada celda contiene el número de
+# producción (o -1 si está vacía). Las producciones se guardan ya invertidas
+# como tuplas de enteros, listas para empujarse a la pila.
+
+class CompiledTable:
+    """Tabla LL(1) compilada a enteros para el bucle del parser."""
+
+    # Celdas densas (compressed_table.CompressedTable lo pone en True)
+    compressed = False
+
+    def __init__(self, table, start_symbol):
+        self.non_terminals = list(table.keys())
+        self.terminals = list(next(iter(table.values())).keys())
+
+        n_terms = len(self.terminals)
+        self.unknown = n_terms                  # Columna para tipos de token desconocidos
+        self.width = n_terms + 1                # Ancho de cada fila de la tabla plana
+        self.first_nt = n_terms + 1             # Primer id de no-terminal
+
+        # symbols[id] -> nombre del símbolo (para mensajes y trazas)
+        self.symbols = self.terminals + ['?'] + self.non_terminals
+        self.terminal_ids = {t: i for i, t in enumerate(self.terminals)}
+        self.ids = {name: i for i, name in enumerate(self.symbols) if name != '?'}
+        self.end = self.terminal_ids['$']
+        self.start = self.ids[start_symbol]
+
+        # Producciones numeradas: (lado izquierdo, lado derecho original)
+        self.productions = []
+        self.rhs_reversed = []
+        self._build_cells(self._rows(table))
+
+    def _rows(self, table):
+        """Genera, fila por fila, las celdas no vacías (id de terminal, producción).
+
+        Numera las producciones a medida que aparecen.
+        """
+        production_ids = {}
+        for nt in self.non_terminals:
+            entries = []
+            for t, production in table[nt].items():
+                if production is None:
+                    continue
+                key = (nt, tuple(production))
+                pid = production_ids.get(key)
+                if pid is None:
+                    pid = production_ids[key] = len(self.productions)
+                    self.productions.append((nt, production))
+                    body = [] if production == ['lambda'] else production
+                    self.rhs_reversed.append(tuple(self.ids[s] for s in reversed(body)))
+                entries.append((self.terminal_ids[t], pid))
+            yield entries
+
+    def _build_cells(self, rows):
+        """Arma la tabla plana 'cells' (fila * ancho + terminal, -1 si está vacía)."""
+        self.cells = array('i', [-1]) * (len(self.non_terminals) * self.width)
+        for row, entries in enumerate(rows):
+            for kind, pid in entries:
+                self.cells[row * self.width + kind] = pid
+
+    def kind_of(self, token_type):
+        """Devuelve el id entero del tipo de token (o la columna 'desconocido')."""
+        return self.terminal_ids.get(token_type, self.unknown)
+
+    def lookup(self, nt_id, terminal_id):
+        """Producción para T[nt, terminal] (-1 si la celda está vacía)."""
+        return self.cells[(nt_id - self.first_nt) * self.width + terminal_id]
+
+    def expected(self, nt_id):
+        """Terminales con celda no vacía en la fila del no-terminal."""
+        base = (nt_id - self.first_nt) * self.width
+        return [t for i, t in enumerate(self.terminals) if self.cells[base + i] >= 0]
+
+    def production_str(self, pid):
+        """Representación 'A -> x y z' de una producción."""
+        nt, production = self.productions[pid]
+        return f"{nt} -> {' '.join(production)}"
+
+
 # --- Tarea: "Lectura de archivo" (Implementación del Lexer) ---
 # Usamos expresiones regulares como se vio en c2_Expresiones Regulares.pdf
 
@@ -169,67 +279,277 @@ Token = namedtuple('Token', ['type', 'value', 'line', 'column'])
 # Definición de un Token
 Token = namedtuple('Token', ['type', 'value', 'line', 'column'])
 
+# Patrones de Expresiones Regulares para los tokens
+# AHORA USAMOS NOMBRES DE GRUPO VÁLIDOS
+TOKEN_SPECS = [
+    ('num',     r'\d+(\.\d*)?'),              # Números (enteros o flotantes)
+    ('id',      r'[a-zA-Z_][a-zA-Z0-9_]*'),     # Identificadores
+    # Agrupamos todos los operadores y símbolos en un solo grupo 'OP'
+    ('OP',      r'\+|-|\*|/|%|\(|\)'),         # Operadores y Paréntesis
+    ('NEWLINE', r'\n'),                      # Salto de línea
+    ('SKIP',    r'[ \t]+'),                  # Espacios y tabs (ignorar)
+    ('MISMATCH',r'.'),                       # Cualquier otro caracter (error)
+]
+TOKEN_REGEX = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_SPECS)
+
+# Tamaño de bloque (en caracteres o bytes) al leer archivos grandes por partes
+DEFAULT_CHUNK_SIZE = 1 << 16
+
 class Lexer:
-    """Analizador Léxico (Tokenizer)."""
+    """Analizador Léxico (Tokenizer).
+
+    file_content puede ser el texto completo (str) o una fuente que se lee por
+    bloques de chunk_size: una ruta (os.PathLike), un archivo abierto en modo
+    texto o binario, un mmap, o bytes/bytearray/memoryview. Con una fuente por
+    bloques la memoria usada es proporcional a chunk_size y no al tamaño del
+    archivo; los datos binarios se decodifican con 'encoding'.
+    """
     
-    def __init__(self, file_content):
+    def __init__(self, file_content, line=1, column=0, chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
         self.content = file_content
+        self.chunk_size = chunk_size
+        self.encoding = encoding
         
-        # Patrones de Expresiones Regulares para los tokens
-        # AHORA USAMOS NOMBRES DE GRUPO VÁLIDOS
-        token_specs = [
-            ('num',     r'\d+(\.\d*)?'),              # Números (enteros o flotantes)
-            ('id',      r'[a-zA-Z_][a-zA-Z0-9_]*'),     # Identificadores
-            # Agrupamos todos los operadores y símbolos en un solo grupo 'OP'
-            ('OP',      r'\+|-|\*|/|%|\(|\)'),         # Operadores y Paréntesis
-            ('NEWLINE', r'\n'),                      # Salto de línea
-            ('SKIP',    r'[ \t]+'),                  # Espacios y tabs (ignorar)
-            ('MISMATCH',r'.'),                       # Cualquier otro caracter (error)
-        ]
-        
-        self.tok_regex = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specs))
-        self.line_num = 1
-        self.line_start = 0
+        self.tok_regex = re.compile(TOKEN_REGEX)
+        # Posición inicial (para fragmentos que no empiezan en la línea 1, columna 0)
+        self.line_num = line
+        self.line_start = -column
+
+    @classmethod
+    def from_path(cls, path, **kwargs):
+        """Crea un Lexer que lee el archivo 'path' por bloques."""
+        import pathlib
+        return cls(pathlib.Path(path), **kwargs)
+
+    def _chunks(self):
+        """Genera pares (texto, es_el_último) con el contenido a analizar."""
+        source = self.content
+        if isinstance(source, str):
+            yield source, True
+            return
+        if isinstance(source, os.PathLike):
+            with open(source, 'r') as f:
+                yield from self._read_chunks(f)
+            return
+        yield from self._read_chunks(source)
+
+    def _read_chunks(self, source):
+        """Lee una fuente por bloques, decodificando los datos binarios."""
+        size = self.chunk_size
+        decoder = None
+
+        if hasattr(source, 'read'):
+            # Archivo (texto o binario) o mmap: se lee desde la posición actual
+            blocks = iter(lambda: source.read(size), source.read(0))
+        else:
+            # bytes, bytearray o memoryview: se recorre por rebanadas
+            view = memoryview(source)
+            blocks = (view[i:i + size] for i in range(0, len(view), size))
+
+        for block in blocks:
+            if not isinstance(block, str):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(self.encoding)()
+                block = decoder.decode(block)
+            yield block, False
+        yield (decoder.decode(b'', final=True) if decoder else ''), True
 
     def get_tokens(self):
         """Generador que produce tokens uno por uno."""
-        for mo in self.tok_regex.finditer(self.content):
-            kind = mo.lastgroup
-            value = mo.group()
-            column = mo.start() - self.line_start
-            
-            if kind == 'NEWLINE':
-                self.line_start = mo.end()
-                self.line_num += 1
-            elif kind == 'SKIP':
-                continue
-            elif kind == 'MISMATCH':
-                # Ignoramos caracteres no reconocidos (como '//' o '=')
-                continue
-            
-            # --- LÓGICA DE GENERACIÓN DE TOKENS CORREGIDA ---
-            elif kind == 'OP':
-                # Si es un operador, el TIPO de token es su propio VALOR
-                # Ej: Token(type='+', value='+', ...)
-                yield Token(value, value, self.line_num, column)
-            else:
-                # Para 'num' e 'id', el 'kind' es el tipo
-                # Ej: Token(type='id', value='variable', ...)
-                yield Token(kind, value, self.line_num, column)
+        tok_regex = self.tok_regex
+        base = 0        # Posición global del inicio de 'buffer'
+        buffer = ''
+
+        for chunk, final in self._chunks():
+            buffer = buffer + chunk if buffer else chunk
+            consumed = len(buffer)
+
+            for mo in tok_regex.finditer(buffer):
+                # Un token que toca el final del bloque puede continuar en el
+                # siguiente: se guarda desde su inicio y se vuelve a analizar.
+                if not final and mo.end() == consumed:
+                    consumed = mo.start()
+                    break
+
+                kind = mo.lastgroup
+                value = mo.group()
+                column = base + mo.start() - self.line_start
+                
+                if kind == 'NEWLINE':
+                    self.line_start = base + mo.end()
+                    self.line_num += 1
+                elif kind == 'SKIP':
+                    continue
+                elif kind == 'MISMATCH':
+                    # Ignoramos caracteres no reconocidos (como '//' o '=')
+                    continue
+                
+                # --- LÓGICA DE GENERACIÓN DE TOKENS CORREGIDA ---
+                elif kind == 'OP':
+                    # Si es un operador, el TIPO de token es su propio VALOR
+                    # Ej: Token(type='+', value='+', ...)
+                    yield Token(value, value, self.line_num, column)
+                else:
+                    # Para 'num' e 'id', el 'kind' es el tipo
+                    # Ej: Token(type='id', value='variable', ...)
+                    yield Token(kind, value, self.line_num, column)
+
+            buffer = buffer[consumed:]
+            base += consumed
                 
         # Fin de la entrada
         yield Token('$', '$', self.line_num, 0)
 
 
+# --- Modo de múltiples expresiones (un veredicto por registro) ---
+# Un corpus como casos_pruebas.txt contiene muchas expresiones, una por línea
+# (o separadas por ';'), con comentarios '//' o '#'. iter_records lo recorre
+# línea a línea sin cargarlo completo en memoria.
+
+Record = namedtuple('Record', ['text', 'line', 'column'])
+
+COMMENT_PREFIXES = ('//', '#')
+
+
+def iter_records(stream, separator='\n', comment_prefixes=COMMENT_PREFIXES):
+    """Divide un flujo de texto en registros (expresiones) y los genera uno a uno.
+
+    stream: archivo abierto (o cualquier iterable de líneas).
+    separator: '\n' para una expresión por línea, o un separador como ';'.
+    Los comentarios (desde un prefijo de comment_prefixes hasta el fin de la
+    línea) y los registros vacíos se descartan. Cada registro lleva la línea y
+    la columna donde empieza, para que los errores apunten al corpus original.
+    """
+    pieces = []
+    start = None
+
+    for line_num, line in enumerate(stream, 1):
+        line = line.rstrip('\r\n')
+        for prefix in comment_prefixes:
+            cut = line.find(prefix)
+            if cut >= 0:
+                line = line[:cut]
+
+        if separator == '\n':
+            if line.strip():
+                # El texto va sin la sangría: 'column' ya la cuenta
+                stripped = line.lstrip()
+                yield Record(stripped, line_num, len(line) - len(stripped))
+            continue
+
+        # Separador explícito: un registro puede ocupar varias líneas
+        column = 0
+        while True:
+            cut = line.find(separator, column)
+            piece = line[column:] if cut < 0 else line[column:cut]
+            if start is None and piece.strip():
+                start = (line_num, column + len(piece) - len(piece.lstrip()))
+                piece = piece.lstrip()
+            if start is not None:
+                pieces.append(piece)
+            if cut < 0:
+                break
+            if start is not None:
+                yield Record("".join(pieces), *start)
+            pieces = []
+            start = None
+            column = cut + len(separator)
+        if start is not None:
+            pieces.append('\n')
+
+    if start is not None and "".join(pieces).strip():
+        yield Record("".join(pieces), *start)
+
+
 # --- Tarea: "Implementar los métodos" (Implementación del Parser) ---
 # Implementamos un Analizador Sintáctico Descendente (ASD) dirigido por tabla
 
+# Niveles de traza del Parser
+TRACE_NONE = 0      # Silencioso: no se formatea ni se imprime nada
+TRACE_ERRORS = 1    # Sólo los mensajes de error
+TRACE_SUMMARY = 2   # Encabezado, errores y veredicto final (sin pasos)
+TRACE_FULL = 3      # Traza completa paso a paso (pila, token y regla aplicada)
+
+TRACE_LEVELS = {'none': TRACE_NONE, 'errors': TRACE_ERRORS,
+                'summary': TRACE_SUMMARY, 'full': TRACE_FULL}
+
+# Motores de análisis (ver Parser.parse_tokens)
+ENGINE_LL1 = 'll1'                  # Bucle dirigido por la tabla LL(1)
+ENGINE_PRECEDENCE = 'precedence'    # Precedencia de operadores (precedence.py)
+ENGINES = (ENGINE_LL1, ENGINE_PRECEDENCE)
+
+
+# Un error sintáctico encontrado en modo recuperación (ver Parser, max_errors)
+ParseError = namedtuple('ParseError', ['message', 'token', 'line', 'column', 'expected'])
+
+
+class ParseResult(namedtuple('ParseResult',
+                             ['accepted', 'error', 'token', 'line', 'column', 'steps', 'tree', 'errors'],
+                             defaults=(None, None))):
+    """Resultado estructurado de un análisis.
+
+    accepted: True si la cadena es aceptada.
+    error:    mensaje de error (None si fue aceptada).
+    token:    token donde se detectó el error (None si fue aceptada).
+    line, column: posición del error (None si fue aceptada).
+    steps:    número de pasos del bucle del analizador.
+    tree:     nodo raíz en el TreeArena, si se pidió construir el árbol.
+    errors:   en modo recuperación, la lista de todos los errores (ParseError);
+              error, token, line y column son los del primero.
+
+    Se evalúa como booleano según 'accepted', igual que el antiguo retorno True/False.
+    """
+    __slots__ = ()
+
+    def __bool__(self):
+        return self.accepted
+
+
 class Parser:
-    """Analizador Sintáctico (Parser) LL(1) Dirigido por Tabla."""
+    """Analizador Sintáctico (Parser) LL(1) Dirigido por Tabla.
+
+    Con max_errors > 1 el parser no se detiene en el primer error: se
+    recupera en modo pánico sincronizando con los conjuntos FOLLOW
+    (follow_sets, obligatorio en ese modo) y reporta hasta max_errors
+    errores en una sola pasada.
+
+    lexer_class es la clase que tokeniza los archivos en parse() (Lexer, o
+    una con la misma interfaz como dfa_lexer.DFALexer).
+
+    engine es el motor por defecto (ENGINE_LL1 o ENGINE_PRECEDENCE); se
+    puede elegir otro en cada llamada a parse o parse_tokens.
+
+    table es la tabla de create_parsing_table o una CompiledTable ya
+    construida (por ejemplo compressed_table.CompressedTable) para el mismo
+    símbolo inicial.
+    """
     
-    def __init__(self, table, start_symbol):
+    def __init__(self, table, start_symbol, trace=TRACE_FULL, output=print, follow_sets=None, max_errors=1,
+                 lexer_class=Lexer, engine=ENGINE_LL1):
         self.table = table
         self.start_symbol = start_symbol
+        if isinstance(table, CompiledTable):
+            if table.ids.get(start_symbol) != table.start:
+                raise ValueError(f"La tabla compilada no tiene como símbolo inicial a {start_symbol!r}")
+            self.compiled = table
+        else:
+            self.compiled = CompiledTable(table, start_symbol)
+        self.trace = trace
+        self.output = output
+        self.max_errors = max_errors
+        self.follow_ids = None
+        if max_errors > 1:
+            if follow_sets is None:
+                raise ValueError("La recuperación de errores (max_errors > 1) necesita follow_sets")
+            # FOLLOW de cada no-terminal como ids de terminal (en el orden de las filas)
+            ct = self.compiled
+            self.follow_ids = [frozenset(ct.terminal_ids[t] for t in follow_sets[nt])
+                               for nt in ct.non_terminals]
+        self.lexer_class = lexer_class
+        if engine not in ENGINES:
+            raise ValueError(f"Motor de análisis desconocido: {engine!r}")
+        self.engine = engine
+        self._precedence = None     # precedence.PrecedenceEngine (se crea al usarlo)
         self.lexer = None
         self.token_stream = None
         self.current_token = None
@@ -241,82 +561,675 @@ class Parser:
         except StopIteration:
             self.current_token = Token('$', '$', -1, -1) # Fin de stream
 
-    def parse(self, file_path):
-        """Lee y analiza el archivo de entrada."""
-        print(f"\n--- Analizando archivo: {file_path} ---")
+    def parse(self, file_path, arena=None, stats=None, engine=None, recorder=None):
+        """Lee y analiza el archivo de entrada (ver parse_tokens para 'arena', 'stats', 'engine' y 'recorder')."""
+        if self.trace >= TRACE_SUMMARY:
+            self.output(f"\n--- Analizando archivo: {file_path} ---")
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
+            f = open(file_path, 'r')
         except FileNotFoundError:
-            print(f"Error: El archivo '{file_path}' no fue encontrado.")
-            return
+            message = f"Error: El archivo '{file_path}' no fue encontrado."
+            if self.trace >= TRACE_ERRORS:
+                self.output(message)
+            return ParseResult(False, message, None, None, None, 0)
+
+        # El archivo se lee por bloques mientras se analiza (no se carga completo),
+        # salvo con instrumentación, que mide la lectura como una fase aparte
+        with f:
+            if stats is not None:
+                stats.counters['files'] += 1
+                with stats.phase('read'):
+                    content = f.read()
+                stats.counters['chars'] += len(content)
+                self.lexer = self.lexer_class(content)
+            else:
+                self.lexer = self.lexer_class(f)
+            return self.parse_tokens(self.lexer.get_tokens(), arena, stats, engine, recorder)
+
+    def parse_tokens(self, tokens, arena=None, stats=None, engine=None, recorder=None):
+        """Analiza una secuencia de tokens y devuelve un ParseResult.
 
-        self.lexer = Lexer(content)
-        self.token_stream = self.lexer.get_tokens()
+        Si se pasa un arena (parse_tree.TreeArena), el árbol de derivación se
+        construye en él mientras se aplican las reglas y su raíz queda en
+        ParseResult.tree. En ese modo no se imprime la traza paso a paso.
+
+        Si se pasa stats (instrumentation.ParseStats), los tokens se leen
+        completos (fase 'lex') y luego se analizan (fase 'parse') con un bucle
+        que registra contadores y aciertos por celda de la tabla; tampoco se
+        imprime la traza paso a paso. Sin stats no hay ningún costo adicional.
+
+        tokens puede ser un token_buffer.TokenBuffer: sin traza paso a paso,
+        arena, stats ni recuperación se recorre su columna de tipos sin crear
+        ningún Token (en los demás modos se usan sus Token).
+
+        engine (por defecto, el del Parser) elige el motor: ENGINE_LL1 o
+        ENGINE_PRECEDENCE (precedence.PrecedenceEngine), que da el mismo
+        resultado (veredicto, token, mensaje y pasos) con un solo paso por
+        token. Este último sólo valida: no admite arena, stats, traza paso a
+        paso ni recuperación de errores.
+
+        Si se pasa recorder (step_trace.StepTrace), cada paso se graba en él
+        en binario (acción, producción, índice de token y cambio de
+        profundidad) en lugar de imprimir la traza paso a paso; la pila de
+        cualquier paso se reconstruye después con recorder.stack_at(n). No se
+        combina con arena, stats, recuperación ni el motor 'precedence'.
+        """
+        if engine is None:
+            engine = self.engine
+        if engine != ENGINE_LL1:
+            if engine != ENGINE_PRECEDENCE:
+                raise ValueError(f"Motor de análisis desconocido: {engine!r}")
+            if (arena is not None or stats is not None or recorder is not None
+                    or self.trace >= TRACE_FULL or self.max_errors > 1):
+                raise ValueError("El motor 'precedence' no admite árbol, instrumentación, grabación, "
+                                 "traza paso a paso ni recuperación de errores")
+        if recorder is not None and (arena is not None or stats is not None or self.max_errors > 1):
+            raise ValueError("La grabación de pasos no se combina con árbol, instrumentación "
+                             "ni recuperación de errores")
+        if stats is not None:
+            with stats.phase('lex'):
+                tokens = list(tokens)
+            stats.add_tokens(tokens)
+        self.token_stream = iter(tokens)
         self._next_token()
+        root = None
+
+        if self.max_errors > 1:
+            # Modo recuperación: sin traza paso a paso ni árbol
+            if stats is not None:
+                with stats.phase('parse'):
+                    errors, steps = self._run_recovering()
+            else:
+                errors, steps = self._run_recovering()
+            return self._recovery_result(errors, steps)
+
+        if stats is not None:
+            with stats.phase('parse'):
+                if arena is not None:
+                    accepted, top_of_stack, steps, root = self._run_tree(arena)
+                else:
+                    accepted, top_of_stack, steps = self._run_instrumented(stats)
+        elif arena is not None:
+            accepted, top_of_stack, steps, root = self._run_tree(arena)
+        elif recorder is not None:
+            accepted, top_of_stack, steps = self._run_recorded(recorder)
+        elif engine == ENGINE_PRECEDENCE:
+            accepted, top_of_stack, steps = self._run_precedence(tokens)
+        elif self.trace >= TRACE_FULL:
+            accepted, top_of_stack, steps = self._run_traced()
+        elif hasattr(tokens, 'kind_names'):
+            accepted, top_of_stack, steps = self._run_buffer(tokens)
+        elif self.compiled.compressed:
+            accepted, top_of_stack, steps = self._run_compressed()
+        else:
+            accepted, top_of_stack, steps = self._run()
+
+        if accepted:
+            self._success(steps)
+            return ParseResult(True, None, None, None, None, steps, root)
+
+        token = self.current_token
+        message = self._error_message(top_of_stack, token)
+        if self.trace >= TRACE_ERRORS:
+            self._error(message)
+        return ParseResult(False, message, token, token.line, token.column, steps)
+
+    def parse_records(self, stream, separator='\n', comment_prefixes=COMMENT_PREFIXES):
+        """Analiza cada registro de un flujo y genera (Record, ParseResult) por registro.
+
+        La memoria usada no depende del tamaño del corpus: los registros se leen,
+        analizan y descartan de a uno.
+        """
+        for record in iter_records(stream, separator, comment_prefixes):
+            lexer = self.lexer_class(record.text, record.line, record.column)
+            yield record, self.parse_tokens(lexer.get_tokens())
+
+    def _run(self):
+        """Bucle silencioso del analizador (sin formateo por paso).
+
+        Devuelve (aceptada, tope_de_pila_al_terminar, pasos).
+        """
+        # La tabla compilada trabaja sólo con enteros: la pila guarda ids de
+        # símbolos y cada token se traduce una vez a su id de terminal.
+        ct = self.compiled
+        cells = ct.cells
+        rhs_reversed = ct.rhs_reversed
+        width = ct.width
+        first_nt = ct.first_nt
+        end = ct.end
+        terminal_ids = ct.terminal_ids
+        unknown = ct.unknown
+        token_stream = self.token_stream
+        eof = Token('$', '$', -1, -1)
+
+        stack = [end, ct.start]
+        pop = stack.pop
+        extend = stack.extend
+        token = self.current_token
+        kind = terminal_ids.get(token.type, unknown)
+        steps = 0
+
+        while True:
+            top_of_stack = stack[-1]
+            steps += 1
+            if top_of_stack < first_nt:
+                if top_of_stack != kind:
+                    break
+                if kind == end:
+                    return True, top_of_stack, steps
+                pop()
+                token = next(token_stream, eof)
+                kind = terminal_ids.get(token.type, unknown)
+            else:
+                production = cells[(top_of_stack - first_nt) * width + kind]
+                if production < 0:
+                    break
+                pop()
+                extend(rhs_reversed[production])
+
+        self.current_token = token
+        return False, top_of_stack, steps
+
+    def _run_recorded(self, recorder):
+        """Como _run, grabando cada paso en recorder (step_trace.StepTrace)."""
+        from step_trace import ACTION_ACCEPT, ACTION_ERROR, ACTION_EXPAND, ACTION_MATCH
+
+        ct = self.compiled
+        cells = ct.cells
+        rhs_reversed = ct.rhs_reversed
+        width = ct.width
+        first_nt = ct.first_nt
+        end = ct.end
+        terminal_ids = ct.terminal_ids
+        unknown = ct.unknown
+        token_stream = self.token_stream
+        eof = Token('$', '$', -1, -1)
+
+        recorder.begin(ct)
+        add_kind = recorder.kinds.append
+        add_production = recorder.productions.append
+        add_token = recorder.tokens.append
+        add_delta = recorder.deltas.append
+        # Largo de cada lado derecho menos el no-terminal que reemplaza
+        growth = [len(rhs) - 1 for rhs in rhs_reversed]
+        trim_at = recorder.trim_at()
+        pending = trim_at
+
+        stack = [end, ct.start]
+        pop = stack.pop
+        extend = stack.extend
+        token = self.current_token
+        kind = terminal_ids.get(token.type, unknown)
+        index = 0
+        steps = 0
+
+        while True:
+            top_of_stack = stack[-1]
+            steps += 1
+            pending -= 1
+            if not pending:
+                # Buffer circular lleno: se descartan los pasos más viejos
+                recorder.trim()
+                pending = trim_at - len(recorder.kinds)
+            if top_of_stack < first_nt:
+                if top_of_stack != kind:
+                    break
+                add_production(-1)
+                add_token(index)
+                add_delta(-1)
+                if kind == end:
+                    add_kind(ACTION_ACCEPT)
+                    return True, top_of_stack, steps
+                add_kind(ACTION_MATCH)
+                pop()
+                token = next(token_stream, eof)
+                kind = terminal_ids.get(token.type, unknown)
+                index += 1
+            else:
+                production = cells[(top_of_stack - first_nt) * width + kind]
+                if production < 0:
+                    break
+                add_kind(ACTION_EXPAND)
+                add_production(production)
+                add_token(index)
+                add_delta(growth[production])
+                pop()
+                extend(rhs_reversed[production])
+
+        add_kind(ACTION_ERROR)
+        add_production(-1)
+        add_token(index)
+        add_delta(0)
+        self.current_token = token
+        return False, top_of_stack, steps
+
+    def _run_compressed(self):
+        """Como _run, con la consulta de compressed_table.CompressedTable en línea."""
+        ct = self.compiled
+        base = ct.base
+        default = ct.default
+        next_ = ct.next
+        check = ct.check
+        rhs_reversed = ct.rhs_reversed
+        first_nt = ct.first_nt
+        end = ct.end
+        terminal_ids = ct.terminal_ids
+        unknown = ct.unknown
+        token_stream = self.token_stream
+        eof = Token('$', '$', -1, -1)
+
+        stack = [end, ct.start]
+        pop = stack.pop
+        extend = stack.extend
+        token = self.current_token
+        kind = terminal_ids.get(token.type, unknown)
+        steps = 0
+
+        while True:
+            top_of_stack = stack[-1]
+            steps += 1
+            if top_of_stack < first_nt:
+                if top_of_stack != kind:
+                    break
+                if kind == end:
+                    return True, top_of_stack, steps
+                pop()
+                token = next(token_stream, eof)
+                kind = terminal_ids.get(token.type, unknown)
+            else:
+                row = top_of_stack - first_nt
+                i = base[row] + kind
+                production = next_[i] if check[i] == row else default[row]
+                if production < 0:
+                    break
+                pop()
+                extend(rhs_reversed[production])
+
+        self.current_token = token
+        return False, top_of_stack, steps
+
+    def _run_buffer(self, buffer):
+        """Como _run, pero leyendo los tipos directamente de un TokenBuffer."""
+        ct = self.compiled
+        cells = ct.cells
+        rhs_reversed = ct.rhs_reversed
+        width = ct.width
+        first_nt = ct.first_nt
+        end = ct.end
+
+        # Los códigos del buffer son índices en kind_names; si no coinciden con
+        # los ids de terminal de la tabla se traducen todos de una vez (en C)
+        codes = [ct.terminal_ids.get(name, ct.unknown) for name in buffer.kind_names]
+        kinds = buffer.kinds
+        if codes != list(range(len(codes))):
+            kinds = kinds.tobytes().translate(bytes(codes + [0] * (256 - len(codes))))
+        n = len(kinds)
+
+        stack = [end, ct.start]
+        pop = stack.pop
+        extend = stack.extend
+        i = 0
+        kind = kinds[0] if n else end
+        steps = 0
+
+        while True:
+            top_of_stack = stack[-1]
+            steps += 1
+            if top_of_stack < first_nt:
+                if top_of_stack != kind:
+                    break
+                if kind == end:
+                    return True, top_of_stack, steps
+                pop()
+                i += 1
+                kind = kinds[i] if i < n else end
+            else:
+                production = cells[(top_of_stack - first_nt) * width + kind]
+                if production < 0:
+                    break
+                pop()
+                extend(rhs_reversed[production])
+
+        self.current_token = buffer[i] if i < n else Token('$', '$', -1, -1)
+        return False, top_of_stack, steps
+
+    def _precedence_engine(self):
+        """PrecedenceEngine de la tabla (se crea la primera vez; ValueError si la
+        gramática no es de precedencia de operadores)."""
+        if self._precedence is None:
+            from precedence import PrecedenceEngine
+            self._precedence = PrecedenceEngine(self.compiled)
+        return self._precedence
+
+    def _run_precedence(self, tokens):
+        """Valida con precedence.PrecedenceEngine; devuelve lo mismo que _run."""
+        engine = self._precedence_engine()
+        if not hasattr(tokens, 'kind_names'):
+            accepted, top_of_stack, steps, self.current_token = engine.run(self.current_token, self.token_stream)
+            return accepted, top_of_stack, steps
+
+        ct = self.compiled
+        codes = [ct.terminal_ids.get(name, ct.unknown) for name in tokens.kind_names]
+        kinds = tokens.kinds
+        if codes != list(range(len(codes))):
+            kinds = kinds.tobytes().translate(bytes(codes + [0] * (256 - len(codes))))
+        accepted, top_of_stack, steps, i = engine.run_kinds(kinds)
+        if not accepted:
+            self.current_token = tokens[i] if i < len(kinds) else Token('$', '$', -1, -1)
+        return accepted, top_of_stack, steps
+
+    def _run_instrumented(self, stats):
+        """Bucle silencioso del analizador con contadores (ver instrumentation.ParseStats).
+
+        Devuelve (aceptada, tope_de_pila_al_terminar, pasos), como _run.
+        """
+        ct = self.compiled
+        cells = ct.cells
+        rhs_reversed = ct.rhs_reversed
+        width = ct.width
+        first_nt = ct.first_nt
+        end = ct.end
+        terminal_ids = ct.terminal_ids
+        unknown = ct.unknown
+        token_stream = self.token_stream
+        eof = Token('$', '$', -1, -1)
+        clock = time.perf_counter
+        samples = stats.stack_samples
+        sample_every = stats.sample_every
+
+        stack = [end, ct.start]
+        pop = stack.pop
+        extend = stack.extend
+        token = self.current_token
+        kind = terminal_ids.get(token.type, unknown)
+        steps = matches = pushed = 0
+        max_depth = len(stack)
+        hits = [0] * len(cells)         # Consultas por celda de la tabla
+        accepted = False
+
+        while True:
+            top_of_stack = stack[-1]
+            steps += 1
+            if steps % sample_every == 0:
+                samples.append((clock(), len(stack)))
+            if top_of_stack < first_nt:
+                if top_of_stack != kind:
+                    break
+                if kind == end:
+                    accepted = True
+                    break
+                pop()
+                matches += 1
+                token = next(token_stream, eof)
+                kind = terminal_ids.get(token.type, unknown)
+            else:
+                index = (top_of_stack - first_nt) * width + kind
+                hits[index] += 1
+                production = cells[index]
+                if production < 0:
+                    break
+                pop()
+                body = rhs_reversed[production]
+                extend(body)
+                pushed += len(body)
+                if len(stack) > max_depth:
+                    max_depth = len(stack)
+
+        self.current_token = token
+        stats.add_run(ct, hits, steps, matches, pushed, max_depth)
+        return accepted, top_of_stack, steps
+
+    def _run_tree(self, arena):
+        """Bucle del analizador que además construye el árbol en el arena.
+
+        Al expandir A -> X Y Z se empuja, debajo de Z Y X, una marca ~p con el
+        número de producción. Cuando la marca vuelve al tope, los nodos de
+        X, Y y Z ya están en 'nodes' y se reemplazan por el nodo de A.
+        Devuelve (aceptada, tope_de_pila_al_terminar, pasos, raíz).
+        """
+        ct = self.compiled
+        cells = ct.cells
+        rhs_reversed = ct.rhs_reversed
+        width = ct.width
+        first_nt = ct.first_nt
+        end = ct.end
+        terminal_ids = ct.terminal_ids
+        unknown = ct.unknown
+        lhs_ids = [ct.ids[nt] for nt, _ in ct.productions]
+        token_stream = self.token_stream
+        eof = Token('$', '$', -1, -1)
+        if arena.symbol_names is None:
+            arena.symbol_names = ct.symbols
+        leaf = arena.leaf
+        node = arena.node
+
+        stack = [end, ct.start]
+        pop = stack.pop
+        nodes = []
+        token = self.current_token
+        kind = terminal_ids.get(token.type, unknown)
+        steps = 0
+
+        while True:
+            top_of_stack = stack[-1]
+            if top_of_stack < 0:
+                # Marca de fin de producción: reducir sus hijos a un nodo
+                pop()
+                production = ~top_of_stack
+                n = len(rhs_reversed[production])
+                if n:
+                    children = nodes[-n:]
+                    del nodes[-n:]
+                else:
+                    children = ()
+                nodes.append(node(lhs_ids[production], children))
+                continue
+
+            steps += 1
+            if top_of_stack < first_nt:
+                if top_of_stack != kind:
+                    break
+                if kind == end:
+                    return True, top_of_stack, steps, nodes[-1]
+                pop()
+                nodes.append(leaf(kind, token.value))
+                token = next(token_stream, eof)
+                kind = terminal_ids.get(token.type, unknown)
+            else:
+                production = cells[(top_of_stack - first_nt) * width + kind]
+                if production < 0:
+                    break
+                stack[-1] = ~production
+                stack.extend(rhs_reversed[production])
+
+        self.current_token = token
+        return False, top_of_stack, steps, None
+
+    def _run_traced(self):
+        """Bucle del analizador con la traza completa paso a paso."""
+        ct = self.compiled
+        cells = ct.cells
+        rhs_reversed = ct.rhs_reversed
+        symbols = ct.symbols
+        width = ct.width
+        first_nt = ct.first_nt
+        end = ct.end
+        kind_of = ct.kind_of
+        output = self.output
         
         # 1. Inicializar Pila
-        stack = ['$', self.start_symbol] # $ = Fin de pila, S = Símbolo inicial
+        stack = [end, ct.start] # $ = Fin de pila, S = Símbolo inicial
+        kind = kind_of(self.current_token.type)
+        steps = 0
         
         # 2. Bucle principal del analizador
-        while stack:
+        while True:
             # Ver el tope de la pila
             top_of_stack = stack[-1]
+            steps += 1
             
             # Ver el token de entrada actual
             token_type = self.current_token.type
             token_value = self.current_token.value
             
-            print(f"Pila: {str(stack):<40} Token Actual: ({token_type}, '{token_value}')")
-
-            if top_of_stack == '$' and token_type == '$':
-                print("--- Análisis Exitoso ---")
-                print("La cadena es aceptada por la gramática.")
-                return True
-
-            if top_of_stack in TERMINALS or top_of_stack == '$':
-                # Caso: Tope de pila es un Terminal
-                if top_of_stack == token_type:
-                    stack.pop() # Hacer pop
-                    self._next_token() # Avanzar token
-                else:
-                    self._error(f"Se esperaba el token '{top_of_stack}' pero se encontró '{token_type}'")
-                    return False
+            output(f"Pila: {str([symbols[s] for s in stack]):<40} Token Actual: ({token_type}, '{token_value}')")
+
+            if top_of_stack < first_nt:
+                # Caso: Tope de pila es un Terminal (o '$')
+                if top_of_stack != kind:
+                    return False, top_of_stack, steps
+                if kind == end:
+                    return True, top_of_stack, steps
+                stack.pop() # Hacer pop
+                self._next_token() # Avanzar token
+                kind = kind_of(self.current_token.type)
             
-            elif top_of_stack in NON_TERMINALS:
+            else:
                 # Caso: Tope de pila es un No-Terminal
                 # 3. Consultar la tabla
-                production = self.table[top_of_stack].get(token_type)
+                production = cells[(top_of_stack - first_nt) * width + kind]
                 
-                if production is None:
+                if production < 0:
                     # Error: Celda vacía en la tabla
-                    expected = ", ".join([t for t, v in self.table[top_of_stack].items() if v is not None])
-                    self._error(f"Token inesperado '{token_type}'. Se esperaba uno de: {expected}")
-                    return False
+                    return False, top_of_stack, steps
                 
                 # 4. Aplicar la regla
                 stack.pop() # Sacar el No-Terminal
                 
-                # Si no es lambda, empujar los símbolos de la producción (en orden inverso)
-                if production != ['lambda']:
-                    for symbol in reversed(production):
-                        stack.append(symbol)
-                
-                print(f"   -> Aplicando regla: {top_of_stack} -> {' '.join(production)}")
+                # Empujar los símbolos de la producción (ya invertidos; vacío si es lambda)
+                stack.extend(rhs_reversed[production])
                 
-            else:
-                self._error(f"Símbolo desconocido en la pila: {top_of_stack}")
-                return False
-                
-        print("--- Análisis Fallido (Fin de pila inesperado) ---")
-        return False
+                output(f"   -> Aplicando regla: {ct.production_str(production)}")
+
+    def _run_recovering(self):
+        """Bucle del analizador con recuperación de errores en modo pánico.
 
-    def _error(self, message):
-        """Manejo de errores sintácticos."""
+        - Terminal esperado distinto del token: se saca de la pila (se asume
+          que faltaba). Si el tope es '$' sobra entrada: se descarta el token y,
+          si el siguiente puede iniciar una expresión, se sigue analizando desde
+          el símbolo inicial.
+        - Celda vacía para (A, token): se descartan tokens hasta uno que permita
+          expandir A o que esté en FOLLOW(A); en el segundo caso se saca A.
+        Tras un error no se reporta otro hasta que se consuma algún token, para
+        evitar errores en cascada.
+        Devuelve (errores, pasos).
+        """
+        ct = self.compiled
+        cells = ct.cells
+        rhs_reversed = ct.rhs_reversed
+        width = ct.width
+        first_nt = ct.first_nt
+        end = ct.end
+        start = ct.start
+        start_row = (start - first_nt) * width
+        terminal_ids = ct.terminal_ids
+        unknown = ct.unknown
+        follow_ids = self.follow_ids
+        token_stream = self.token_stream
+        eof = Token('$', '$', -1, -1)
+        max_errors = self.max_errors
+
+        stack = [end, start]
+        pop = stack.pop
         token = self.current_token
-        print(f"\n*** Error de Sintaxis! ***")
-        print(f"  {message}")
-        print(f"  En línea {token.line}, columna {token.column} (token: '{token.value}')")
+        kind = terminal_ids.get(token.type, unknown)
+        steps = 0
+        errors = []
+        matched = True      # Se consumió algún token desde el último error
+
+        while True:
+            top_of_stack = stack[-1]
+            steps += 1
+            if top_of_stack < first_nt:
+                if top_of_stack == kind:
+                    if kind == end:
+                        break
+                    pop()
+                    matched = True
+                    token = next(token_stream, eof)
+                    kind = terminal_ids.get(token.type, unknown)
+                    continue
+                if matched:
+                    errors.append(self._parse_error(top_of_stack, token))
+                    matched = False
+                    if len(errors) >= max_errors:
+                        break
+                if top_of_stack == end:
+                    token = next(token_stream, eof)
+                    kind = terminal_ids.get(token.type, unknown)
+                    if kind != end and cells[start_row + kind] >= 0:
+                        stack.append(start)
+                else:
+                    pop()
+            else:
+                row = (top_of_stack - first_nt) * width
+                production = cells[row + kind]
+                if production >= 0:
+                    pop()
+                    stack.extend(rhs_reversed[production])
+                    continue
+                if matched:
+                    errors.append(self._parse_error(top_of_stack, token))
+                    matched = False
+                    if len(errors) >= max_errors:
+                        break
+                follow = follow_ids[top_of_stack - first_nt]
+                while kind != end and kind not in follow and cells[row + kind] < 0:
+                    token = next(token_stream, eof)
+                    kind = terminal_ids.get(token.type, unknown)
+                if cells[row + kind] < 0:
+                    pop()
+
+        self.current_token = token
+        return errors, steps
+
+    def _parse_error(self, top_of_stack, token):
+        """ParseError para el tope de pila y el token donde se detectó el error."""
+        ct = self.compiled
+        if top_of_stack < ct.first_nt:
+            expected = (ct.symbols[top_of_stack],)
+        else:
+            expected = tuple(ct.expected(top_of_stack))
+        return ParseError(self._error_message(top_of_stack, token), token, token.line, token.column, expected)
+
+    def _recovery_result(self, errors, steps):
+        """Informa los errores del modo recuperación y arma el ParseResult."""
+        if not errors:
+            self._success(steps)
+            return ParseResult(True, None, None, None, None, steps, None, [])
+        if self.trace >= TRACE_ERRORS:
+            for error in errors:
+                self._error(error.message, error.token)
+        if self.trace >= TRACE_SUMMARY:
+            self.output(f"\n--- {len(errors)} error(es) de sintaxis ---")
+            if len(errors) >= self.max_errors:
+                self.output(f"(se alcanzó el límite de {self.max_errors} errores)")
+        first = errors[0]
+        return ParseResult(False, first.message, first.token, first.line, first.column, steps, None, errors)
+
+    def _success(self, steps):
+        """Mensajes de análisis exitoso."""
+        if self.trace >= TRACE_SUMMARY:
+            self.output("--- Análisis Exitoso ---")
+            self.output("La cadena es aceptada por la gramática.")
+            if self.trace == TRACE_SUMMARY:
+                self.output(f"Pasos: {steps}")
+
+    def _error_message(self, top_of_stack, token):
+        """Mensaje de error para el tope de pila y el token donde falló el análisis."""
+        ct = self.compiled
+        if top_of_stack < ct.first_nt:
+            return f"Se esperaba el token '{ct.symbols[top_of_stack]}' pero se encontró '{token.type}'"
+        expected = ", ".join(ct.expected(top_of_stack))
+        return f"Token inesperado '{token.type}'. Se esperaba uno de: {expected}"
+
+    def _error(self, message, token=None):
+        """Manejo de errores sintácticos (por defecto, en el token actual)."""
+        if token is None:
+            token = self.current_token
+        self.output(f"\n*** Error de Sintaxis! ***")
+        self.output(f"  {message}")
+        self.output(f"  En línea {token.line}, columna {token.column} (token: '{token.value}')")
 
 
 # --- Ejecución Principal ---
@@ -329,42 +1242,43 @@ def main():
             print(f"{nt} -> {' '.join(prod)}")
     
     # --- 3. Conjuntos FIRST y FOLLOW ---
+    # FIRST, FOLLOW y la tabla se leen de la caché en disco (table_cache) y sólo
+    # se recalculan cuando cambia la gramática. Se pasan las definiciones de
+    # este módulo para que table_cache no vuelva a importar main.py como 'main'.
+    from table_cache import load_parser_components
+    try:
+        first_sets, get_first_seq_func, follow_sets, parsing_table = load_parser_components(
+            definitions=sys.modules[__name__])
+    except ValueError as e:
+        print(f"\nError al generar la tabla: {e}")
+        print("La gramática no es LL(1).")
+        sys.exit(1)
+
     print("\n--- 3. Conjuntos FIRST ---")
-    # CORRECCIÓN: Captura la función helper
-    first_sets, get_first_seq_func = compute_first_sets(GRAMMAR, NON_TERMINALS, TERMINALS)
     for nt, f_set in first_sets.items():
         print(f"FIRST({nt}) = {f_set}")
 
     print("\n--- 3. Conjuntos FOLLOW ---")
-    # CORRECCIÓN: Pasa la función helper a 'compute_follow_sets'
-    follow_sets = compute_follow_sets(GRAMMAR, NON_TERMINALS, START_SYMBOL, first_sets, get_first_seq_func)
     for nt, f_set in follow_sets.items():
         print(f"FOLLOW({nt}) = {f_set}")
         
     # --- 4. Tabla Sintáctica ---
     print("\n--- 4. Tabla Sintáctica LL(1) ---")
-    try:
-        parsing_table = create_parsing_table(GRAMMAR, first_sets, follow_sets, get_first_seq_func, NON_TERMINALS, TERMINALS)
-        # Imprimir la tabla de forma legible
-        header = f"{'':<4} |" + "".join([f"{t:<10}" for t in TERMINALS])
-        print(header)
-        print("-" * len(header))
-        for nt, row in parsing_table.items():
-            row_str = f"{nt:<4} |"
-            for t in TERMINALS:
-                prod = row[t]
-                if prod is None:
-                    row_str += f"{'':<10}"
-                elif prod == ['lambda']:
-                    row_str += f"{'lambda':<10}"
-                else:
-                    row_str += f"{' '.join(prod):<10}"
-            print(row_str)
-            
-    except ValueError as e:
-        print(f"\nError al generar la tabla: {e}")
-        print("La gramática no es LL(1).")
-        sys.exit(1)
+    # Imprimir la tabla de forma legible
+    header = f"{'':<4} |" + "".join([f"{t:<10}" for t in TERMINALS])
+    print(header)
+    print("-" * len(header))
+    for nt, row in parsing_table.items():
+        row_str = f"{nt:<4} |"
+        for t in TERMINALS:
+            prod = row[t]
+            if prod is None:
+                row_str += f"{'':<10}"
+            elif prod == ['lambda']:
+                row_str += f"{'lambda':<10}"
+            else:
+                row_str += f"{' '.join(prod):<10}"
+        print(row_str)
 
     # --- 5 y 6. Implementación (Lexer y Parser) ---
     # MODIFICACIÓN: Aceptar el nombre del archivo como argumento de línea de comandos.
@@ -0,0 +1,244 @@
+"""Análisis en varios núcleos de una sola expresión enorme.
+
+Una expresión de cientos de millones de tokens se analiza en un solo núcleo
+con Parser.parse. Aquí se parte en tramos que se validan en paralelo:
+
+1. Se tokeniza a un TokenBuffer y se calcula (con NumPy, por bloques) la
+   profundidad de paréntesis antes de cada token.
+2. Los puntos de corte son operadores a profundidad 0 del nivel de
+   precedencia más bajo que aparezca ('+', '-', '%'; si la expresión es un
+   solo término, '*' y '/'). Se eligen unos pocos por proceso, repartidos de
+   forma pareja.
+3. La columna de tipos se copia una sola vez a memoria compartida
+   (multiprocessing.shared_memory) y cada proceso valida su tramo leyéndola
+   directamente, con precedence.PrecedenceEngine (sin copiar tokens).
+4. Los resultados se unen en orden: el primer tramo con error da el error.
+
+El resultado es el mismo ParseResult que el Parser secuencial (veredicto,
+token, mensaje y pasos). Un tramo empieza justo después de un operador a
+profundidad 0, así que el Parser llega a él en el mismo estado con que se
+valida el tramo (esperando un operando del nivel siguiente, sin paréntesis
+abiertos); el fin de un tramo (su '$') ocupa el lugar del operador de corte:
+
+- si el tramo termina esperando un operando, el error es el mismo y su
+  índice es justamente el del operador de corte;
+- si termina bien, el Parser secuencial habría gastado j pasos menos al
+  leer un operador del nivel j en vez de un cierre (ver precedence.py).
+
+Un ')' sin abrir deja la profundidad negativa: no se corta después de él
+(ese tramo final reporta el error igual que el Parser). Sin NumPy, con una
+gramática sin forma de operadores, con pocos tokens o sin puntos de corte
+se usa el Parser secuencial.
+
+Uso:
+    python parallel_parse.py archivo.java [-j 4] [--min-tokens 1000000]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+from main import START_SYMBOL, TRACE_ERRORS, TRACE_NONE, TRACE_SUMMARY, ParseResult, Parser, Token
+
+# Con menos tokens, repartir no compensa el costo del pool
+DEFAULT_MIN_TOKENS = 1 << 20
+# Tramos por proceso (más tramos que procesos reparten mejor la carga)
+CHUNKS_PER_WORKER = 4
+# Tokens por bloque al calcular la profundidad (acota la memoria temporal)
+_DEPTH_BLOCK = 1 << 24
+
+# Motor de precedencia de cada proceso del pool (se crea en _init_worker)
+_worker_engine = None
+
+
+def _init_worker(parsing_table, start_symbol):
+    """Inicializa el motor del proceso con la tabla ya construida."""
+    global _worker_engine
+    _worker_engine = Parser(parsing_table, start_symbol, trace=TRACE_NONE)._precedence_engine()
+
+
+def _validate_chunk(task):
+    """Valida kinds[start:end] de la memoria compartida 'name' desde 'level'.
+
+    Devuelve (aceptada, tope_de_pila, pasos, índice_local), como run_kinds.
+    """
+    from multiprocessing import shared_memory
+
+    name, start, end, level = task
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = shm.buf[start:end]
+        try:
+            return _worker_engine.run_kinds(view, level)
+        finally:
+            view.release()
+    finally:
+        shm.close()
+
+
+def terminal_kinds(parser, buffer):
+    """Columna de tipos del TokenBuffer como bytes de ids de terminal del parser."""
+    ct = parser.compiled
+    codes = [ct.terminal_ids.get(name, ct.unknown) for name in buffer.kind_names]
+    kinds = buffer.kinds.tobytes()
+    if codes != list(range(len(codes))):
+        kinds = kinds.translate(bytes(codes + [0] * (256 - len(codes))))
+    return kinds
+
+
+def split_points(engine, kinds, parts):
+    """Puntos de corte para unos 'parts' tramos.
+
+    Devuelve (nivel, posiciones): posiciones crecientes de operadores a
+    profundidad 0 del nivel de precedencia más bajo presente, o (None, [])
+    si no hay ninguno. Sólo se consideran los tokens hasta el primer '$' y
+    antes de que la profundidad se haga negativa.
+    """
+    import numpy as np
+
+    data = np.frombuffer(kinds, dtype=np.uint8)
+    ends = np.flatnonzero(data == engine.end)
+    n = int(ends[0]) if len(ends) else len(data)
+    op_level = np.array(engine.after_level, dtype=np.int8)
+    k = engine.k
+    targets = np.linspace(0, n, parts + 1)[1:-1].astype(np.int64)
+
+    found = [False] * k             # ¿Hay algún operador del nivel a profundidad 0?
+    chosen = [[] for _ in range(k)]
+    depth = 0
+    for base in range(0, n, _DEPTH_BLOCK):
+        block = data[base:min(n, base + _DEPTH_BLOCK)]
+        delta = (block == engine.open).astype(np.int64) - (block == engine.close)
+        after = np.cumsum(delta) + depth
+        negative = np.flatnonzero(after < 0)
+        limit = int(negative[0]) if len(negative) else len(block)
+        before = (after - delta)[:limit]
+        levels = op_level[block[:limit]]
+        block_targets = targets[(targets >= base) & (targets < base + limit)] - base
+        for j in range(k):
+            candidates = np.flatnonzero((levels == j) & (before == 0))
+            if not len(candidates):
+                continue
+            found[j] = True
+            # Para cada objetivo del bloque, el primer candidato desde él
+            at = np.searchsorted(candidates, block_targets)
+            chosen[j].extend(int(c) + base for c in candidates[at[at < len(candidates)]])
+        if limit < len(block):
+            break
+        depth = int(after[-1])
+
+    for j in range(k):
+        if found[j]:
+            return j, sorted(set(chosen[j]))
+    return None, []
+
+
+def parse_parallel(parser, buffer, workers=None, min_tokens=DEFAULT_MIN_TOKENS, executor=None):
+    """Analiza un TokenBuffer repartiéndolo entre procesos; devuelve un ParseResult.
+
+    El resultado es el de parser.parse_tokens(buffer) (sin traza paso a
+    paso: con trace >= TRACE_SUMMARY se informa como en ese nivel). Se puede
+    pasar un executor (ProcessPoolExecutor inicializado con _init_worker)
+    para reutilizarlo entre llamadas.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    engine = None
+    if (len(buffer) >= min_tokens and (workers > 1 or executor is not None)
+            and importlib.util.find_spec('numpy') is not None):
+        try:
+            engine = parser._precedence_engine()
+        except ValueError:
+            engine = None
+
+    kinds = terminal_kinds(parser, buffer) if engine is not None else b''
+    level, cuts = split_points(engine, kinds, workers * CHUNKS_PER_WORKER) if engine is not None else (None, [])
+    if not cuts:
+        return _sequential(parser, buffer)
+
+    from multiprocessing import shared_memory
+
+    bounds = [0] + [cut + 1 for cut in cuts]
+    ends = cuts + [len(kinds)]
+    shm = shared_memory.SharedMemory(create=True, size=len(kinds))
+    own_executor = executor is None
+    try:
+        shm.buf[:len(kinds)] = kinds
+        if own_executor:
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(parser.table, parser.compiled.symbols[parser.compiled.start]))
+        tasks = [(shm.name, start, end, 0 if i == 0 else level + 1)
+                 for i, (start, end) in enumerate(zip(bounds, ends))]
+        outcomes = list(executor.map(_validate_chunk, tasks))
+    finally:
+        if own_executor and executor is not None:
+            executor.shutdown()
+        shm.close()
+        shm.unlink()
+
+    # Unión en orden: cada tramo que termina bien en un corte cuesta 'level'
+    # pasos menos en el Parser secuencial
+    steps = 0
+    last = len(outcomes) - 1
+    for i, (accepted, top_of_stack, chunk_steps, index) in enumerate(outcomes):
+        steps += chunk_steps
+        if not accepted:
+            index += bounds[i]
+            token = buffer[index] if index < len(buffer) else Token('$', '$', -1, -1)
+            return _rejected(parser, top_of_stack, token, steps)
+        if i < last:
+            steps -= level
+    parser._success(steps)
+    return ParseResult(True, None, None, None, None, steps)
+
+
+def _sequential(parser, buffer):
+    """Análisis secuencial, con la traza limitada como en parse_parallel."""
+    trace = parser.trace
+    parser.trace = min(trace, TRACE_SUMMARY)
+    try:
+        return parser.parse_tokens(buffer)
+    finally:
+        parser.trace = trace
+
+
+def _rejected(parser, top_of_stack, token, steps):
+    message = parser._error_message(top_of_stack, token)
+    if parser.trace >= TRACE_ERRORS:
+        parser._error(message, token)
+    return ParseResult(False, message, token, token.line, token.column, steps)
+
+
+def parse_file_parallel(parser, path, workers=None, min_tokens=DEFAULT_MIN_TOKENS):
+    """Tokeniza el archivo 'path' a un TokenBuffer y lo analiza con parse_parallel."""
+    from token_buffer import TokenBuffer
+
+    with open(path, 'r') as f:
+        text = f.read()
+    return parse_parallel(parser, TokenBuffer.from_text(text), workers, min_tokens)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Analiza una expresión enorme en varios procesos.")
+    arg_parser.add_argument('path', metavar='ARCHIVO')
+    arg_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help="procesos (por defecto, uno por CPU)")
+    arg_parser.add_argument('--min-tokens', type=int, default=DEFAULT_MIN_TOKENS,
+                            help=f"tokens a partir de los cuales se reparte (por defecto {DEFAULT_MIN_TOKENS})")
+    args = arg_parser.parse_args(argv)
+
+    from table_cache import load_parser_components
+    _, _, _, parsing_table = load_parser_components()
+    parser = Parser(parsing_table, START_SYMBOL, trace=TRACE_SUMMARY)
+    try:
+        result = parse_file_parallel(parser, args.path, args.workers, args.min_tokens)
+    except OSError as e:
+        print(f"Error: no se pudo leer '{args.path}': {e}", file=sys.stderr)
+        return 2
+    return 0 if result else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
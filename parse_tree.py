@@ -0,0 +1,131 @@
+"""Árbol sintáctico compacto en un arena, con hash-consing de subárboles.
+
+El Parser puede construir el árbol de derivación mientras aplica las reglas
+(Parser.parse_tokens(tokens, arena=TreeArena())). Los nodos no son objetos
+Python: viven en columnas paralelas de 'array' y se identifican por su
+índice. Además, dos subárboles estructuralmente idénticos (mismo símbolo,
+mismo lexema y mismos hijos), como dos apariciones de '(a + b)', se guardan
+una sola vez: el resultado es un DAG compartido.
+
+Columnas por nodo:
+    symbols[n]      id del símbolo (CompiledTable.symbols)
+    values[n]       índice del lexema en 'lexemes' (hojas) o -1 (nodos internos)
+    first_child[n]  posición del primer hijo en 'edges'
+    child_count[n]  cantidad de hijos
+Y una lista plana de aristas:
+    edges[i]        id del nodo hijo
+"""
+
+from array import array
+
+
+class TreeArena:
+    """Arena de nodos del árbol sintáctico con hash-consing."""
+
+    __slots__ = ('symbol_names', 'symbols', 'values', 'first_child', 'child_count', 'edges',
+                 'lexemes', '_lexeme_ids', '_index', 'requests')
+
+    def __init__(self, symbol_names=None):
+        self.symbol_names = symbol_names     # Nombres de símbolos (se fijan al usarla con un Parser)
+        self.symbols = array('i')
+        self.values = array('i')
+        self.first_child = array('i')
+        self.child_count = array('i')
+        self.edges = array('i')
+        self.lexemes = []
+        self._lexeme_ids = {}
+        # Clave estructural -> id de nodo (para el hash-consing)
+        self._index = {}
+        # Nodos pedidos (con repeticiones), para medir cuánto se compartió
+        self.requests = 0
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _intern(self, lexeme):
+        lexeme_id = self._lexeme_ids.get(lexeme)
+        if lexeme_id is None:
+            lexeme_id = self._lexeme_ids[lexeme] = len(self.lexemes)
+            self.lexemes.append(lexeme)
+        return lexeme_id
+
+    def leaf(self, symbol, lexeme):
+        """Devuelve el nodo hoja (símbolo terminal, lexema), creándolo si no existe."""
+        self.requests += 1
+        lexeme_id = self._intern(lexeme)
+        key = (symbol, lexeme_id)
+        node = self._index.get(key)
+        if node is None:
+            node = self._index[key] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.values.append(lexeme_id)
+            self.first_child.append(len(self.edges))
+            self.child_count.append(0)
+        return node
+
+    def node(self, symbol, children):
+        """Devuelve el nodo interno (símbolo, hijos), creándolo si no existe."""
+        self.requests += 1
+        key = (symbol, -1, *children)
+        node = self._index.get(key)
+        if node is None:
+            node = self._index[key] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.values.append(-1)
+            self.first_child.append(len(self.edges))
+            self.child_count.append(len(children))
+            self.edges.extend(children)
+        return node
+
+    def freeze(self):
+        """Descarta el índice de hash-consing (el árbol queda de sólo lectura, y más liviano)."""
+        self._index = {}
+        self._lexeme_ids = {}
+
+    # --- Consultas ---
+
+    def symbol(self, node):
+        """Nombre del símbolo del nodo."""
+        return self.symbol_names[self.symbols[node]]
+
+    def lexeme(self, node):
+        """Lexema de una hoja (None para nodos internos)."""
+        value = self.values[node]
+        return self.lexemes[value] if value >= 0 else None
+
+    def children(self, node):
+        """Ids de los hijos del nodo."""
+        start = self.first_child[node]
+        return self.edges[start:start + self.child_count[node]]
+
+    def to_tuple(self, node):
+        """Convierte el subárbol en tuplas anidadas (símbolo, hijos...) u hojas (símbolo, lexema).
+
+        Es iterativo, así que sirve con árboles muy profundos; pensado para
+        depuración y pruebas, ya que materializa el subárbol completo.
+        """
+        results = {}
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if current in results:
+                continue
+            if self.values[current] >= 0:
+                results[current] = (self.symbol(current), self.lexeme(current))
+            elif expanded:
+                results[current] = (self.symbol(current), *(results[c] for c in self.children(current)))
+            else:
+                stack.append((current, True))
+                stack.extend((c, False) for c in self.children(current) if c not in results)
+        return results[node]
+
+    def stats(self):
+        """Tamaño del arena: nodos únicos, nodos pedidos (árbol sin compartir) y bytes de las columnas."""
+        columns = (self.symbols, self.values, self.first_child, self.child_count, self.edges)
+        return {
+            'nodes': len(self.symbols),
+            'requested_nodes': self.requests,
+            'edges': len(self.edges),
+            'lexemes': len(self.lexemes),
+            'column_bytes': sum(len(c) * c.itemsize for c in columns),
+        }
@@ -0,0 +1,253 @@
+"""Motor de análisis por precedencia de operadores (alternativo al bucle LL(1)).
+
+GRAMMAR es una gramática de operadores clásica: cada nivel de precedencia es
+un par de no-terminales
+
+    X  -> Y XP
+    XP -> op Y XP | ... | lambda
+
+y el último nivel desemboca en un primario
+
+    F  -> ( E ) | id | num
+
+El bucle LL(1) recorre esos niveles con la pila en cada token (expande X,
+Y, ..., F y vacía XP, TP, ... con lambda). Este motor deriva de la tabla la
+tabla de precedencia (operador -> nivel) y valida con un autómata de un
+solo paso por token: "se espera un operando" / "se espera un operador o un
+cierre", más un contador de paréntesis abiertos.
+
+El resultado es exactamente el del Parser LL(1): mismo veredicto, mismo
+token de error, mismo tope de pila (y por lo tanto el mismo mensaje y los
+mismos terminales esperados) y el mismo número de pasos, que se calcula
+sumando lo que el bucle LL(1) habría hecho en cada transición:
+
+    operando al nivel j   (k - j) expansiones X, 1 expansión F, 1 match
+    operador del nivel j  (k - 1 - j) lambdas, 1 expansión XP, 1 match
+    cierre (')' o '$')    k lambdas, 1 match
+
+(k = cantidad de niveles). Los costos del caso "después de un operando" se
+toman de la tabla LL(1) celda por celda, así que un token que la tabla
+rechaza en un nivel intermedio se reporta en ese mismo nivel.
+
+Se usa desde Parser con engine='precedence' (ver main.Parser.parse_tokens).
+Sólo valida: no construye árbol, no imprime traza paso a paso ni se recupera
+de errores. Si la gramática no tiene esta forma, PrecedenceEngine lanza
+ValueError.
+"""
+
+from main import Token
+
+# Acciones "después de un operando" (after_level) que no son un operador
+_CLOSE = -1     # Todos los niveles derivan lambda: se espera ')' o '$'
+_ERROR = -2     # Celda vacía en algún nivel: error con ese XP en el tope
+
+
+class PrecedenceEngine:
+    """Validador por precedencia de operadores derivado de una CompiledTable."""
+
+    def __init__(self, compiled):
+        ct = compiled
+        self.compiled = ct
+        by_nt = {}
+        for nt, production in ct.productions:
+            by_nt.setdefault(nt, []).append(production)
+
+        # Niveles de precedencia, del más externo (símbolo inicial) al más interno
+        start = ct.symbols[ct.start]
+        self.levels = []           # [(X, XP, [operadores])]
+        self.precedence = {}       # operador -> nivel
+        nt = start
+        seen = set()
+        while True:
+            productions = by_nt.get(nt, [])
+            if not (len(productions) == 1 and len(productions[0]) == 2
+                    and all(s in by_nt for s in productions[0])):
+                break
+            inner, tail = productions[0]
+            operators = []
+            for production in by_nt[tail]:
+                if production == ['lambda']:
+                    continue
+                if (len(production) != 3 or production[0] not in ct.terminal_ids
+                        or production[1:] != [inner, tail]):
+                    raise ValueError(f"La gramática no es de precedencia de operadores: "
+                                     f"{tail} -> {' '.join(production)}")
+                operators.append(production[0])
+            if ['lambda'] not in by_nt[tail] or nt in seen:
+                raise ValueError(f"La gramática no es de precedencia de operadores: {tail}")
+            seen.add(nt)
+            for op in operators:
+                self.precedence[op] = len(self.levels)
+            self.levels.append((nt, tail, operators))
+            nt = inner
+        if not self.levels:
+            raise ValueError("La gramática no es de precedencia de operadores: "
+                             f"{start} no tiene la forma X -> Y XP")
+
+        # Primario: terminales sueltos y a lo sumo una producción de agrupación
+        self.primary = nt
+        self.atoms = []
+        self.group = None          # (apertura, cierre)
+        for production in by_nt.get(nt, []):
+            if len(production) == 1 and production[0] in ct.terminal_ids:
+                self.atoms.append(production[0])
+            elif (len(production) == 3 and self.group is None and production[1] == start
+                  and production[0] in ct.terminal_ids and production[2] in ct.terminal_ids):
+                self.group = (production[0], production[2])
+            else:
+                raise ValueError(f"La gramática no es de precedencia de operadores: "
+                                 f"{nt} -> {' '.join(production)}")
+
+        k = len(self.levels)
+        width = ct.width
+        self.k = k
+        self.end = ct.end
+        # Tope equivalente al esperar un operando en el nivel j (j == k: el primario)
+        self.level_ids = [ct.ids[x] for x, _, _ in self.levels] + [ct.ids[self.primary]]
+        self.is_atom = [False] * width
+        for atom in self.atoms:
+            self.is_atom[ct.terminal_ids[atom]] = True
+        self.open, self.close = ((ct.terminal_ids[self.group[0]], ct.terminal_ids[self.group[1]])
+                                 if self.group else (-1, -1))
+
+        # Acción después de un operando, por tipo de token, tomada de las filas XP
+        self.after_level = [_ERROR] * width
+        self.after_steps = [0] * width
+        self.after_top = [0] * width
+        for kind in range(width):
+            for j in range(k - 1, -1, -1):
+                tail_id = ct.ids[self.levels[j][1]]
+                pid = ct.lookup(tail_id, kind)
+                lambdas = k - 1 - j
+                if pid < 0:
+                    self.after_level[kind] = _ERROR
+                    self.after_steps[kind] = lambdas + 1
+                    self.after_top[kind] = tail_id
+                    break
+                if ct.productions[pid][1] != ['lambda']:
+                    self.after_level[kind] = j
+                    self.after_steps[kind] = lambdas + 2
+                    break
+            else:
+                self.after_level[kind] = _CLOSE
+                self.after_steps[kind] = k + 1
+
+    def run(self, token, token_stream):
+        """Valida desde 'token' siguiendo con 'token_stream'.
+
+        Devuelve (aceptada, tope_de_pila_equivalente, pasos, token_actual),
+        como Parser._run.
+        """
+        ct = self.compiled
+        terminal_ids = ct.terminal_ids
+        unknown = ct.unknown
+        k = self.k
+        end = self.end
+        open_ = self.open
+        close = self.close
+        is_atom = self.is_atom
+        after_level = self.after_level
+        after_steps = self.after_steps
+        eof = Token('$', '$', -1, -1)
+
+        kind = terminal_ids.get(token.type, unknown)
+        level = 0
+        depth = 0
+        steps = 0
+        while True:
+            # Se espera un operando (tope equivalente: X del nivel 'level')
+            if is_atom[kind]:
+                steps += k - level + 2
+                token = next(token_stream, eof)
+                kind = terminal_ids.get(token.type, unknown)
+            elif kind == open_:
+                steps += k - level + 2
+                depth += 1
+                level = 0
+                token = next(token_stream, eof)
+                kind = terminal_ids.get(token.type, unknown)
+                continue
+            else:
+                return False, self.level_ids[level], steps + 1, token
+
+            # Se espera un operador o un cierre
+            while True:
+                j = after_level[kind]
+                if j >= 0:
+                    steps += after_steps[kind]
+                    level = j + 1
+                    token = next(token_stream, eof)
+                    kind = terminal_ids.get(token.type, unknown)
+                    break
+                steps += after_steps[kind]
+                if j == _ERROR:
+                    return False, self.after_top[kind], steps, token
+                top = close if depth else end
+                if kind != top:
+                    return False, top, steps, token
+                if not depth:
+                    return True, end, steps, token
+                depth -= 1
+                token = next(token_stream, eof)
+                kind = terminal_ids.get(token.type, unknown)
+
+    def run_kinds(self, kinds, level=0):
+        """Como run, sobre una secuencia de ids de terminal (p. ej. los tipos de un
+        TokenBuffer ya traducidos). En vez del token devuelve su índice
+        (len(kinds) si el error es en el fin de entrada sintético).
+
+        level es el nivel del primer operando: 0 al principio de la expresión,
+        j + 1 para validar un tramo que sigue a un operador del nivel j (ver
+        parallel_parse.py).
+        """
+        k = self.k
+        end = self.end
+        open_ = self.open
+        close = self.close
+        is_atom = self.is_atom
+        after_level = self.after_level
+        after_steps = self.after_steps
+        n = len(kinds)
+
+        i = 0
+        kind = kinds[0] if n else end
+        depth = 0
+        steps = 0
+        while True:
+            if is_atom[kind]:
+                steps += k - level + 2
+                i += 1
+                kind = kinds[i] if i < n else end
+            elif kind == open_:
+                steps += k - level + 2
+                depth += 1
+                level = 0
+                i += 1
+                kind = kinds[i] if i < n else end
+                continue
+            else:
+                return False, self.level_ids[level], steps + 1, i
+
+            while True:
+                j = after_level[kind]
+                if j >= 0:
+                    steps += after_steps[kind]
+                    level = j + 1
+                    i += 1
+                    kind = kinds[i] if i < n else end
+                    break
+                steps += after_steps[kind]
+                if j == _ERROR:
+                    return False, self.after_top[kind], steps, i
+                top = close if depth else end
+                if kind != top:
+                    return False, top, steps, i
+                if not depth:
+                    return True, end, steps, i
+                depth -= 1
+                i += 1
+                kind = kinds[i] if i < n else end
+
+    def table(self):
+        """Tabla de precedencia: [(nivel, no-terminal, operadores)], de menor a mayor."""
+        return [(j, x, list(operators)) for j, (x, _, operators) in enumerate(self.levels)]
@@ -0,0 +1,225 @@
+"""Validación vectorizada (NumPy) de muchas expresiones ya tokenizadas.
+
+En una gramática de operadores como GRAMMAR, el resultado de un token
+depende sólo del token anterior y de la profundidad de paréntesis:
+
+- después del inicio, de '(' o de un operador se espera un operando
+  (id, num o '('): dos operadores seguidos, '()' o un operador final fallan
+  aquí;
+- después de un operando (id, num o ')') se espera un operador o un cierre:
+  dos operandos seguidos fallan aquí;
+- un ')' necesita un paréntesis abierto y el '$' ninguno.
+
+Así que el primer error de cada expresión se encuentra sin el bucle del
+parser: una tabla de pares (token anterior, token actual) -> válido / error /
+"depende de la profundidad", la profundidad con una suma acumulada y el
+primer índice problemático de cada expresión con searchsorted. Los pasos
+también salen de la tabla de pares: cada par tiene el costo en pasos que le
+habría llevado al bucle LL(1) (ver precedence.py), así que el resultado
+(veredicto, índice y tope de pila del error, y pasos) es exactamente el de
+Parser.
+
+Las expresiones se pasan todas juntas en un arreglo plano de ids de
+terminal (los de CompiledTable) con el largo de cada una; pack() lo arma a
+partir de listas de Token o de TokenBuffer. Sólo van al Parser las
+expresiones que no se pueden decidir así: todas si la gramática no tiene
+forma de precedencia de operadores (PrecedenceEngine lanza ValueError) y las
+que en el arreglo plano no terminan con '$'.
+
+NumPy es una dependencia opcional: sólo se importa al validar.
+
+Uso:
+    prefilter = BatchPrefilter(Parser(tabla, START_SYMBOL, trace=TRACE_NONE))
+    resultados = prefilter.validate(lista_de_tokens_o_buffers)   # ParseResult
+"""
+
+from main import ParseResult, Token
+from precedence import PrecedenceEngine
+
+# Clases de par (token anterior, token actual)
+_OK = 0
+_ERROR = 1
+_CLOSE = 2      # ')' o '$' después de un operando: depende de la profundidad
+
+
+class BatchPrefilter:
+    """Decide muchas expresiones a la vez con operaciones de arreglo."""
+
+    def __init__(self, parser):
+        if parser.max_errors > 1:
+            raise ValueError("BatchPrefilter reproduce el Parser sin recuperación de errores (max_errors=1)")
+        self.parser = parser
+        ct = parser.compiled
+        self.compiled = ct
+        self.decided = 0        # Expresiones resueltas con NumPy
+        self.forwarded = 0      # Expresiones enviadas al Parser
+        try:
+            engine = PrecedenceEngine(ct)
+        except ValueError:
+            engine = None
+        self.engine = engine
+        self._tables = None
+
+    def _pair_tables(self):
+        """Tablas (rule, cost, top) de (anterior, actual), como arreglos NumPy.
+
+        La fila 'width' es el inicio de la expresión (se comporta como '(').
+        """
+        if self._tables is not None:
+            return self._tables
+        import numpy as np
+
+        engine = self.engine
+        ct = self.compiled
+        width = ct.width
+        k = engine.k
+        rule = np.full((width + 1, width), _ERROR, dtype=np.int8)
+        cost = np.zeros((width + 1, width), dtype=np.int64)
+        top = np.zeros((width + 1, width), dtype=np.int64)
+
+        for prev in range(width + 1):
+            if prev == width or prev == engine.open:
+                level = 0
+            elif engine.after_level[prev] >= 0:
+                level = engine.after_level[prev] + 1
+            elif engine.is_atom[prev] or prev == engine.close:
+                level = None        # Después de un operando
+            else:
+                continue            # No puede preceder a otro token sin error
+            for kind in range(width):
+                if level is not None:
+                    if engine.is_atom[kind] or kind == engine.open:
+                        rule[prev, kind] = _OK
+                        cost[prev, kind] = k - level + 2
+                    else:
+                        cost[prev, kind] = 1
+                        top[prev, kind] = engine.level_ids[level]
+                    continue
+                action = engine.after_level[kind]
+                cost[prev, kind] = engine.after_steps[kind]
+                if action >= 0:
+                    rule[prev, kind] = _OK
+                elif action == -1:      # Todos los niveles derivan lambda (ver precedence.py)
+                    rule[prev, kind] = _CLOSE
+                else:
+                    top[prev, kind] = engine.after_top[kind]
+        self._tables = rule, cost, top
+        return self._tables
+
+    def pack(self, sequences):
+        """Arreglo plano de ids de terminal (uint8) y largos de una lista de
+        secuencias de Token o TokenBuffer; a las que no terminan en '$' se les
+        agrega (como el fin de entrada que el Parser agregaría)."""
+        import numpy as np
+
+        ct = self.compiled
+        terminal_ids = ct.terminal_ids
+        unknown = ct.unknown
+        end = bytes([ct.end])
+        parts = []
+        lengths = []
+        for tokens in sequences:
+            if hasattr(tokens, 'kind_names'):
+                codes = [terminal_ids.get(name, unknown) for name in tokens.kind_names]
+                data = tokens.kinds.tobytes()
+                if codes != list(range(len(codes))):
+                    data = data.translate(bytes(codes + [0] * (256 - len(codes))))
+            else:
+                data = bytes([terminal_ids.get(token.type, unknown) for token in tokens])
+            if not data or data[-1:] != end:
+                data += end
+            parts.append(data)
+            lengths.append(len(data))
+        return np.frombuffer(b''.join(parts), dtype=np.uint8), np.array(lengths, dtype=np.int64)
+
+    def check(self, kinds, lengths):
+        """Resultado de cada expresión de un arreglo plano de ids de terminal.
+
+        kinds: ids de terminal de todas las expresiones seguidas (los ids
+        fuera de la tabla cuentan como tipo desconocido); lengths: largo de
+        cada expresión. Devuelve arreglos por expresión
+        (decided, accepted, error_index, top_of_stack, steps); las que no
+        están 'decided' (sin '$', o gramática sin forma de operadores) hay
+        que analizarlas con el Parser.
+        """
+        import numpy as np
+
+        lengths = np.asarray(lengths, dtype=np.int64)
+        m = len(lengths)
+        decided = np.zeros(m, dtype=bool)
+        accepted = np.zeros(m, dtype=bool)
+        error_index = np.full(m, -1, dtype=np.int64)
+        top_of_stack = np.full(m, -1, dtype=np.int64)
+        steps = np.zeros(m, dtype=np.int64)
+        if self.engine is None or m == 0 or not lengths.sum():
+            return decided, accepted, error_index, top_of_stack, steps
+
+        ct = self.compiled
+        engine = self.engine
+        rule_table, cost_table, top_table = self._pair_tables()
+        kinds = np.minimum(np.asarray(kinds, dtype=np.int64), ct.unknown)
+        kinds[kinds < 0] = ct.unknown
+        n = len(kinds)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        nonempty = lengths > 0
+
+        # Token anterior (o el inicio de la expresión) y clase de cada par
+        prev = np.empty(n, dtype=np.int64)
+        prev[1:] = kinds[:-1]
+        prev[starts[nonempty]] = ct.width
+        rule = rule_table[prev, kinds]
+        cost = cost_table[prev, kinds]
+        top = top_table[prev, kinds]
+
+        # Profundidad antes de cada token, relativa al inicio de su expresión
+        delta = (kinds == engine.open).astype(np.int64) - (kinds == engine.close)
+        depth = np.cumsum(delta) - delta
+        depth -= np.repeat(depth[np.minimum(starts, n - 1)], lengths)
+
+        closing = rule == _CLOSE
+        expected_close = np.where(depth > 0, engine.close, engine.end)
+        error = (rule == _ERROR) | (closing & (kinds != expected_close))
+        top = np.where(closing, expected_close, top)
+
+        # Primer token que termina el análisis (un error o el '$') en cada expresión
+        stops = np.flatnonzero(error | (kinds == engine.end))
+        at = np.searchsorted(stops, starts)
+        stop = np.where(at < len(stops), stops[np.minimum(at, len(stops) - 1)], n)
+        decided = nonempty & (stop < starts + lengths)
+
+        rows = np.flatnonzero(decided)
+        stop = stop[rows]
+        cumulative = np.cumsum(cost)
+        before = np.where(starts[rows] > 0, cumulative[starts[rows] - 1], 0)
+        steps[rows] = cumulative[stop] - before
+        failed = error[stop]
+        accepted[rows] = ~failed
+        error_index[rows] = np.where(failed, stop - starts[rows], -1)
+        top_of_stack[rows] = np.where(failed, top[stop], -1)
+        return decided, accepted, error_index, top_of_stack, steps
+
+    def validate(self, sequences):
+        """ParseResult de cada secuencia (listas de Token o TokenBuffer), igual
+        al de Parser.parse_tokens sin traza."""
+        sequences = [tokens if hasattr(tokens, 'kind_names') or isinstance(tokens, (list, tuple))
+                     else list(tokens) for tokens in sequences]
+        kinds, lengths = self.pack(sequences)
+        decided, accepted, error_index, top_of_stack, steps = self.check(kinds, lengths)
+
+        parser = self.parser
+        eof = Token('$', '$', -1, -1)
+        results = []
+        for i, tokens in enumerate(sequences):
+            if not decided[i]:
+                self.forwarded += 1
+                results.append(parser.parse_tokens(tokens))
+                continue
+            self.decided += 1
+            if accepted[i]:
+                results.append(ParseResult(True, None, None, None, None, int(steps[i])))
+                continue
+            index = int(error_index[i])
+            token = tokens[index] if index < len(tokens) else eof
+            message = parser._error_message(int(top_of_stack[i]), token)
+            results.append(ParseResult(False, message, token, token.line, token.column, int(steps[i])))
+        return results
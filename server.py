@@ -0,0 +1,343 @@
+"""Servicio de validación de larga duración (asyncio).
+
+Mantiene la tabla LL(1) y el Parser cargados en memoria y atiende
+solicitudes por un socket Unix o un puerto TCP local, así cada validación no
+paga el arranque del intérprete ni la construcción de la tabla.
+
+Uso:
+    python server.py --unix /tmp/ll1.sock
+    python server.py --port 7878 [--host 127.0.0.1]
+                     [--workers 2] [--max-concurrency 64] [--batch-threshold 64]
+                     [--max-errors 1] [--lexer dfa] [--memo 4096]
+                     [--text-threshold 65536] [--root DIR]
+
+Protocolo: JSON por líneas (una solicitud por línea, UTF-8). Cada solicitud
+puede llevar un 'id' que se devuelve tal cual en su respuesta.
+
+    {"id": 1, "text": "a + b * 2"}
+    -> {"id": 1, "ok": true, "accepted": true, "error": null, "line": null, "column": null, "steps": 19}
+
+    {"id": 2, "texts": ["a +", "(b)"]}
+    -> {"id": 2, "ok": true, "results": [{"accepted": false, ...}, {"accepted": true, ...}]}
+
+    {"id": 3, "path": "prueba.java"}
+    -> {"id": 3, "ok": true, "file": "prueba.java", "accepted": ..., ...}
+    (sólo con --root DIR: la ruta es relativa a DIR y no puede salir de él)
+
+    {"id": 4, "op": "ping"}
+    -> {"id": 4, "ok": true}
+
+    {"id": 5, "op": "stats"}
+    -> {"id": 5, "ok": true, "requests": 120, "memo": {"hits": 97, "misses": 23, ...}}
+
+Una solicitud inválida recibe {"id": ..., "ok": false, "message": "..."}.
+Con --max-errors N > 1 los veredictos incluyen 'errors' (ver batch.py).
+
+- Pipelining: el cliente puede enviar varias solicitudes sin esperar las
+  respuestas; se procesan en paralelo y las respuestas salen en el mismo
+  orden en que llegaron las solicitudes.
+- Concurrencia acotada: como máximo --max-concurrency solicitudes en curso
+  (entre todas las conexiones); al llegar al límite se deja de leer del
+  socket hasta que alguna termine.
+- Las validaciones chicas se resuelven en el propio bucle de eventos (no
+  hay latencia de IPC). Los lotes de --batch-threshold expresiones o más se
+  reparten en bloques entre los procesos del pool (--workers; 0 = sin pool).
+  Un 'text' de --text-threshold caracteres o más y todo 'path' (que además
+  lee el archivo) se validan fuera del bucle, en el pool o, sin pool, en un
+  hilo aparte con su propio parser: una solicitud grande no frena a las
+  demás conexiones.
+- Cada respuesta se escribe y se espera el drenado del socket: un cliente
+  que envía solicitudes sin leer las respuestas queda frenado por la
+  contrapresión en lugar de acumularlas en la memoria del servidor.
+- Con --memo N cada proceso memoriza los resultados de las últimas N formas
+  de expresión (secuencias de tipos de token, ver shape_memo.py); 'stats'
+  informa los aciertos del bucle del servidor (no los del pool ni los del
+  hilo aparte).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+
+import batch
+from main import START_SYMBOL
+
+# Largo máximo de una línea del protocolo
+MAX_LINE = 16 * 1024 * 1024
+# Caracteres a partir de los cuales un 'text' se valida fuera del bucle de eventos
+DEFAULT_TEXT_THRESHOLD = 64 * 1024
+
+
+class ValidationServer:
+    """Servidor asyncio de validación de expresiones."""
+
+    def __init__(self, parsing_table, follow_sets=None, start_symbol=START_SYMBOL, workers=None,
+                 max_concurrency=64, batch_threshold=64, chunksize=256, max_errors=1, lexer='regex', memo=0,
+                 text_threshold=DEFAULT_TEXT_THRESHOLD, root=None):
+        self.parsing_table = parsing_table
+        self.follow_sets = follow_sets
+        self.start_symbol = start_symbol
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_concurrency = max_concurrency
+        self.batch_threshold = batch_threshold
+        self.chunksize = chunksize
+        self.max_errors = max_errors
+        self.lexer = lexer
+        self.memo = memo
+        self.text_threshold = text_threshold
+        # Directorio de las solicitudes 'path' (None: desactivadas)
+        self.root = os.path.realpath(root) if root is not None else None
+        self.executor = None
+        self.thread_executor = None     # Sin pool: hilo para las solicitudes grandes
+        self.server = None
+        self.unix_path = None
+        self.semaphore = None
+        self.requests = 0
+
+        # Parser del propio proceso para las solicitudes que no van al pool
+        batch._init_worker(parsing_table, start_symbol, follow_sets, max_errors, lexer, memo)
+
+    async def start(self, host='127.0.0.1', port=None, unix_path=None):
+        """Abre el pool (si corresponde) y empieza a escuchar."""
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        initargs = (self.parsing_table, self.start_symbol, self.follow_sets, self.max_errors, self.lexer,
+                    self.memo)
+        if self.workers > 0:
+            # Import diferido: sin --workers no se paga el costo del pool
+            from concurrent.futures import ProcessPoolExecutor
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=batch._init_worker, initargs=initargs)
+        else:
+            # Un solo hilo, con su propio parser (batch._worker es local al hilo)
+            from concurrent.futures import ThreadPoolExecutor
+            self.thread_executor = ThreadPoolExecutor(
+                max_workers=1, initializer=batch._init_worker, initargs=initargs)
+
+        if unix_path is not None:
+            # Un socket viejo de una ejecución anterior impediría el bind
+            try:
+                if stat.S_ISSOCK(os.stat(unix_path).st_mode):
+                    os.unlink(unix_path)
+            except FileNotFoundError:
+                pass
+            self.server = await asyncio.start_unix_server(self.handle_connection, unix_path, limit=MAX_LINE)
+            self.unix_path = unix_path
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+            for sock in self.server.sockets:
+                if sock.family in (socket.AF_INET, socket.AF_INET6):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return self.server
+
+    async def close(self):
+        """Deja de aceptar conexiones y libera el pool y el socket."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+        if self.thread_executor is not None:
+            self.thread_executor.shutdown(cancel_futures=True)
+        if self.unix_path is not None:
+            try:
+                os.unlink(self.unix_path)
+            except FileNotFoundError:
+                pass
+
+    async def handle_connection(self, reader, writer):
+        """Atiende una conexión: lee solicitudes y responde en orden."""
+        pending = asyncio.Queue()
+        responder = asyncio.create_task(self._respond(pending, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # La línea supera MAX_LINE: no se puede seguir el protocolo
+                    await pending.put(_done({'id': None, 'ok': False,
+                                             'message': f"Línea demasiado larga (máximo {MAX_LINE} bytes)"}))
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Al alcanzar el límite se deja de leer (contrapresión hacia el cliente)
+                await self.semaphore.acquire()
+                await pending.put(asyncio.create_task(self._handle_line(line)))
+        finally:
+            await pending.put(None)
+            await responder
+
+    async def _respond(self, pending, writer):
+        """Escribe las respuestas en el orden de las solicitudes."""
+        connected = True
+        while True:
+            task = await pending.get()
+            if task is None:
+                break
+            # Se espera cada tarea aunque el cliente se haya ido: así todas
+            # liberan su lugar en el semáforo
+            response = await task
+            if not connected:
+                continue
+            writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            # drain sólo espera si el buffer de escritura pasó su límite (el
+            # cliente no lee): las respuestas no se acumulan sin tope
+            try:
+                await writer.drain()
+            except ConnectionError:
+                connected = False
+        writer.close()
+
+    async def _handle_line(self, line):
+        """Procesa una solicitud y devuelve el dict de respuesta."""
+        try:
+            self.requests += 1
+            try:
+                request = json.loads(line)
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                return {'id': None, 'ok': False, 'message': f"JSON inválido: {e}"}
+            if not isinstance(request, dict):
+                return {'id': None, 'ok': False, 'message': "La solicitud debe ser un objeto JSON"}
+            request_id = request.get('id')
+            try:
+                response = await self._dispatch(request)
+            except (TypeError, ValueError) as e:
+                return {'id': request_id, 'ok': False, 'message': str(e)}
+            return {'id': request_id, 'ok': True, **response}
+        finally:
+            self.semaphore.release()
+
+    async def _dispatch(self, request):
+        op = request.get('op', 'validate')
+        if op == 'ping':
+            return {}
+        if op == 'stats':
+            stats = {'requests': self.requests}
+            if self.memo > 0:
+                stats['memo'] = batch._worker.parser.info()
+            return stats
+        if 'text' in request:
+            text = _text(request['text'])
+            if len(text) >= self.text_threshold:
+                return (await self._offload(batch.validate_texts, [text]))[0]
+            return batch.validate_texts([text])[0]
+        if 'texts' in request:
+            texts = request['texts']
+            if not isinstance(texts, list):
+                raise TypeError("'texts' debe ser una lista de cadenas")
+            return {'results': await self.validate_many([_text(text) for text in texts])}
+        if 'path' in request:
+            path = _text(request['path'])
+            verdict = await self._offload(batch.validate_file, self._resolve(path))
+            return {**verdict, 'file': path}
+        raise ValueError("Solicitud sin 'text', 'texts', 'path' ni 'op' conocido")
+
+    def _offload(self, func, *args):
+        """Ejecuta func(*args) fuera del bucle de eventos (pool o hilo aparte)."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.executor or self.thread_executor, func, *args)
+
+    def _resolve(self, path):
+        """Ruta de una solicitud 'path' dentro de self.root (ValueError si sale de él)."""
+        if self.root is None:
+            raise ValueError("Las solicitudes 'path' están desactivadas (ver --root)")
+        full = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath([self.root, full]) != self.root:
+            raise ValueError(f"Ruta fuera del directorio permitido: {path}")
+        return full
+
+    async def validate_many(self, texts):
+        """Valida un lote: en el bucle si es chico, repartido en el pool si no."""
+        if self.executor is None or len(texts) < self.batch_threshold:
+            return batch.validate_texts(texts)
+        loop = asyncio.get_running_loop()
+        # Bloques para repartir un lote grande entre todos los procesos
+        size = max(1, min(self.chunksize, -(-len(texts) // self.workers)))
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        parts = await asyncio.gather(*(loop.run_in_executor(self.executor, batch.validate_texts, chunk)
+                                       for chunk in chunks))
+        return [verdict for part in parts for verdict in part]
+
+
+def _text(value):
+    if not isinstance(value, str):
+        raise TypeError("Se esperaba una cadena")
+    return value
+
+
+def _done(response):
+    """Futuro ya resuelto con 'response' (para encolarlo junto a las tareas)."""
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(response)
+    return future
+
+
+async def serve(args):
+    from table_cache import load_parser_components
+    _, _, follow_sets, parsing_table = load_parser_components()
+    server = ValidationServer(parsing_table, follow_sets, START_SYMBOL, args.workers,
+                              args.max_concurrency, args.batch_threshold, args.chunksize, args.max_errors,
+                              args.lexer, args.memo, args.text_threshold, args.root)
+    await server.start(args.host, args.port, args.unix)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass     # Windows: se termina con Ctrl+C (KeyboardInterrupt)
+
+    where = args.unix if args.unix else f"{args.host}:{args.port}"
+    print(f"Escuchando en {where} (procesos del pool: {server.workers})", file=sys.stderr)
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        print(f"Servidor detenido ({server.requests} solicitudes atendidas).", file=sys.stderr)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Servicio de validación de expresiones (JSON por líneas).")
+    where = arg_parser.add_mutually_exclusive_group(required=True)
+    where.add_argument('--unix', metavar='RUTA', help="escuchar en un socket Unix")
+    where.add_argument('--port', type=int, help="escuchar en un puerto TCP")
+    arg_parser.add_argument('--host', default='127.0.0.1', help="dirección TCP (por defecto 127.0.0.1)")
+    arg_parser.add_argument('-j', '--workers', type=int, default=None,
+                            help="procesos del pool para lotes (por defecto, uno por CPU; 0 = sin pool)")
+    arg_parser.add_argument('--max-concurrency', type=int, default=64,
+                            help="solicitudes en curso como máximo (por defecto 64)")
+    arg_parser.add_argument('--batch-threshold', type=int, default=64,
+                            help="expresiones a partir de las cuales un lote va al pool (por defecto 64)")
+    arg_parser.add_argument('--chunksize', type=int, default=256,
+                            help="expresiones por bloque enviado a cada proceso (por defecto 256)")
+    arg_parser.add_argument('--max-errors', type=int, default=1,
+                            help="con N > 1, recuperarse de los errores y reportar hasta N por veredicto")
+    arg_parser.add_argument('--lexer', choices=['regex', 'dfa'], default='regex',
+                            help="tokenizador: expresión regular (por defecto) o DFA generado")
+    arg_parser.add_argument('--memo', type=int, default=0, metavar='N',
+                            help="memorizar los resultados de N formas de expresión por proceso (0 = no)")
+    arg_parser.add_argument('--text-threshold', type=int, default=DEFAULT_TEXT_THRESHOLD,
+                            help="caracteres a partir de los cuales un 'text' se valida fuera del bucle "
+                                 f"(por defecto {DEFAULT_TEXT_THRESHOLD})")
+    arg_parser.add_argument('--root', metavar='DIR', default=None,
+                            help="habilitar las solicitudes 'path', con rutas dentro de DIR (por defecto, desactivadas)")
+    args = arg_parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
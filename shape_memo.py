@@ -0,0 +1,166 @@
+"""Memoización de veredictos por forma de la expresión (secuencia de tipos de token).
+
+El Parser decide sólo en función de los tipos de token: 'a + b * c' y
+'x + y * z' tienen la misma forma (id + id * id) y por lo tanto el mismo
+veredicto, los mismos pasos y el error (si lo hay) en la misma posición de
+la secuencia. MemoizedParser calcula esa firma después de tokenizar y la
+busca en una caché LRU acotada; si la encuentra no ejecuta el bucle del
+parser: toma el resultado guardado y ubica el error (token, línea y
+columna) sobre los tokens reales de la entrada.
+
+Cada entrada guarda la aceptación, los pasos y, por error, el índice del
+token en la secuencia, el mensaje (depende sólo de los tipos) y los
+terminales esperados (modo recuperación).
+
+Las entradas de más de max_tokens tokens no se memorizan (es poco probable
+que se repitan y su firma ocupa memoria).
+
+Uso:
+    memo = MemoizedParser(Parser(tabla, START_SYMBOL, trace=TRACE_NONE), maxsize=4096)
+    resultado = memo.parse_tokens(Lexer(texto).get_tokens())
+    print(memo.info())
+"""
+
+from collections import OrderedDict
+
+from main import COMMENT_PREFIXES, TRACE_ERRORS, TRACE_SUMMARY, ParseError, ParseResult, Token, iter_records
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_MAX_TOKENS = 4096
+
+_EOF = Token('$', '$', -1, -1)
+
+
+class MemoizedParser:
+    """Envuelve un Parser con una caché LRU de resultados por firma de tipos de token.
+
+    La traza del parser envuelto (si tiene) sólo se imprime en los fallos de
+    la caché: conviene usarlo con TRACE_NONE. parse, parse_tokens y
+    parse_records pasan por la caché; los demás atributos y métodos
+    (lexer_class, max_errors, ...) son los del parser.
+    """
+
+    def __init__(self, parser, maxsize=DEFAULT_MAXSIZE, max_tokens=DEFAULT_MAX_TOKENS):
+        self.parser = parser
+        self.maxsize = maxsize
+        self.max_tokens = max_tokens
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.skipped = 0        # Entradas demasiado largas para memorizar
+
+    def __getattr__(self, name):
+        return getattr(self.parser, name)
+
+    def parse_tokens(self, tokens):
+        """Como Parser.parse_tokens (acepta también un TokenBuffer)."""
+        if hasattr(tokens, 'kind_names'):
+            key = (tuple(tokens.kind_names), tokens.kinds.tobytes())
+        else:
+            if not isinstance(tokens, (list, tuple)):
+                tokens = list(tokens)
+            key = tuple([token.type for token in tokens])
+        if len(tokens) > self.max_tokens:
+            self.skipped += 1
+            return self.parser.parse_tokens(tokens)
+
+        cache = self.cache
+        entry = cache.get(key)
+        if entry is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return self._replay(entry, tokens)
+
+        self.misses += 1
+        result = self.parser.parse_tokens(tokens)
+        cache[key] = self._entry(result, tokens)
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def parse(self, file_path):
+        """Como Parser.parse (sin arena, stats ni grabación), pasando los tokens por la caché."""
+        parser = self.parser
+        if parser.trace >= TRACE_SUMMARY:
+            parser.output(f"\n--- Analizando archivo: {file_path} ---")
+        try:
+            f = open(file_path, 'r')
+        except FileNotFoundError:
+            message = f"Error: El archivo '{file_path}' no fue encontrado."
+            if parser.trace >= TRACE_ERRORS:
+                parser.output(message)
+            return ParseResult(False, message, None, None, None, 0)
+        with f:
+            return self.parse_tokens(parser.lexer_class(f).get_tokens())
+
+    def parse_records(self, stream, separator='\n', comment_prefixes=COMMENT_PREFIXES):
+        """Como Parser.parse_records, pero pasando cada registro por la caché."""
+        lexer_class = self.parser.lexer_class
+        for record in iter_records(stream, separator, comment_prefixes):
+            lexer = lexer_class(record.text, record.line, record.column)
+            yield record, self.parse_tokens(lexer.get_tokens())
+
+    def _entry(self, result, tokens):
+        """Entrada de la caché: (aceptada, pasos, errores, modo_recuperación)."""
+        recovering = result.errors is not None
+        if result.accepted:
+            errors = ()
+        elif recovering:
+            errors = tuple((_index_of(tokens, e.token), e.message, e.expected) for e in result.errors)
+        else:
+            errors = ((_index_of(tokens, result.token), result.error, None),)
+        return result.accepted, result.steps, errors, recovering
+
+    def _replay(self, entry, tokens):
+        """ParseResult de una entrada de la caché, con los tokens de esta entrada."""
+        accepted, steps, errors, recovering = entry
+        if accepted:
+            return ParseResult(True, None, None, None, None, steps, None, [] if recovering else None)
+        n = len(tokens)
+        located = []
+        for index, message, expected in errors:
+            token = tokens[index] if index < n else _EOF
+            located.append(ParseError(message, token, token.line, token.column, expected))
+        first = located[0]
+        return ParseResult(False, first.message, first.token, first.line, first.column, steps, None,
+                           located if recovering else None)
+
+    def clear(self):
+        self.cache.clear()
+
+    def info(self):
+        """Estadísticas de la caché."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'skipped': self.skipped,
+            'size': len(self.cache),
+            'maxsize': self.maxsize,
+        }
+
+
+def _index_of(tokens, token):
+    """Posición de 'token' en la secuencia (len(tokens) si es el fin de entrada sintético)."""
+    if hasattr(tokens, 'kind_names'):
+        # TokenBuffer: el token es una copia; se ubica por (línea, columna, tipo)
+        lines, columns, kinds = tokens.lines, tokens.columns, tokens.kinds
+        code = tokens.kind_names.index(token.type) if token.type in tokens.kind_names else -1
+        try:
+            i = lines.index(token.line)
+        except ValueError:
+            return len(tokens)
+        n = len(tokens)
+        while i < n and lines[i] == token.line:
+            if columns[i] == token.column and kinds[i] == code:
+                return i
+            i += 1
+        return len(tokens)
+    try:
+        return tokens.index(token)
+    except ValueError:
+        return len(tokens)
@@ -0,0 +1,278 @@
+"""Grabación binaria compacta de los pasos del Parser.
+
+La traza paso a paso (TRACE_FULL, o el panel de la GUI) es texto formateado
+en cada paso: cuesta más que el análisis y no se puede guardar, buscar ni
+reproducir. StepTrace graba en cambio, por paso, cuatro enteros en columnas
+de 'array':
+
+    kinds[i]        acción: ACTION_EXPAND, ACTION_MATCH, ACTION_ACCEPT o ACTION_ERROR
+    productions[i]  producción aplicada (-1 si no es una expansión)
+    tokens[i]       índice del token actual
+    deltas[i]       cambio de la profundidad de la pila (len(rhs) - 1, -1 o 0)
+
+y la pila de cualquier paso se reconstruye sólo cuando se pide, reaplicando
+las producciones desde el inicio (con puntos de control cada
+CHECKPOINT_INTERVAL pasos, así que ir a un paso cualquiera no recorre toda
+la grabación).
+
+Parser._run_recorded escribe las columnas directamente; los bucles que no
+lo hacen (gui.GUIParser, que además alimenta la ventana de reproducción)
+usan record().
+
+Con capacity > 0 funciona como un buffer circular: se guardan sólo los
+últimos 'capacity' pasos (a lo sumo 2 * capacity en memoria). Los pasos que
+se descartan se aplican a la pila base, así que los que quedan se siguen
+pudiendo reconstruir.
+
+Uso:
+    recorder = StepTrace()
+    result = parser.parse_tokens(tokens, recorder=recorder)
+    recorder.stack_at(recorder.error_step())     # pila al fallar
+    recorder.save('traza.bin')
+    recorder = StepTrace.load('traza.bin', parser.compiled)
+
+    python step_trace.py archivo.java [-o traza.bin] [--capacity N] [--step N]
+"""
+
+import argparse
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+# Acciones de un paso
+ACTION_EXPAND = 0       # No-terminal en el tope: se reemplaza por el lado derecho
+ACTION_MATCH = 1        # Terminal en el tope igual al token: pop y avance
+ACTION_ACCEPT = 2       # '$' en el tope y en la entrada
+ACTION_ERROR = 3        # Celda vacía o terminal distinto: el análisis termina
+ACTION_NAMES = ('expandir', 'coincidir', 'aceptar', 'error')
+
+# Pasos entre puntos de control de la pila (reconstrucción bajo demanda)
+CHECKPOINT_INTERVAL = 4096
+
+# Formato del archivo: encabezado, pila base (ids) y las cuatro columnas
+_MAGIC = b'LL1T'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHBxqqqq')   # magia, versión, orden de bytes, capacidad, primero, largo pila, pasos
+_TYPECODES = ('B', 'i', 'q', 'h')        # kinds, productions, tokens, deltas
+
+Step = namedtuple('Step', ['index', 'kind', 'production', 'token', 'delta'])
+
+
+class StepTrace:
+    """Pasos de un análisis en columnas de 'array' (buffer circular con capacity > 0)."""
+
+    def __init__(self, capacity=0):
+        if capacity < 0:
+            raise ValueError("capacity debe ser >= 0")
+        self.capacity = capacity
+        self.compiled = None
+        self.kinds = array('B')
+        self.productions = array('i')
+        self.tokens = array('q')
+        self.deltas = array('h')
+        self.first = 0              # Índice del primer paso guardado
+        self.base_stack = []        # Pila antes del paso 'first' (ids, tope al final)
+        self._checkpoints = {}      # paso -> pila (tupla), se llenan al reconstruir
+
+    def begin(self, compiled):
+        """Vacía la grabación para un análisis nuevo con la tabla 'compiled'."""
+        self.compiled = compiled
+        del self.kinds[:], self.productions[:], self.tokens[:], self.deltas[:]
+        self.first = 0
+        self.base_stack = [compiled.end, compiled.start]
+        self._checkpoints = {}
+
+    def trim_at(self):
+        """Cantidad de pasos guardados a partir de la cual hay que llamar a trim."""
+        return 2 * self.capacity if self.capacity else sys.maxsize
+
+    def trim(self):
+        """Descarta los pasos más viejos dejando los últimos 'capacity'."""
+        drop = len(self.kinds) - self.capacity
+        if not self.capacity or drop <= 0:
+            return
+        stack = self._replay(self.base_stack, 0, drop)
+        for column in (self.kinds, self.productions, self.tokens, self.deltas):
+            del column[:drop]
+        self.base_stack = stack
+        self.first += drop
+        self._checkpoints = {}
+
+    def record(self, kind, production, token, delta):
+        """Agrega un paso (para bucles que no escriben las columnas directamente)."""
+        self.kinds.append(kind)
+        self.productions.append(production)
+        self.tokens.append(token)
+        self.deltas.append(delta)
+        if len(self.kinds) >= self.trim_at():
+            self.trim()
+
+    def __len__(self):
+        """Pasos totales del análisis (incluidos los descartados)."""
+        return self.first + len(self.kinds)
+
+    def step(self, n):
+        """Paso n (Step); IndexError si se descartó o no existe."""
+        i = n - self.first
+        if not 0 <= i < len(self.kinds):
+            raise IndexError(f"paso {n} fuera de la grabación ({self.first}..{len(self) - 1})")
+        return Step(n, self.kinds[i], self.productions[i], self.tokens[i], self.deltas[i])
+
+    def error_step(self):
+        """Índice del paso con el error, o None si el análisis no falló."""
+        if self.kinds and self.kinds[-1] == ACTION_ERROR:
+            return len(self) - 1
+        return None
+
+    def depth_at(self, n):
+        """Profundidad de la pila antes del paso n."""
+        self._check_range(n)
+        return len(self.base_stack) + sum(self.deltas[:n - self.first])
+
+    def stack_at(self, n):
+        """Pila (ids, tope al final) antes del paso n; n == len(self) da la final."""
+        self._check_range(n)
+        i = n - self.first
+        mark = i - i % CHECKPOINT_INTERVAL
+        start = mark
+        while start and start not in self._checkpoints:
+            start -= CHECKPOINT_INTERVAL
+        stack = list(self._checkpoints[start]) if start else list(self.base_stack)
+        # Se guardan los puntos de control que se atraviesan
+        while start < mark:
+            stack = self._replay(stack, start, start + CHECKPOINT_INTERVAL)
+            start += CHECKPOINT_INTERVAL
+            self._checkpoints[start] = tuple(stack)
+        return self._replay(stack, mark, i)
+
+    def symbols_at(self, n):
+        """Como stack_at, con los nombres de los símbolos."""
+        symbols = self.compiled.symbols
+        return [symbols[s] for s in self.stack_at(n)]
+
+    def _check_range(self, n):
+        if not self.first <= n <= len(self):
+            raise IndexError(f"paso {n} fuera de la grabación ({self.first}..{len(self)})")
+
+    def _replay(self, stack, start, stop):
+        """Aplica a 'stack' los pasos guardados [start, stop) (índices locales)."""
+        rhs_reversed = self.compiled.rhs_reversed
+        kinds = self.kinds
+        productions = self.productions
+        pop = stack.pop
+        extend = stack.extend
+        for i in range(start, stop):
+            kind = kinds[i]
+            if kind == ACTION_EXPAND:
+                pop()
+                extend(rhs_reversed[productions[i]])
+            elif kind != ACTION_ERROR:
+                pop()
+        return stack
+
+    def describe(self, n, tokens=None):
+        """Texto de un paso: acción, producción y token (si se pasan los tokens)."""
+        ct = self.compiled
+        step = self.step(n)
+        stack = self.stack_at(n)
+        top = ct.symbols[stack[-1]] if stack else '-'
+        if step.kind == ACTION_EXPAND:
+            action = f"expandir {ct.production_str(step.production)}"
+        elif step.kind == ACTION_ERROR:
+            action = f"error con '{top}' en el tope"
+        else:
+            action = f"{ACTION_NAMES[step.kind]} '{top}'"
+        text = f"Paso {n}: {action}"
+        if tokens is not None:
+            token = tokens[step.token] if step.token < len(tokens) else None
+            if token is None:
+                text += " | token: ($, fin de entrada)"
+            else:
+                text += f" | token: ({token.type}, '{token.value}') línea {token.line}, columna {token.column}"
+        return text
+
+    def nbytes(self):
+        """Memoria de las columnas en bytes."""
+        return sum(column.itemsize * len(column)
+                   for column in (self.kinds, self.productions, self.tokens, self.deltas))
+
+    def save(self, path):
+        """Guarda la grabación en un archivo binario."""
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, sys.byteorder == 'little', self.capacity,
+                                 self.first, len(self.base_stack), len(self.kinds)))
+            array('q', self.base_stack).tofile(f)
+            for column in (self.kinds, self.productions, self.tokens, self.deltas):
+                column.tofile(f)
+
+    @classmethod
+    def load(cls, path, compiled):
+        """Lee una grabación de save(); 'compiled' es la tabla con que se grabó."""
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"'{path}' no es una grabación de pasos")
+            magic, version, little, capacity, first, depth, count = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"'{path}' no es una grabación de pasos (versión {_VERSION})")
+            trace = cls(capacity)
+            trace.compiled = compiled
+            trace.first = first
+            columns = [array('q')] + [array(code) for code in _TYPECODES]
+            for column, n in zip(columns, [depth] + [count] * 4):
+                try:
+                    column.fromfile(f, n)
+                except EOFError:
+                    raise ValueError(f"'{path}' está truncado") from None
+                if bool(little) != (sys.byteorder == 'little'):
+                    column.byteswap()
+        stack, trace.kinds, trace.productions, trace.tokens, trace.deltas = columns
+        trace.base_stack = stack.tolist()
+        if any(p >= len(compiled.rhs_reversed) for p in trace.productions):
+            raise ValueError(f"'{path}' se grabó con otra tabla")
+        return trace
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Graba los pasos del análisis de un archivo.")
+    arg_parser.add_argument('path', metavar='ARCHIVO')
+    arg_parser.add_argument('-o', '--output', metavar='RUTA', help="guardar la grabación en RUTA")
+    arg_parser.add_argument('--capacity', type=int, default=0,
+                            help="guardar sólo los últimos N pasos (0 = todos, por defecto)")
+    arg_parser.add_argument('--step', type=int, default=None,
+                            help="mostrar la pila en el paso N (por defecto, el del error)")
+    args = arg_parser.parse_args(argv)
+
+    from main import START_SYMBOL, TRACE_NONE, Parser
+    from table_cache import load_parser_components
+    from token_buffer import TokenBuffer
+
+    _, _, _, parsing_table = load_parser_components()
+    parser = Parser(parsing_table, START_SYMBOL, trace=TRACE_NONE)
+    try:
+        with open(args.path, 'r') as f:
+            tokens = TokenBuffer.from_text(f.read())
+    except OSError as e:
+        print(f"Error: no se pudo leer '{args.path}': {e}", file=sys.stderr)
+        return 2
+    recorder = StepTrace(args.capacity)
+    result = parser.parse_tokens(tokens, recorder=recorder)
+    print(f"{'Aceptada' if result.accepted else 'Rechazada'}: {len(recorder)} pasos, "
+          f"{len(recorder.kinds)} grabados ({recorder.nbytes():,} bytes)")
+    if args.output:
+        recorder.save(args.output)
+
+    step = args.step if args.step is not None else recorder.error_step()
+    if step is not None:
+        try:
+            print(recorder.describe(step, tokens))
+            print(f"Pila: {recorder.symbols_at(step)}")
+        except IndexError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+    return 0 if result else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Caché persistente de los conjuntos FIRST/FOLLOW y de la tabla LL(1).
+
+Calcular FIRST, FOLLOW y la tabla en cada arranque es el costo dominante de
+las invocaciones cortas (main.py, batch.py, la GUI). Aquí esos artefactos se
+guardan en un archivo versionado, identificado por un hash del contenido de
+la gramática, del símbolo inicial, de los terminales y del código de las
+funciones de construcción (compute_first_sets, compute_follow_sets,
+create_parsing_table y make_first_of_sequence: su bytecode, nombres y
+constantes, sin archivo ni números de línea). Si la gramática o esas
+funciones cambian el hash ya no coincide y la tabla se recalcula (y se
+vuelve a guardar).
+
+El archivo usa 'marshal', que se carga sin imports adicionales. La ruta se
+puede cambiar con la variable de entorno LL1_CACHE (una cadena vacía desactiva
+la caché).
+
+La gramática y las funciones de construcción se toman de un módulo de
+definiciones (por defecto 'main', que se importa recién al usarlo). main.py
+se pasa a sí mismo: ejecutado como script es '__main__', y un 'import main'
+lo cargaría por segunda vez con otra copia de GRAMMAR, Parser, etc.
+"""
+
+import marshal
+import os
+import sys
+import types
+
+# Se incrementa cuando cambia el formato del archivo o el algoritmo de construcción
+CACHE_VERSION = 1
+CACHE_ENV_VAR = 'LL1_CACHE'
+# Funciones de construcción cuyo código forma parte de la clave
+BUILD_FUNCTIONS = ('compute_first_sets', 'compute_follow_sets', 'create_parsing_table',
+                   'make_first_of_sequence')
+
+
+def _code_spec(code):
+    """Bytecode, nombres y constantes de 'code' (con las funciones anidadas), sin archivo ni líneas."""
+    consts = []
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            const = _code_spec(const)
+        elif isinstance(const, frozenset):
+            # El orden de un frozenset de cadenas depende de PYTHONHASHSEED
+            const = sorted(map(repr, const))
+        consts.append(const)
+    return code.co_code, code.co_names, code.co_varnames, tuple(consts)
+
+
+def code_fingerprint(definitions):
+    """Representación del código de las funciones BUILD_FUNCTIONS del módulo 'definitions'."""
+    return [(name, _code_spec(getattr(definitions, name).__code__)) for name in BUILD_FUNCTIONS]
+
+
+def grammar_hash(grammar, start_symbol, terminals, definitions=None):
+    """Hash de la gramática (en orden), el símbolo inicial, los terminales y el código de construcción.
+
+    definitions es el módulo con las funciones de construcción (por defecto, main).
+    """
+    import hashlib
+
+    if definitions is None:
+        import main as definitions
+    spec = repr((list(grammar.items()), start_symbol, list(terminals), code_fingerprint(definitions)))
+    return hashlib.sha256(spec.encode('utf-8')).hexdigest()
+
+
+def default_cache_path():
+    """Ruta del archivo de caché (LL1_CACHE, o __pycache__ junto a este módulo)."""
+    path = os.environ.get(CACHE_ENV_VAR)
+    if path is not None:
+        return path or None
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__', 'll1_tables.bin')
+
+
+def _read_cache(path, key):
+    """Devuelve (first_sets, follow_sets, table) si el archivo es válido para 'key'."""
+    try:
+        with open(path, 'rb') as f:
+            data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(data, tuple) or len(data) != 6:
+        return None
+    version, cache_tag, cached_key, first_sets, follow_sets, table = data
+    if version != CACHE_VERSION or cache_tag != sys.implementation.cache_tag or cached_key != key:
+        return None
+    return first_sets, follow_sets, table
+
+
+def _write_cache(path, key, first_sets, follow_sets, table):
+    """Guarda los artefactos de forma atómica. Los errores de escritura se ignoran."""
+    data = (CACHE_VERSION, sys.implementation.cache_tag, key, first_sets, follow_sets, table)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_parser_components(grammar=None, non_terminals=None, terminals=None,
+                           start_symbol=None, cache_path=None, definitions=None):
+    """Devuelve (first_sets, get_first_seq_func, follow_sets, parsing_table) usando la caché.
+
+    Igual que main.build_parser_components, pero lee los artefactos del
+    archivo de caché cuando corresponden a la gramática; si no, los calcula
+    y los guarda. Con cache_path=None se usa default_cache_path().
+
+    definitions es el módulo con GRAMMAR, NON_TERMINALS, TERMINALS,
+    START_SYMBOL y las funciones compute_first_sets, compute_follow_sets,
+    create_parsing_table y make_first_of_sequence (por defecto, main); los
+    argumentos de la gramática que sean None se toman de él.
+    """
+    if definitions is None:
+        import main as definitions
+    if grammar is None:
+        grammar = definitions.GRAMMAR
+    if non_terminals is None:
+        non_terminals = definitions.NON_TERMINALS
+    if terminals is None:
+        terminals = definitions.TERMINALS
+    if start_symbol is None:
+        start_symbol = definitions.START_SYMBOL
+    if cache_path is None:
+        cache_path = default_cache_path()
+    key = grammar_hash(grammar, start_symbol, terminals, definitions)
+
+    cached = _read_cache(cache_path, key) if cache_path else None
+    if cached is not None:
+        first_sets, follow_sets, table = cached
+        get_first_seq_func = definitions.make_first_of_sequence(first_sets, non_terminals, terminals)
+        return first_sets, get_first_seq_func, follow_sets, table
+
+    first_sets, get_first_seq_func = definitions.compute_first_sets(grammar, non_terminals, terminals)
+    follow_sets = definitions.compute_follow_sets(grammar, non_terminals, start_symbol,
+                                                  first_sets, get_first_seq_func)
+    table = definitions.create_parsing_table(grammar, first_sets, follow_sets, get_first_seq_func,
+                                             non_terminals, terminals)
+
+    if cache_path:
+        _write_cache(cache_path, key, first_sets, follow_sets, table)
+    return first_sets, get_first_seq_func, follow_sets, table
@@ -0,0 +1 @@
+"""Verificaciones del analizador (python -m pytest tests, o python -m unittest)."""
@@ -0,0 +1,81 @@
+"""Comparación diferencial de los motores de análisis (LL(1) y precedencia).
+
+Parser.parse_tokens tiene que devolver exactamente el mismo ParseResult
+(veredicto, mensaje, token, línea, columna y pasos) con engine='ll1' y con
+engine='precedence', sobre listas de Token y sobre TokenBuffer. Las entradas
+son:
+
+- oraciones de workload.py, válidas y mutadas (rechazadas), con distintos
+  largos, profundidades de paréntesis y mezclas de operadores;
+- secuencias aleatorias de tipos de token (incluidos tipos desconocidos, un
+  '$' en el medio y secuencias sin '$' final), que ejercitan los errores
+  que las mutaciones no alcanzan.
+
+La variable de entorno ENGINE_DIFF_COUNT cambia la cantidad de entradas
+(por defecto 1000) para una comparación más larga.
+"""
+
+import os
+import random
+import unittest
+
+from main import ENGINE_LL1, ENGINE_PRECEDENCE, START_SYMBOL, TERMINALS, TRACE_NONE, Lexer, Parser, Token
+from table_cache import load_parser_components
+from token_buffer import TokenBuffer
+from workload import make_workload
+
+COUNT = int(os.environ.get('ENGINE_DIFF_COUNT', 1000))
+MAX_LENGTH = 60
+_MAX_REPORTED = 10
+
+
+def random_tokens(rng, max_length):
+    """Secuencia aleatoria de Token (sin lexer), con tipos que la tabla no conoce."""
+    kinds = [t for t in TERMINALS if t != '$'] + ['?', 'desconocido']
+    tokens = [Token(kind, kind, 1, column) for column, kind in
+              enumerate(rng.choice(kinds) for _ in range(rng.randint(0, max_length)))]
+    if tokens and rng.random() < 0.1:
+        tokens.insert(rng.randrange(len(tokens)), Token('$', '$', 1, -2))
+    if rng.random() < 0.9:
+        tokens.append(Token('$', '$', 1, len(tokens)))
+    return tokens
+
+
+def inputs(count, seed, max_length, parsing_table):
+    """Genera (descripción, tokens) para la comparación."""
+    rng = random.Random(seed)
+    for i in range(count):
+        choice = rng.random()
+        if choice < 0.6:
+            mix = {'+': rng.randint(0, 3), '*': rng.randint(0, 3), '%': rng.randint(0, 1),
+                   '-': rng.randint(0, 2), '/': rng.randint(0, 2)}
+            (text, _), = make_workload(1, length=rng.randint(1, max_length), max_depth=rng.randint(0, 6),
+                                       operator_mix=mix, invalid=0.5, tokens_per_line=rng.choice([0, 5]),
+                                       seed=rng.random(), parsing_table=parsing_table)
+            yield repr(text), list(Lexer(text).get_tokens())
+        else:
+            tokens = random_tokens(rng, max_length)
+            yield ' '.join(t.type for t in tokens), tokens
+
+
+class EngineDiffTest(unittest.TestCase):
+
+    def test_precedence_matches_ll1(self):
+        _, _, _, parsing_table = load_parser_components()
+        parser = Parser(parsing_table, START_SYMBOL, trace=TRACE_NONE)
+        mismatches = []
+        for description, tokens in inputs(COUNT, 0, MAX_LENGTH, parsing_table):
+            variants = [('lista', tokens)]
+            if all(t.type in TERMINALS for t in tokens):
+                variants.append(('TokenBuffer', TokenBuffer.from_tokens(tokens)))
+            for name, sequence in variants:
+                expected = parser.parse_tokens(sequence, engine=ENGINE_LL1)
+                actual = parser.parse_tokens(sequence, engine=ENGINE_PRECEDENCE)
+                if actual != expected:
+                    mismatches.append(f"Diferencia ({name}): {description}\n  ll1:        {expected}\n"
+                                      f"  precedence: {actual}")
+        self.assertFalse(mismatches, "\n".join(mismatches[:_MAX_REPORTED]))
+
+
+if __name__ == '__main__':
+    unittest.main()
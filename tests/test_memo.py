@@ -0,0 +1,48 @@
+"""Memoización por forma (shape_memo) en la validación de archivos de batch.py."""
+
+import os
+import tempfile
+import unittest
+
+import batch
+from main import START_SYMBOL
+from table_cache import load_parser_components
+
+
+class MemoizedFilesTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        _, _, _, cls.parsing_table = load_parser_components()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        # Dos formas: 'id + id * id' (válida) y 'id + ) id' (error en el ')')
+        texts = ['a + b * c', 'x + y * z', 'total + i * n', 'a + ) b', '\n  x + ) y']
+        self.paths = []
+        for i, text in enumerate(texts):
+            path = os.path.join(self.directory.name, f"e{i}.java")
+            with open(path, 'w') as f:
+                f.write(text)
+            self.paths.append(path)
+        self.paths.append(os.path.join(self.directory.name, 'no_existe.java'))
+
+    def validate(self, memo):
+        batch._init_worker(self.parsing_table, START_SYMBOL, memo=memo)
+        return [batch.validate_file(path) for path in self.paths]
+
+    def test_hits_grow_across_files(self):
+        expected = self.validate(0)
+        actual = self.validate(16)
+        self.assertEqual(actual, expected)
+        info = batch._worker.parser.info()
+        self.assertEqual((info['misses'], info['hits']), (2, 3))
+
+        # Segunda pasada sobre los mismos archivos: todos aciertan
+        self.assertEqual([batch.validate_file(path) for path in self.paths], expected)
+        self.assertEqual(batch._worker.parser.info()['hits'], 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
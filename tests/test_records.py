@@ -0,0 +1,51 @@
+"""Posiciones de los errores de Parser.parse_records en registros con sangría."""
+
+import io
+import random
+import unittest
+
+from main import START_SYMBOL, TRACE_NONE, Lexer, Parser, iter_records
+from table_cache import load_parser_components
+from workload import make_workload
+
+_INDENTS = ['', ' ', '   ', '\t', '\t  ', '    ']
+
+
+class RecordPositionsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        _, _, _, cls.parsing_table = load_parser_components()
+        cls.parser = Parser(cls.parsing_table, START_SYMBOL, trace=TRACE_NONE)
+
+    def parse_lines(self, lines):
+        return list(self.parser.parse_records(io.StringIO('\n'.join(lines) + '\n')))
+
+    def test_indented_error_columns(self):
+        # (línea, columna y tipo del token del error)
+        cases = [('   a + b )', 9, ')'), ('  * x', 2, '*'), ('\t\t  x + ) y', 8, ')')]
+        results = self.parse_lines([text for text, _, _ in cases])
+        for line_num, ((text, column, kind), (_, result)) in enumerate(zip(cases, results), 1):
+            with self.subTest(text=text):
+                self.assertFalse(result.accepted)
+                self.assertEqual((result.token.type, result.line, result.column), (kind, line_num, column))
+
+    def test_indented_token_columns(self):
+        record, = iter_records(io.StringIO('\t(a\n'))
+        self.assertEqual((record.text, record.line, record.column), ('(a', 1, 1))
+        tokens = list(Lexer(record.text, record.line, record.column).get_tokens())
+        self.assertEqual([(t.type, t.column) for t in tokens[:2]], [('(', 1), ('id', 2)])
+
+    def test_matches_lexer_per_line(self):
+        rng = random.Random(0)
+        lines = [rng.choice(_INDENTS) + text.replace('\n', ' ')
+                 for text, _ in make_workload(200, length=12, max_depth=2, invalid=0.5, seed=0,
+                                              parsing_table=self.parsing_table)]
+        for line_num, (line, (_, actual)) in enumerate(zip(lines, self.parse_lines(lines)), 1):
+            expected = self.parser.parse_tokens(Lexer(line, line_num).get_tokens())
+            self.assertEqual((actual.accepted, actual.error, actual.line, actual.column),
+                             (expected.accepted, expected.error, expected.line, expected.column), line)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Servidor de validación (server.py): solicitudes 'path' y 'text' grandes."""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+import batch
+from server import ValidationServer
+from table_cache import load_parser_components
+
+
+class ValidationServerTest(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        _, _, _, cls.parsing_table = load_parser_components()
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = os.path.join(self.directory.name, 'raiz')
+        os.mkdir(self.root)
+        with open(os.path.join(self.root, 'ok.java'), 'w') as f:
+            f.write('a + b * c')
+        with open(os.path.join(self.directory.name, 'afuera.java'), 'w') as f:
+            f.write('a + b')
+
+    async def start(self, **options):
+        server = ValidationServer(self.parsing_table, workers=0, **options)
+        unix_path = os.path.join(self.directory.name, 'servidor.sock')
+        await server.start(unix_path=unix_path)
+        self.addAsyncCleanup(server.close)
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+        self.addAsyncCleanup(writer.wait_closed)
+        self.addCleanup(writer.close)
+        return reader, writer
+
+    async def request(self, reader, writer, *requests):
+        writer.write(b''.join(json.dumps(r).encode('utf-8') + b'\n' for r in requests))
+        await writer.drain()
+        return [json.loads(await reader.readline()) for _ in requests]
+
+    async def test_path_disabled_without_root(self):
+        connection = await self.start()
+        response, = await self.request(*connection, {'id': 1, 'path': 'ok.java'})
+        self.assertFalse(response['ok'])
+
+    async def test_path_inside_root(self):
+        connection = await self.start(root=self.root)
+        responses = await self.request(*connection, {'id': 1, 'path': 'ok.java'},
+                                       {'id': 2, 'path': '../afuera.java'},
+                                       {'id': 3, 'path': os.path.join(self.directory.name, 'afuera.java')})
+        self.assertEqual([(r['id'], r['ok']) for r in responses], [(1, True), (2, False), (3, False)])
+        self.assertEqual((responses[0]['file'], responses[0]['accepted']), ('ok.java', True))
+
+    async def test_large_text_matches_inline(self):
+        connection = await self.start(text_threshold=100)
+        text = ' + '.join(['(a * b)'] * 50) + ' )'
+        small, large = await self.request(*connection, {'id': 1, 'text': 'a + ) b'}, {'id': 2, 'text': text})
+        self.assertEqual(large, {'id': 2, 'ok': True, **batch.validate_texts([text])[0]})
+        self.assertFalse(small['accepted'])
+
+
+if __name__ == '__main__':
+    unittest.main()
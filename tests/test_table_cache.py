@@ -0,0 +1,48 @@
+"""Clave de la caché de tablas (table_cache.py): gramática y código de construcción."""
+
+import os
+import tempfile
+import types
+import unittest
+
+import main
+from table_cache import BUILD_FUNCTIONS, grammar_hash, load_parser_components
+
+
+def _definitions(**functions):
+    """Copia de las definiciones de main con algunas funciones reemplazadas."""
+    names = ('GRAMMAR', 'NON_TERMINALS', 'TERMINALS', 'START_SYMBOL') + BUILD_FUNCTIONS
+    return types.SimpleNamespace(**{**{name: getattr(main, name) for name in names}, **functions})
+
+
+def create_parsing_table(grammar, first_sets, follow_sets, get_first_seq_func, non_terminals, terminals):
+    # Misma tabla, con la columna '$' vacía en todas las filas
+    table = main.create_parsing_table(grammar, first_sets, follow_sets, get_first_seq_func,
+                                      non_terminals, terminals)
+    for row in table.values():
+        row['$'] = None
+    return table
+
+
+class TableCacheKeyTest(unittest.TestCase):
+
+    def test_key_covers_build_code(self):
+        key = grammar_hash(main.GRAMMAR, main.START_SYMBOL, main.TERMINALS)
+        self.assertEqual(grammar_hash(main.GRAMMAR, main.START_SYMBOL, main.TERMINALS, _definitions()), key)
+        changed = _definitions(create_parsing_table=create_parsing_table)
+        self.assertNotEqual(grammar_hash(main.GRAMMAR, main.START_SYMBOL, main.TERMINALS, changed), key)
+
+    def test_changed_build_code_recomputes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, 'tablas.bin')
+            *_, table = load_parser_components(cache_path=cache_path, definitions=_definitions())
+            *_, cached = load_parser_components(cache_path=cache_path, definitions=_definitions())
+            self.assertEqual(cached, table)
+            changed = _definitions(create_parsing_table=create_parsing_table)
+            *_, rebuilt = load_parser_components(cache_path=cache_path, definitions=changed)
+            self.assertTrue(all(row['$'] is None for row in rebuilt.values()))
+            self.assertNotEqual(rebuilt, table)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Buffer de tokens compacto (estructura de arreglos).
+
+Cada Token es una tupla con nombre más una cadena con su valor: para decenas
+de millones de tokens son gigabytes de objetos chicos. TokenBuffer guarda
+los tokens en columnas paralelas de 'array' y los valores no se copian: se
+toman del texto fuente ('source') sólo cuando se piden.
+
+Columnas por token:
+    kinds[i]            código del tipo (índice en kind_names; por defecto TERMINALS)
+    starts[i], ends[i]  posición del lexema en 'source' (enteros de 32 bits si
+                        el texto entra en ellos, si no de 64)
+    lines[i], columns[i]
+
+Un token sin lexema (start == end, como el '$' final) tiene como valor su tipo.
+
+Compatibilidad con el código que espera Token: buffer[i] y la iteración
+devuelven Token (creados en el momento), así que un TokenBuffer se puede
+pasar donde antes iba una lista de tokens. Parser.parse_tokens lo reconoce
+y, sin traza, árbol, instrumentación ni recuperación de errores, recorre
+directamente la columna de tipos sin crear ningún Token.
+
+El buffer se serializa con pickle como unos pocos bloques de bytes (las
+columnas y el texto), así que es barato enviarlo a otros procesos.
+
+Uso:
+    buffer = TokenBuffer.from_text(texto)
+    resultado = parser.parse_tokens(buffer)
+"""
+
+from array import array
+
+from main import TERMINALS, Token
+
+
+class TokenBuffer:
+    """Tokens en columnas paralelas, con los valores tomados del texto fuente."""
+
+    __slots__ = ('source', 'kind_names', 'kinds', 'starts', 'ends', 'lines', 'columns', '_kind_codes')
+
+    def __init__(self, source='', kind_names=TERMINALS):
+        self.source = source
+        self.kind_names = list(kind_names)
+        self._kind_codes = {name: code for code, name in enumerate(self.kind_names)}
+        offset = 'i' if len(source) < 2 ** 31 else 'q'
+        self.kinds = array('B')
+        self.starts = array(offset)
+        self.ends = array(offset)
+        self.lines = array('i')
+        self.columns = array('i')
+
+    @classmethod
+    def from_text(cls, text, line=1, column=0, kind_names=TERMINALS):
+        """Tokeniza 'text' (con dfa_lexer.DFALexer) directamente en las columnas."""
+        from dfa_lexer import DFALexer
+
+        return DFALexer(text, line, column).fill(cls(text, kind_names))
+
+    @classmethod
+    def from_tokens(cls, tokens, kind_names=TERMINALS):
+        """Copia una secuencia de Token (de cualquier Lexer) a un buffer.
+
+        Como los Token no guardan su posición en el texto original, los
+        valores se concatenan en un 'source' propio.
+        """
+        buffer = cls('', kind_names)
+        # Sin conocer el largo total, las posiciones van en 64 bits
+        buffer.starts = array('q')
+        buffer.ends = array('q')
+        values = []
+        offset = 0
+        for token in tokens:
+            value = '' if token.type == '$' and token.value == '$' else token.value
+            buffer.append(token.type, offset, offset + len(value), token.line, token.column)
+            values.append(value)
+            offset += len(value)
+        buffer.source = ''.join(values)
+        return buffer
+
+    def kind_code(self, kind):
+        """Código del tipo de token (los tipos nuevos se agregan a kind_names)."""
+        code = self._kind_codes.get(kind)
+        if code is None:
+            code = self._kind_codes[kind] = len(self.kind_names)
+            self.kind_names.append(kind)
+        return code
+
+    def append(self, kind, start, end, line, column):
+        """Agrega un token (kind es el tipo, como en Token.type)."""
+        self.kinds.append(self.kind_code(kind))
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def extend(self, spans):
+        """Agrega una lista de spans (tipo, inicio, fin, línea, columna) de una vez."""
+        if not spans:
+            return
+        kinds, starts, ends, lines, columns = zip(*spans)
+        self.kinds.extend(map(self.kind_code, kinds))
+        self.starts.extend(starts)
+        self.ends.extend(ends)
+        self.lines.extend(lines)
+        self.columns.extend(columns)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def value(self, i):
+        """Valor (lexema) del token i, tomado del texto fuente."""
+        start, end = self.starts[i], self.ends[i]
+        if start == end:
+            return self.kind_names[self.kinds[i]]
+        return self.source[start:end]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.kinds)
+        if not 0 <= i < len(self.kinds):
+            raise IndexError("índice de token fuera de rango")
+        return Token(self.kind_names[self.kinds[i]], self.value(i), self.lines[i], self.columns[i])
+
+    def __iter__(self):
+        names = self.kind_names
+        source = self.source
+        for kind, start, end, line, column in zip(self.kinds, self.starts, self.ends, self.lines, self.columns):
+            yield Token(names[kind], source[start:end] if start != end else names[kind], line, column)
+
+    def nbytes(self):
+        """Memoria de las columnas en bytes (sin contar el texto fuente)."""
+        return sum(column.itemsize * len(column)
+                   for column in (self.kinds, self.starts, self.ends, self.lines, self.columns))
@@ -0,0 +1,141 @@
+"""Caché persistente de veredictos para validaciones por lotes (batch.py --cache).
+
+En CI se valida una y otra vez el mismo árbol de archivos y sólo cambian
+unos pocos entre ejecuciones. Aquí se guarda el veredicto de cada archivo en
+una base SQLite, identificado por:
+
+- el hash (SHA-256) del contenido del archivo: un archivo sin cambios no se
+  vuelve a tokenizar ni analizar (da igual su ruta o su fecha);
+- una variante con las opciones que cambian el veredicto (modo --records y
+  su separador, --max-errors).
+
+La base guarda además un hash de GRAMMAR, el símbolo inicial, los terminales
+y TOKEN_SPECS (spec_hash). Si la gramática o el lexer cambian, al abrirla
+se descartan todos los veredictos anteriores.
+
+Desalojo por tamaño: cada veredicto registra su tamaño y la última vez que
+se usó; al cerrar (o en flush), si el total supera max_bytes se borran los
+menos usados recientemente hasta bajar del 90% del límite.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from main import GRAMMAR, START_SYMBOL, TERMINALS, TOKEN_SPECS
+from table_cache import grammar_hash
+
+# Se incrementa cuando cambia el formato de los veredictos guardados
+VERDICT_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_READ_BLOCK = 1 << 20
+
+
+def spec_hash(grammar=GRAMMAR, start_symbol=START_SYMBOL, terminals=TERMINALS, token_specs=TOKEN_SPECS):
+    """Hash de todo lo que define un veredicto: gramática, terminales y especificación del lexer."""
+    spec = repr((VERDICT_CACHE_VERSION, grammar_hash(grammar, start_symbol, terminals), list(token_specs)))
+    return hashlib.sha256(spec.encode('utf-8')).hexdigest()
+
+
+def content_digest(data):
+    """Hash (bytes) del contenido de un archivo."""
+    return hashlib.sha256(data).digest()
+
+
+def file_digest(path):
+    """Hash del contenido del archivo 'path', o None si no se puede leer."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(_READ_BLOCK), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.digest()
+
+
+class VerdictCache:
+    """Veredictos (valores serializables a JSON) por (hash de contenido, variante)."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, spec=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.spec = spec if spec is not None else spec_hash()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._touched = []      # Claves leídas (su 'used' se actualiza en flush)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS verdicts ("
+                            " digest BLOB, variant TEXT, verdict TEXT, size INTEGER, used REAL,"
+                            " PRIMARY KEY (digest, variant))")
+            self.db.execute("CREATE INDEX IF NOT EXISTS verdicts_used ON verdicts (used)")
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'spec'").fetchone()
+            if row is None or row[0] != self.spec:
+                # Gramática o lexer distintos: los veredictos guardados ya no valen
+                self.db.execute("DELETE FROM verdicts")
+                self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('spec', ?)", (self.spec,))
+
+    def get(self, digest, variant):
+        """Veredicto guardado para (digest, variant), o None."""
+        row = self.db.execute("SELECT verdict FROM verdicts WHERE digest = ? AND variant = ?",
+                              (digest, variant)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched.append((digest, variant))
+        return json.loads(row[0])
+
+    def put(self, digest, variant, verdict):
+        """Guarda un veredicto (se confirma en flush o close)."""
+        data = json.dumps(verdict, ensure_ascii=False)
+        self.db.execute("INSERT OR REPLACE INTO verdicts (digest, variant, verdict, size, used)"
+                        " VALUES (?, ?, ?, ?, ?)", (digest, variant, data, len(data) + len(digest), time.time()))
+
+    def flush(self):
+        """Confirma los cambios, marca los veredictos usados y aplica el límite de tamaño."""
+        now = time.time()
+        with self.db:
+            if self._touched:
+                self.db.executemany("UPDATE verdicts SET used = ? WHERE digest = ? AND variant = ?",
+                                    [(now, digest, variant) for digest, variant in self._touched])
+                self._touched = []
+            self._evict()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM verdicts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = total - self.max_bytes * 9 // 10
+        freed = 0
+        victims = []
+        for digest, variant, size in self.db.execute(
+                "SELECT digest, variant, size FROM verdicts ORDER BY used"):
+            victims.append((digest, variant))
+            freed += size
+            if freed >= target:
+                break
+        self.db.executemany("DELETE FROM verdicts WHERE digest = ? AND variant = ?", victims)
+        self.evicted += len(victims)
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
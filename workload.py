@@ -0,0 +1,236 @@
+"""Generador de cargas de trabajo sintéticas a partir de la gramática.
+
+Produce oraciones válidas derivándolas directamente de GRAMMAR (sin
+recursión, con una pila explícita), con control de:
+
+- largo: cantidad aproximada de tokens (la derivación no termina antes de
+  alcanzarlo y, una vez alcanzado, se cierra por el camino más corto);
+- profundidad: anidamiento máximo de producciones que vuelven a contener al
+  símbolo inicial, como F -> ( E );
+- mezcla de operadores: pesos por terminal (por ejemplo {'+': 3, '*': 1}
+  para más sumas que productos). Se usan al elegir entre alternativas y al
+  decidir si una cadena como EP o TP continúa: la probabilidad de continuar
+  es el peso de sus operadores frente al total, así que la proporción de
+  operadores en la salida sigue aproximadamente los pesos.
+
+Y oraciones inválidas mutando oraciones válidas (borrar, insertar,
+reemplazar, intercambiar o duplicar tokens); cada mutación se comprueba con
+el Parser para garantizar que realmente se rechaza.
+
+Uso:
+    python workload.py [--count 100] [--length 40] [--max-depth 4]
+                       [--mix +=3 *=1] [--invalid 0.3] [--seed 0]
+
+Imprime una oración por línea (formato compatible con batch.py --records).
+"""
+
+import argparse
+import random
+
+from main import GRAMMAR, START_SYMBOL, TERMINALS, TRACE_NONE, Lexer, Parser
+
+_IDENTIFIERS = ['x', 'y', 'z', 'i', 'total', 'var1', 'id_b', '_tmp', 'precio', 'n2']
+
+
+def shortest_yields(grammar):
+    """Largo mínimo (en terminales) que puede derivar cada no-terminal."""
+    lengths = {nt: float('inf') for nt in grammar}
+
+    def body_length(body):
+        return sum(lengths.get(s, 1) for s in body if s != 'lambda')
+
+    changed = True
+    while changed:
+        changed = False
+        for nt, productions in grammar.items():
+            best = min(body_length(body) for body in productions)
+            if best < lengths[nt]:
+                lengths[nt] = best
+                changed = True
+    return lengths
+
+
+class SentenceGenerator:
+    """Genera oraciones de la gramática con largo, profundidad y mezcla controlados.
+
+    nesting: probabilidad de elegir una alternativa anidada, como ( E ).
+    """
+
+    def __init__(self, grammar=GRAMMAR, start_symbol=START_SYMBOL, operator_mix=None,
+                 nesting=0.15, seed=None):
+        self.grammar = grammar
+        self.start_symbol = start_symbol
+        self.operator_mix = operator_mix or {}
+        self.nesting = nesting
+        self.rng = random.Random(seed)
+
+        lengths = shortest_yields(grammar)
+        # Por no-terminal: (mínimas, crecientes, anidadas) como listas de cuerpos
+        self.alternatives = {}
+        for nt, productions in grammar.items():
+            minimal, growing, nested = [], [], []
+            for body in productions:
+                size = sum(lengths.get(s, 1) for s in body if s != 'lambda')
+                if size == lengths[nt]:
+                    minimal.append(body)
+                elif start_symbol in body:
+                    nested.append(body)
+                else:
+                    growing.append(body)
+            # Las alternativas crecientes con peso 0 quedan excluidas
+            growing = [b for b in growing if self._weight(b) > 0]
+            self.alternatives[nt] = (minimal, growing, nested)
+
+        # Probabilidad de que cada cadena continúe (en vez de cerrarse)
+        weights = {nt: sum(self._weight(b) for b in alts[1]) for nt, alts in self.alternatives.items()}
+        total = sum(weights.values())
+        self.continue_probability = {nt: w / total if total > w else 0.8 for nt, w in weights.items()}
+
+    def _weight(self, body):
+        """Peso de una alternativa según el primer terminal que contiene."""
+        for symbol in body:
+            if symbol not in self.grammar:
+                return self.operator_mix.get(symbol, 1.0)
+        return 1.0
+
+    def _choose(self, bodies):
+        """Elige una alternativa según los pesos (uniforme si todos son 0)."""
+        weights = [self._weight(b) for b in bodies]
+        if not any(weights):
+            return self.rng.choice(bodies)
+        return self.rng.choices(bodies, weights)[0]
+
+    def _lexeme(self, terminal):
+        rng = self.rng
+        if terminal == 'id':
+            return rng.choice(_IDENTIFIERS)
+        if terminal == 'num':
+            if rng.random() < 0.2:
+                return f"{rng.randint(0, 999)}.{rng.randint(0, 99)}"
+            return str(rng.randint(0, 999))
+        return terminal
+
+    def generate(self, length=40, max_depth=4):
+        """Devuelve la lista de lexemas de una oración válida de ~'length' tokens."""
+        rng = self.rng
+        grammar = self.grammar
+        close = object()            # Marca de fin de una alternativa anidada
+        stack = [self.start_symbol]
+        pending = 1                 # Símbolos (no marcas) en la pila
+        depth = 0
+        out = []
+
+        while stack:
+            symbol = stack.pop()
+            if symbol is close:
+                depth -= 1
+                continue
+            pending -= 1
+            if symbol not in grammar:
+                if symbol != 'lambda':
+                    out.append(self._lexeme(symbol))
+                continue
+
+            minimal, growing, nested = self.alternatives[symbol]
+            if depth >= max_depth:
+                nested = []
+            if len(out) >= length:
+                body = rng.choice(minimal)
+            elif growing and (pending == 0 or rng.random() < self.continue_probability[symbol]):
+                # Si no queda nada más en la pila, cerrar aquí terminaría la oración
+                body = self._choose(growing)
+            elif nested and (pending == 0 or rng.random() < self.nesting):
+                body = rng.choice(nested)
+            else:
+                body = self._choose(minimal)
+
+            if body in nested:
+                depth += 1
+                stack.append(close)
+            symbols = [s for s in body if s != 'lambda']
+            stack.extend(reversed(symbols))
+            pending += len(symbols)
+        return out
+
+    def mutate(self, lexemes):
+        """Aplica una mutación aleatoria a una lista de lexemas y devuelve la nueva lista."""
+        rng = self.rng
+        tokens = list(lexemes)
+        terminal = self._lexeme(rng.choice([t for t in TERMINALS if t != '$']))
+        i = rng.randrange(len(tokens)) if tokens else 0
+        operation = rng.choice(['delete', 'insert', 'replace', 'swap', 'duplicate'])
+        if not tokens or operation == 'insert':
+            tokens.insert(i, terminal)
+        elif operation == 'delete':
+            del tokens[i]
+        elif operation == 'replace':
+            tokens[i] = terminal
+        elif operation == 'swap' and i + 1 < len(tokens):
+            tokens[i], tokens[i + 1] = tokens[i + 1], tokens[i]
+        else:
+            tokens.insert(i, tokens[i])
+        return tokens
+
+
+def to_text(lexemes, tokens_per_line=0):
+    """Une los lexemas con espacios (y saltos de línea cada 'tokens_per_line' tokens)."""
+    if not tokens_per_line:
+        return ' '.join(lexemes)
+    return '\n'.join(' '.join(lexemes[i:i + tokens_per_line])
+                     for i in range(0, len(lexemes), tokens_per_line))
+
+
+def make_workload(count, length=40, max_depth=4, operator_mix=None, invalid=0.0,
+                  tokens_per_line=0, seed=0, parsing_table=None):
+    """Genera 'count' casos (texto, es_válido); una fracción 'invalid' son mutaciones rechazadas."""
+    generator = SentenceGenerator(operator_mix=operator_mix, seed=seed)
+    parser = None
+    if invalid:
+        if parsing_table is None:
+            from table_cache import load_parser_components
+            _, _, _, parsing_table = load_parser_components()
+        parser = Parser(parsing_table, START_SYMBOL, trace=TRACE_NONE)
+
+    cases = []
+    for _ in range(count):
+        lexemes = generator.generate(length, max_depth)
+        if parser is not None and generator.rng.random() < invalid:
+            # Mutar hasta obtener una oración que el parser rechace
+            for _ in range(20):
+                mutated = generator.mutate(lexemes)
+                if not parser.parse_tokens(Lexer(' '.join(mutated)).get_tokens()):
+                    cases.append((to_text(mutated, tokens_per_line), False))
+                    break
+            else:
+                cases.append((to_text(lexemes, tokens_per_line), True))
+        else:
+            cases.append((to_text(lexemes, tokens_per_line), True))
+    return cases
+
+
+def parse_mix(items):
+    """Convierte ['+=3', '*=1'] en {'+': 3.0, '*': 1.0}."""
+    mix = {}
+    for item in items or []:
+        terminal, _, weight = item.rpartition('=')
+        mix[terminal] = float(weight)
+    return mix
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Genera oraciones sintéticas a partir de GRAMMAR.")
+    arg_parser.add_argument('--count', type=int, default=100)
+    arg_parser.add_argument('--length', type=int, default=40, help="tokens aproximados por oración")
+    arg_parser.add_argument('--max-depth', type=int, default=4, help="anidamiento máximo de paréntesis")
+    arg_parser.add_argument('--mix', nargs='*', metavar='OP=PESO', help="pesos de operadores, p. ej. +=3 *=1")
+    arg_parser.add_argument('--invalid', type=float, default=0.0, help="fracción de oraciones inválidas")
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args(argv)
+
+    for text, _ in make_workload(args.count, args.length, args.max_depth, parse_mix(args.mix),
+                                 args.invalid, seed=args.seed):
+        print(text)
+
+
+if __name__ == "__main__":
+    main()